@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmarks for the U/N algebra, generators, oracles and invariants.
+
+Measures ops/sec (best of --repeat) for every algebra_api op on the scalar and
+batch paths and for the tree reductions at several magnitude scales and batch
+sizes, for gen_UN and gen_UN_batch, for the oracles, and trials/sec end-to-end
+for every property test module.  With --baseline the run is compared against a stored baseline
+and exits 1 if any case is slower by more than --threshold; --update-baseline
+rewrites the baseline instead.
+"""
+import argparse, importlib, json, os, platform, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pytest
+
+from tests.utils import adaptive
+from tests.utils import algebra_api as api
+from tests.utils import oracles
+from tests.utils import reduction
+from tests.utils.generators import gen_UN, gen_UN_batch, gen_UN_batch_scaled
+from tests.utils.algebra_api import from_batch
+
+SCALES = (1e-12, 1.0, 1e12)
+BATCH_SIZES = (1_000, 100_000, 1_000_000)
+SCALAR_N = 20_000
+INVARIANT_TRIALS = 500
+PROPERTY_MODULES = [
+    'inv01_triangle', 'inv02_epistemic_budget', 'inv03_projection_conservativity',
+    'inv04_triangle_addition', 'inv05_M_monotonicity_mult', 'inv06_flip_involution',
+    'inv07_lambda1_mult_tightness', 'inv08_commutativity', 'inv09_associativity',
+    'inv10_closure_nonneg', 'inv11_projection_reduction', 'inv12_nonneg_axiom',
+    'inv13_catch_preserves_M', 'inv14_subdistributivity', 'inv15_zero_failure_meta',
+]
+
+
+def best_rate(fn, n, repeat):
+    """Best-of-repeat items/sec for fn(), which processes n items."""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return n / best if best > 0 else float('inf')
+
+
+def bench_ops(rng, sizes, scalar_n, repeat):
+    results = {}
+    for scale in SCALES:
+        tag = f'{scale:.0e}'
+        xs = from_batch(gen_UN_batch_scaled(rng, scalar_n, scale))
+        ys = from_batch(gen_UN_batch_scaled(rng, scalar_n, scale))
+        pairs = list(zip(xs, ys))
+        results[f'scalar.add[{tag}]'] = best_rate(lambda: [api.add(x, y) for x, y in pairs], scalar_n, repeat)
+        results[f'scalar.mul[{tag}]'] = best_rate(lambda: [api.mul(x, y, 1.0) for x, y in pairs], scalar_n, repeat)
+        results[f'scalar.flip[{tag}]'] = best_rate(lambda: [api.flip(x) for x in xs], scalar_n, repeat)
+        results[f'scalar.catch[{tag}]'] = best_rate(lambda: [api.catch(x) for x in xs], scalar_n, repeat)
+        results[f'scalar.project[{tag}]'] = best_rate(lambda: [api.project(x) for x in xs], scalar_n, repeat)
+
+        px = [api.project(x) for x in xs]
+        py = [api.project(y) for y in ys]
+        ppairs = list(zip(px, py))
+        results[f'oracle.classical_add[{tag}]'] = best_rate(lambda: [oracles.classical_add(a, b) for a, b in ppairs], scalar_n, repeat)
+        results[f'oracle.classical_mul[{tag}]'] = best_rate(lambda: [oracles.classical_mul(a, b) for a, b in ppairs], scalar_n, repeat)
+        results[f'oracle.interval_width_mul[{tag}]'] = best_rate(lambda: [oracles.interval_width_mul(a, b) for a, b in ppairs], scalar_n, repeat)
+
+        for n in sizes:
+            xb = gen_UN_batch_scaled(rng, n, scale)
+            yb = gen_UN_batch_scaled(rng, n, scale)
+            key = f'{tag},n={n}'
+            results[f'batch.add[{key}]'] = best_rate(lambda: api.add_batch(xb, yb), n, repeat)
+            results[f'batch.mul[{key}]'] = best_rate(lambda: api.mul_batch(xb, yb, 1.0), n, repeat)
+            results[f'batch.flip[{key}]'] = best_rate(lambda: api.flip_batch(xb), n, repeat)
+            results[f'batch.catch[{key}]'] = best_rate(lambda: api.catch_batch(xb), n, repeat)
+            results[f'batch.project[{key}]'] = best_rate(lambda: api.project_batch(xb), n, repeat)
+            results[f'batch.reduce_add[{key}]'] = best_rate(lambda: reduction.reduce_add(xb), n, repeat)
+            with np.errstate(over='ignore', invalid='ignore'):
+                # long ⊗ chains overflow away from scale 1; the rate is what matters
+                results[f'batch.reduce_mul[{key}]'] = best_rate(lambda: reduction.reduce_mul(xb), n, repeat)
+    return results
+
+
+def bench_generators(sizes, scalar_n, repeat):
+    results = {}
+    rng = np.random.default_rng(0)
+    results['gen.gen_UN'] = best_rate(lambda: [gen_UN(rng) for _ in range(scalar_n)], scalar_n, repeat)
+    for n in sizes:
+        results[f'gen.gen_UN_batch[n={n}]'] = best_rate(lambda: gen_UN_batch(rng, n), n, repeat)
+    return results
+
+
+def bench_invariants(trials, repeat):
+    """Trials/sec per property module: every test_* function run at `trials`."""
+    results = {}
+    for name in PROPERTY_MODULES:
+        mod = importlib.import_module(f'tests.properties.{name}')
+        for attr in ('TRIALS', 'BATCH_TRIALS', 'SHARDED_TRIALS'):
+            if hasattr(mod, attr):
+                setattr(mod, attr, trials)
+        if hasattr(mod, 'TARGET_RATE'):
+            # adaptive modules: the rate whose zero-failure bound needs `trials`
+            mod.TARGET_RATE = adaptive.zero_fail_bound(trials)
+        tests = [getattr(mod, t) for t in dir(mod)
+                 if t.startswith('test_') and t != 'test_todo' and callable(getattr(mod, t))]
+        if not tests:
+            continue
+
+        def run():
+            for t in tests:
+                try:
+                    t()
+                except pytest.skip.Exception:
+                    pass
+        results[f'invariant.{name}'] = best_rate(run, trials, repeat)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Names whose rate fell more than `threshold` (fraction) below baseline."""
+    regressions = []
+    for name, base in baseline.get('results', {}).items():
+        cur = results.get(name)
+        if cur is not None and cur < base * (1.0 - threshold):
+            regressions.append((name, base, cur))
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--baseline', default='reporting/BENCH_BASELINE.json')
+    ap.add_argument('--update-baseline', action='store_true')
+    ap.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown fraction')
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--quick', action='store_true', help='small sizes for a smoke run')
+    ap.add_argument('--out', default=None, help='also write this run to a JSON file')
+    args = ap.parse_args()
+
+    sizes = BATCH_SIZES[:2] if args.quick else BATCH_SIZES
+    scalar_n = SCALAR_N // 10 if args.quick else SCALAR_N
+    trials = INVARIANT_TRIALS // 5 if args.quick else INVARIANT_TRIALS
+
+    rng = np.random.default_rng(0)
+    results = {}
+    results.update(bench_ops(rng, sizes, scalar_n, args.repeat))
+    results.update(bench_generators(sizes, scalar_n, args.repeat))
+    results.update(bench_invariants(trials, args.repeat))
+
+    run = {
+        'meta': {'python': platform.python_version(), 'numpy': np.__version__,
+                 'platform': platform.platform(), 'quick': args.quick},
+        'results': results,
+    }
+    for name, rate in sorted(results.items()):
+        print(f'{rate:16.1f}/s  {name}')
+    if args.out:
+        with open(args.out, 'w') as fp:
+            json.dump(run, fp, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w') as fp:
+            json.dump(run, fp, indent=2, sort_keys=True)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; run with --update-baseline to create one')
+        return 0
+    with open(args.baseline) as fp:
+        regressions = compare(results, json.load(fp), args.threshold)
+    for name, base, cur in regressions:
+        print(f'REGRESSION {name}: {cur:.1f}/s vs baseline {base:.1f}/s')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
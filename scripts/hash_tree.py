@@ -1,8 +1,29 @@
 #!/usr/bin/env python3
-import argparse, hashlib, os, sys
+"""
+Per-file sha256 digests and a deterministic repo-tree sha256.
 
-EXCLUDE_DIRS = {'.git', '__pycache__', '.venv', 'venv', '.mypy_cache', '.pytest_cache', '.github'}
-EXCLUDE_FILES = {'REPO_TREE_SHA256.txt', 'SBOM.spdx.json', '.DS_Store'}
+Files are hashed on a thread pool (hashlib releases the GIL on large
+updates); files of MMAP_THRESHOLD bytes or more are hashed straight from an
+mmap, smaller ones are read whole.  Digests are cached in
+.cache/hash_tree.cache.json keyed by (path, size, mtime_ns, inode), so
+unchanged files are not re-read; entries modified within RACY_SECONDS of the
+cache write are not cached, since a same-timestamp rewrite could go unseen.
+Use --no-cache to re-read everything.
+
+--verify FILE re-checks the tree against an existing REPO_TREE_SHA256.txt and
+exits 1 at the first added, missing or changed file.
+"""
+import argparse, hashlib, json, mmap, os, sys, time
+from concurrent.futures import ThreadPoolExecutor
+
+# .cache holds per-run state (result cache, timings, sample banks, digests)
+EXCLUDE_DIRS = {'.git', '__pycache__', '.venv', 'venv', '.mypy_cache', '.pytest_cache', '.github', '.cache'}
+CACHE_NAME = 'hash_tree.cache.json'
+EXCLUDE_FILES = {'REPO_TREE_SHA256.txt', 'SBOM.spdx.json', '.DS_Store', CACHE_NAME}
+MMAP_THRESHOLD = 1 << 20
+READ_BUFFER = 1 << 20
+RACY_SECONDS = 2
+CACHE_VERSION = 1
 
 def iter_files(root):
     for dirpath, dirnames, filenames in os.walk(root):
@@ -13,31 +34,142 @@ def iter_files(root):
                 continue
             yield os.path.relpath(os.path.join(dirpath, f), root)
 
-def sha256_file(path):
+def sha256_file(path, size=None):
     h = hashlib.sha256()
     with open(path, 'rb') as fp:
-        for chunk in iter(lambda: fp.read(8192), b''):
-            h.update(chunk)
+        if size is None:
+            size = os.fstat(fp.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        else:
+            for chunk in iter(lambda: fp.read(READ_BUFFER), b''):
+                h.update(chunk)
     return h.hexdigest()
 
+def stat_key(st):
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+def load_cache(path):
+    try:
+        with open(path, 'r') as fp:
+            data = json.load(fp)
+        if data.get('version') == CACHE_VERSION:
+            return data['entries']
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+def save_cache(path, entries):
+    now_ns = time.time_ns()
+    keep = {p: e for p, e in entries.items() if now_ns - e[1] > RACY_SECONDS * 10**9}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as fp:
+            json.dump({'version': CACHE_VERSION, 'entries': keep}, fp, separators=(',', ':'))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # read-only checkout: hash without a cache
+
+class Hasher:
+    def __init__(self, root, cache_path=None, jobs=None):
+        self.root = root
+        self.cache_path = cache_path
+        self.cache = load_cache(cache_path) if cache_path else {}
+        self.fresh = {}
+        self.pool = ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) + 4))
+
+    def digest(self, rel):
+        full = os.path.join(self.root, rel)
+        st = os.stat(full)
+        key = stat_key(st)
+        hit = self.cache.get(rel)
+        if hit is not None and hit[:3] == key:
+            self.fresh[rel] = hit
+            return hit[3]
+        h = sha256_file(full, st.st_size)
+        self.fresh[rel] = key + [h]
+        return h
+
+    def map(self, rels):
+        """(path, digest) in input order, hashed concurrently."""
+        return zip(rels, self.pool.map(self.digest, rels))
+
+    def close(self, save=True):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        if save and self.cache_path:
+            save_cache(self.cache_path, self.fresh)
+
+def list_files(root):
+    rels = [rel for rel in iter_files(root) if os.path.isfile(os.path.join(root, rel))]
+    return sorted(rels, key=lambda rel: rel.replace('\\', '/'))
+
+def tree_lines(digests):
+    # deterministic tree hash: hash of the newline-joined "hash  path" lines
+    lines = [f"{h}  {p}" for (p,h) in sorted((p,h) for (p,h) in digests)]
+    tree = "\n".join(lines).encode('utf-8')
+    return lines, hashlib.sha256(tree).hexdigest()
+
+def read_manifest(path):
+    entries, tree_hash = {}, None
+    with open(path, 'r') as fp:
+        for line in fp:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('TREE_SHA256  '):
+                tree_hash = line.split('  ', 1)[1]
+            else:
+                h, p = line.split('  ', 1)
+                entries[p] = h
+    return entries, tree_hash
+
+def verify(hasher, root, manifest):
+    expected, expected_tree = read_manifest(manifest)
+    rels = list_files(root)
+    paths = {rel.replace('\\', '/') for rel in rels}
+    for p in sorted(set(expected) - paths):
+        return f"missing: {p}"
+    for p in sorted(paths - set(expected)):
+        return f"added: {p}"
+    digests = []
+    for rel, h in hasher.map(rels):
+        p = rel.replace('\\', '/')
+        if h != expected[p]:
+            return f"changed: {p}"
+        digests.append((p, h))
+    _, tree_hash = tree_lines(digests)
+    if tree_hash != expected_tree:
+        return f"tree hash: {tree_hash} != {expected_tree}"
+    return None
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--out', default='reporting/REPO_TREE_SHA256.txt')
     ap.add_argument('--root', default='.')
+    ap.add_argument('--verify', metavar='FILE', help='check the tree against FILE and exit 1 at the first mismatch')
+    ap.add_argument('--jobs', type=int, default=None, help='hashing threads (default: cpu count + 4, max 32)')
+    ap.add_argument('--cache', default=None, help=f'digest cache path (default: ROOT/.cache/{CACHE_NAME})')
+    ap.add_argument('--no-cache', action='store_true', help='re-read every file')
     args = ap.parse_args()
 
     root = os.path.abspath(args.root)
-    digests = []
-    for rel in iter_files(root):
-        full = os.path.join(root, rel)
-        if not os.path.isfile(full):
-            continue
-        digests.append((rel.replace('\\','/'), sha256_file(full)))
+    cache_path = None if args.no_cache else (args.cache or os.path.join(root, '.cache', CACHE_NAME))
+    hasher = Hasher(root, cache_path, args.jobs)
 
-    # deterministic tree hash: hash of the newline-joined "hash  path" lines
-    lines = [f"{h}  {p}" for (p,h) in sorted((p,h) for (p,h) in digests)]
-    tree = "\n".join(lines).encode('utf-8')
-    tree_hash = hashlib.sha256(tree).hexdigest()
+    if args.verify:
+        mismatch = verify(hasher, root, args.verify)
+        hasher.close(save=mismatch is None)
+        if mismatch:
+            print(f"MISMATCH {mismatch}", file=sys.stderr)
+            return 1
+        print("OK")
+        return 0
+
+    digests = [(rel.replace('\\','/'), h) for rel, h in hasher.map(list_files(root))]
+    hasher.close()
+    lines, tree_hash = tree_lines(digests)
 
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
     with open(args.out, 'w') as fp:
@@ -0,0 +1,86 @@
+"""
+Session hooks shared by the whole suite.
+
+With SSOT_REPORT=1 every test outcome is streamed to reporting/results.jsonl
+under its SSOT invariant/scenario id, and reporting/results.json plus
+reporting/summary.md are written when the session ends.
+
+Test timings and --ssot-jobs scheduling live in tests.utils.scheduling, the
+replay of unchanged tests (--ssot-rerun to force a run) in
+tests.utils.result_cache.
+
+With SSOT_INSTRUMENT=1 algebra_api calls are attributed to the running test
+(tests.utils.instrument); the per-test stats ride on each teardown report,
+join the results stream when reporting is on, and the terminal summary lists
+the ops by time, --ssot-jobs workers included.
+"""
+from tests.utils import instrument, result_cache, scheduling
+from tests.utils.results import entry_for_file, get_writer
+
+
+def pytest_addoption(parser):
+    scheduling.add_options(parser)
+    result_cache.add_options(parser)
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(scheduling.SchedulerPlugin(config), 'ssot-scheduler')
+    config.pluginmanager.register(result_cache.ResultCachePlugin(config), 'ssot-result-cache')
+
+
+def pytest_sessionstart(session):
+    writer = get_writer()
+    if writer is not None and not scheduling.is_worker():
+        writer.reset()
+
+
+def pytest_runtest_setup(item):
+    if instrument.enabled():
+        instrument.set_context(item.nodeid)
+
+
+def pytest_runtest_teardown(item, nextitem):
+    if not instrument.enabled():
+        return
+    writer = get_writer()
+    metrics = instrument.collect(item.nodeid)
+    if metrics:
+        # carried by the teardown report, so a scheduler worker's stats reach the parent
+        item.user_properties.append((instrument.REPORT_PROPERTY, instrument.encode(metrics)))
+        if writer is not None:
+            writer.record('instrumentation', item.nodeid, metrics=metrics)
+    instrument.set_context(instrument.SESSION)
+
+
+def pytest_runtest_logreport(report):
+    if instrument.enabled() and not scheduling.is_worker():
+        instrument.add_reported(report)
+    writer = get_writer()
+    if writer is None or scheduling.is_worker():
+        return  # a scheduled worker's reports are relayed to, and recorded by, the parent
+    if report.when != 'call' and not (report.skipped or report.failed):
+        return
+    entry = entry_for_file(report.nodeid.split('::')[0])
+    if entry is not None:
+        kind, entry_id = entry
+        writer.record(kind, entry_id, status=report.outcome, test=report.nodeid)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    writer = get_writer()
+    if writer is not None and not scheduling.is_worker():
+        writer.finalize()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not instrument.enabled():
+        return
+    totals = instrument.totals()
+    terminalreporter.write_sep('=', 'algebra_api instrumentation')
+    terminalreporter.write_line(f"{'op':<16}{'calls':>12}{'elements':>14}{'seconds':>10}"
+                                f"{'|x| p50':>12}{'|x| p99':>12}")
+    for op, t in sorted(totals.items(), key=lambda kv: -kv[1]['seconds']):
+        m = t['magnitudes']
+        p50, p99 = m.quantiles((0.5, 0.99)) if m.count else (float('nan'),) * 2
+        terminalreporter.write_line(f"{op:<16}{t['calls']:>12}{t['elements']:>14}{t['seconds']:>10.3f}"
+                                    f"{p50:>12.3g}{p99:>12.3g}")
@@ -0,0 +1,99 @@
+import numpy as np
+from tests.utils.generators import gen_UN, gen_UN_batch
+from tests.utils.algebra_api import (
+    add, mul, scale, flip, catch, project,
+    to_batch, from_batch, add_batch, mul_batch, scale_batch, flip_batch, catch_batch,
+    project_batch,
+)
+from tests.utils.expr_tree import gen_expr_tree, compile_tree, evaluate, evaluate_batch
+from tests.utils.sample_bank import draw_stream, get_bank
+from tests.utils.un_array import UNArray, UNElem
+from tests.utils.ssot_loader import get_trials, get_seed
+
+SEED = get_seed('metamorphic')
+TRIALS = get_trials(override=1000)
+
+
+def _samples():
+    rng = np.random.default_rng(SEED)
+    xs = [gen_UN(rng) for _ in range(TRIALS)]
+    ys = [gen_UN(rng) for _ in range(TRIALS)]
+    lams = rng.uniform(0.0, 2.0, TRIALS)
+    return xs, ys, lams
+
+
+def test_batch_ops_match_scalar_bitwise():
+    xs, ys, lams = _samples()
+    xb, yb = to_batch(xs), to_batch(ys)
+    assert from_batch(add_batch(xb, yb)) == [add(x, y) for x, y in zip(xs, ys)]
+    assert from_batch(mul_batch(xb, yb, lam=1.0)) == [mul(x, y, lam=1.0) for x, y in zip(xs, ys)]
+    assert from_batch(mul_batch(xb, yb, lam=lams)) == [
+        mul(x, y, lam=float(l)) for x, y, l in zip(xs, ys, lams)
+    ]
+    assert from_batch(scale_batch(xb, -2.5)) == [scale(x, -2.5) for x in xs]
+    assert from_batch(scale_batch(xb, lams - 1.0)) == [
+        scale(x, float(c)) for x, c in zip(xs, lams - 1.0)
+    ]
+    assert from_batch(flip_batch(xb)) == [flip(x) for x in xs]
+    assert from_batch(catch_batch(xb)) == [catch(x) for x in xs]
+
+
+def test_batch_project_matches_scalar_bitwise():
+    xs, _, _ = _samples()
+    xb = to_batch(xs)
+    for known_na in (False, True):
+        n, u = project_batch(xb, known_na=known_na)
+        assert list(zip(n.tolist(), u.tolist())) == [project(x, known_na=known_na) for x in xs]
+
+
+def test_gen_UN_batch_scalar_mode_replays_stream():
+    rng_ref = np.random.default_rng(SEED)
+    rng = np.random.default_rng(SEED)
+    expected = [gen_UN(rng_ref) for _ in range(TRIALS)]
+    assert from_batch(gen_UN_batch(rng, TRIALS, mode='scalar')) == expected
+    # both generators are left in the same state
+    assert rng.random() == rng_ref.random()
+
+
+def test_sample_bank_replays_gen_UN():
+    rng = np.random.default_rng(SEED)
+    expected = [gen_UN(rng) for _ in range(2 * TRIALS)]
+    xs, ys = draw_stream(SEED, TRIALS, 2)
+    assert [x.to_tuple() for x in xs] == expected[0::2]
+    assert [y.to_tuple() for y in ys] == expected[1::2]
+    # shorter requests are prefix views of the same read-only mapping
+    bank = get_bank(SEED, 2 * TRIALS)
+    assert np.shares_memory(xs.data, bank.data)
+    assert get_bank(SEED, 10).to_tuples() == expected[:10]
+    assert not bank.data.flags.writeable
+
+
+def test_un_array_roundtrip_and_zero_copy_flip():
+    xs, ys, _ = _samples()
+    arr = UNArray.from_tuples(xs)
+    assert arr.nbytes == 32 * len(xs)
+    assert arr.to_tuples() == xs
+    assert UNArray.from_batch(to_batch(xs)).to_tuples() == xs
+    assert [e.to_tuple() for e in arr] == xs
+
+    flipped = arr.flip()
+    assert np.shares_memory(flipped.data, arr.data)
+    assert flipped.to_tuples() == [flip(x) for x in xs]
+    assert from_batch(flipped.as_batch()) == from_batch(flip_batch(arr.as_batch()))
+
+    # UNElem unpacks like the tuple form, so the scalar ops accept it directly
+    e, other = UNElem.from_tuple(xs[0]), UNElem.from_tuple(ys[0])
+    assert mul(e, other, lam=1.0) == mul(xs[0], ys[0], lam=1.0)
+    assert arr[0] == xs[0]
+
+
+def test_compiled_expr_tree_matches_scalar_interpreter():
+    rng = np.random.default_rng(SEED)
+    n_leaves = 4
+    leaves = [[gen_UN(rng) for _ in range(50)] for _ in range(n_leaves)]
+    leaf_batches = [to_batch(l) for l in leaves]
+    for _ in range(50):
+        tree = gen_expr_tree(rng, depth=3, fanout=3, n_leaves=n_leaves, lams=(0.5, 1.0))
+        got = from_batch(evaluate_batch(compile_tree(tree), leaf_batches))
+        expected = [evaluate(tree, [l[i] for l in leaves]) for i in range(50)]
+        assert got == expected
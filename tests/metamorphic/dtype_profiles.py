@@ -0,0 +1,72 @@
+import numpy as np
+from tests.utils.algebra_api import (
+    catch, mul, scale, add_batch, catch_batch, flip_batch, mul_batch, project_batch, scale_batch,
+)
+from tests.utils.generators import gen_UN_batch, decades_for, M
+from tests.utils.oracles import classical_mul
+from tests.utils.predicates import check_le, check_triangle, tol
+from tests.utils.ssot_loader import FLOAT_TYPES, get_atol, get_rtol, get_trials, get_seed, load_ssot
+
+SEED = get_seed('metamorphic')
+TRIALS = get_trials(override=20000)
+
+
+def test_tolerance_profiles_follow_machine_epsilon():
+    defaults = load_ssot()['defaults']
+    assert get_atol(np.float64) == float(defaults['atol'])
+    assert get_rtol(np.float64) == float(defaults['rtol'])
+    for name in FLOAT_TYPES:
+        ulps = get_rtol(name) / float(np.finfo(name).eps)
+        assert np.isclose(ulps, float(defaults['rtol']) / np.finfo(np.float64).eps)
+    # predicates pick the profile from the data
+    a32 = np.ones(3, dtype=np.float32)
+    assert np.all(tol(a32, a32) == np.float32(get_atol(np.float32) + get_rtol(np.float32)))
+    assert tol(1.0, 1.0) == get_atol(np.float64) + get_rtol(np.float64)
+
+
+def test_generator_respects_dtype():
+    for name in FLOAT_TYPES:
+        x = gen_UN_batch(np.random.default_rng(SEED), TRIALS, dtype=name)
+        (n_a, u_t), (n_m, u_m) = x
+        assert all(v.dtype == np.dtype(name) for v in (n_a, u_t, n_m, u_m))
+        assert np.all(u_t >= 0) and np.all(u_m >= 0)
+        # the triangle holds in the dtype's own arithmetic, with no tolerance
+        assert check_triangle(x, atol=0.0, rtol=0.0).count == 0
+        assert np.max(np.abs(n_a)) < 10.0 ** (decades_for(name) + 2)
+    assert decades_for(np.float32) == 6 and decades_for(np.float64) == 12
+
+
+def test_invariants_hold_in_each_dtype():
+    for name in FLOAT_TYPES:
+        dtype = np.dtype(name)
+        rng = np.random.default_rng(SEED)
+        x, y = gen_UN_batch(rng, TRIALS, dtype=dtype), gen_UN_batch(rng, TRIALS, dtype=dtype)
+        prod = mul_batch(x, y, lam=1.0)
+        for result in (add_batch(x, y), prod, flip_batch(x), catch_batch(x)):
+            assert result[0][0].dtype == dtype and result[1][1].dtype == dtype
+            check = check_triangle(result)
+            assert check.count == 0, (name, check.max_excess)
+        check = check_le(M(prod), M(x) * M(y))
+        assert check.count == 0, (name, check.max_excess)
+        classical_u = classical_mul(project_batch(x), project_batch(y))[1]
+        check = check_le(classical_u, project_batch(prod)[1])
+        assert check.count == 0, (name, check.max_excess)
+
+
+def test_scalar_ops_keep_numpy_scalar_types():
+    """Scalar ops on numpy scalars match the batch ops bit-for-bit in every dtype."""
+    for name in FLOAT_TYPES:
+        dtype = np.dtype(name)
+        rng = np.random.default_rng(SEED)
+        x, y = gen_UN_batch(rng, 200, dtype=dtype), gen_UN_batch(rng, 200, dtype=dtype)
+        cases = ((lambda a, b: mul(a, b, lam=0.7), mul_batch(x, y, lam=0.7)),
+                 (lambda a, b: scale(a, -1.3), scale_batch(x, -1.3)),
+                 (lambda a, b: catch(a), catch_batch(x)))
+        for op, batch in cases:
+            for i in range(200):
+                xi = ((x[0][0][i], x[0][1][i]), (x[1][0][i], x[1][1][i]))
+                yi = ((y[0][0][i], y[0][1][i]), (y[1][0][i], y[1][1][i]))
+                (na, ut), (nm, um) = op(xi, yi)
+                for got, want in ((na, batch[0][0][i]), (ut, batch[0][1][i]),
+                                  (nm, batch[1][0][i]), (um, batch[1][1][i])):
+                    assert np.asarray(got).dtype == dtype and got == want, (name, i)
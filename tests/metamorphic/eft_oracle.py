@@ -0,0 +1,54 @@
+from fractions import Fraction
+
+import numpy as np
+from tests.utils import eft
+from tests.utils.algebra_api import mul, mul_batch, add_batch
+from tests.utils.generators import M
+from tests.utils.sample_bank import draw_stream
+from tests.utils.ssot_loader import get_trials, get_seed
+
+SEED = get_seed('metamorphic')
+TRIALS = get_trials(override=1000)
+N_EXACT = 200  # Fraction reference is slow; a prefix of the stream is enough
+
+
+def _fraction(x):
+    return tuple(tuple(Fraction(v) for v in tier) for tier in x)
+
+
+def _leaves(x):
+    (n_a, u_t), (n_m, u_m) = x
+    return (n_a, u_t, n_m, u_m)
+
+
+def test_eft_refs_mirror_algebra_bitwise():
+    xs, ys = draw_stream(SEED, TRIALS, 2)
+    x, y = xs.as_batch(), ys.as_batch()
+    for computed, ref in ((mul_batch(x, y, lam=1.0), eft.mul_ref(x, y, lam=1.0)),
+                          (add_batch(x, y), eft.add_ref(x, y))):
+        for c, r in zip(_leaves(computed), _leaves(ref)):
+            assert np.array_equal(c, r.val)
+    assert np.array_equal(M(x), eft.M_ref(x).val)
+
+
+def test_eft_bounds_contain_exact_results():
+    """val + corr ± err brackets the Fraction result, and rounding_bound covers the float result."""
+    xs, ys = draw_stream(SEED, N_EXACT, 2)
+    ref = eft.mul_ref(xs.as_batch(), ys.as_batch(), lam=1.0)
+    m_ref = eft.M_ref(ref)
+    for i, (xi, yi) in enumerate(zip(xs, ys)):
+        exact = mul(_fraction(xi), _fraction(yi), lam=1)
+        for e, r in list(zip(_leaves(exact), _leaves(ref))) + [(M(exact), m_ref)]:
+            assert abs(Fraction(float(r.val[i])) + Fraction(float(r.corr[i])) - e) <= Fraction(float(r.err[i]))
+            assert abs(Fraction(float(r.val[i])) - e) <= Fraction(float(eft.rounding_bound(r)[i]))
+
+
+def test_eft_check_flags_real_errors():
+    """A relative error far below the SSOT rtol is still outside the provable rounding bound."""
+    xs, ys = draw_stream(SEED, TRIALS, 2)
+    x, y = xs.as_batch(), ys.as_batch()
+    (_, ut), _ = mul_batch(x, y, lam=1.0)
+    (_, ut_ref), _ = eft.mul_ref(x, y, lam=1.0)
+    assert eft.check_equal(ut, ut_ref.val, ut_ref, ut_ref).count == 0
+    perturbed = ut * (1 + 1e-13)
+    assert eft.check_equal(perturbed, ut, ut_ref, ut_ref).count == np.count_nonzero(ut)
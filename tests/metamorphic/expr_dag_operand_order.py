@@ -0,0 +1,30 @@
+import numpy as np
+from tests.utils.algebra_api import mul_batch
+from tests.utils.expr_dag import ExprDAG
+from tests.utils.generators import gen_UN_batch
+from tests.utils.ssot_loader import get_trials, get_seed
+
+SEED = get_seed('metamorphic')
+TRIALS = get_trials(override=5000)
+LAM = 0.3
+
+
+def _same(a, b):
+    return all(np.array_equal(a[i][j], b[i][j]) for i in (0, 1) for j in (0, 1))
+
+
+def test_mul_keeps_operand_order_off_lambda_one():
+    rng = np.random.default_rng(SEED)
+    x, y = gen_UN_batch(rng, TRIALS), gen_UN_batch(rng, TRIALS)
+    dag = ExprDAG([x, y])
+    a, b = dag.leaf(0), dag.leaf(1)
+    # swapped operands round lam·u1·u2 differently somewhere in the batch
+    assert not _same(mul_batch(x, y, lam=LAM), mul_batch(y, x, lam=LAM))
+    xy, yx = dag.mul(a, b, lam=LAM), dag.mul(b, a, lam=LAM)
+    assert xy != yx
+    assert _same(dag.value(xy), mul_batch(x, y, lam=LAM))
+    assert _same(dag.value(yx), mul_batch(y, x, lam=LAM))
+    # at λ = 1 ⊗ is bitwise commutative and both orders intern to one node
+    assert dag.mul(a, b) == dag.mul(b, a)
+    assert dag.add(a, b) == dag.add(b, a)
+    assert _same(dag.value(dag.mul(b, a)), mul_batch(y, x))
@@ -0,0 +1,84 @@
+import copy
+import json
+from types import SimpleNamespace
+
+import numpy as np
+from tests.utils import algebra_api, instrument
+from tests.utils.generators import gen_UN_batch
+from tests.utils.sample_bank import get_bank
+from tests.utils.ssot_loader import get_trials, get_seed
+
+SEED = get_seed('metamorphic')
+TRIALS = get_trials(override=5000)
+CONTEXT = 'instrumentation-selftest'
+
+
+def _instrumented():
+    """A private copy of the algebra_api namespace with the recording wrappers installed."""
+    ns = {op: getattr(algebra_api, op) for op in instrument.SCALAR_OPS + instrument.BATCH_OPS}
+    for op in ns:
+        ns[op] = getattr(ns[op], '__wrapped__', ns[op])
+    instrument.install(ns)
+    return ns
+
+
+def test_wrappers_count_calls_elements_and_magnitudes():
+    ns = _instrumented()
+    xs = get_bank(SEED, 100).to_tuples()
+    xb = gen_UN_batch(np.random.default_rng(SEED), TRIALS)
+    # references first: under SSOT_INSTRUMENT=1 algebra_api itself records too
+    refs = [algebra_api.add(x, x) for x in xs]
+    ref = algebra_api.mul_batch(xb, xb, lam=0.5)
+    instrument.set_context(CONTEXT)
+    try:
+        assert [ns['add'](x, x) for x in xs] == refs
+        for _ in range(3):
+            out = ns['mul_batch'](xb, xb, lam=0.5)
+        metrics = instrument.collect(CONTEXT)
+    finally:
+        instrument.set_context(instrument.SESSION)
+    assert all(np.array_equal(out[i][j], ref[i][j]) for i in (0, 1) for j in (0, 1))
+    assert metrics['add_call_count'] == 100 and metrics['add_element_count'] == 100
+    # both operands, four components each
+    assert metrics['add_magnitude'].count == 100 * 2 * 4
+    assert metrics['mul_batch_call_count'] == 3
+    assert metrics['mul_batch_element_count'] == 3 * TRIALS
+    assert metrics['mul_batch_magnitude'].count == 3 * 2 * 4 * TRIALS
+    assert metrics['mul_batch_seconds'] > 0.0
+    assert 'flip_call_count' not in metrics
+    assert instrument.split_metric('mul_batch_element_count') == ('mul_batch', 'element_count')
+
+
+def test_disabled_instrumentation_leaves_api_unwrapped():
+    wrapped = [op for op in instrument.SCALAR_OPS + instrument.BATCH_OPS
+               if hasattr(getattr(algebra_api, op), '__wrapped__')]
+    if instrument.enabled():
+        assert len(wrapped) == len(instrument.SCALAR_OPS + instrument.BATCH_OPS)
+    else:
+        assert wrapped == []
+
+
+def test_reported_stats_fold_into_totals():
+    ns = _instrumented()
+    xb = gen_UN_batch(np.random.default_rng(SEED), TRIALS)
+    instrument.set_context(CONTEXT)
+    try:
+        ns['add_batch'](xb, xb)
+        metrics = instrument.encode(instrument.collect(CONTEXT))
+    finally:
+        instrument.set_context(instrument.SESSION)
+    # what a teardown report relayed from a --ssot-jobs worker carries
+    report = SimpleNamespace(user_properties=[('other', 1), (instrument.REPORT_PROPERTY, metrics)])
+    assert json.loads(json.dumps(metrics)) == metrics
+    saved = copy.deepcopy(instrument._REPORTED)
+    try:
+        before = instrument.totals().get('add_batch')
+        instrument.add_reported(report)
+        instrument.add_reported(report)
+        after = instrument.totals()['add_batch']
+    finally:
+        instrument._REPORTED.clear()
+        instrument._REPORTED.update(saved)
+    calls, elements, count = (before['calls'], before['elements'], before['magnitudes'].count) if before else (0, 0, 0)
+    assert after['calls'] - calls == 2 and after['elements'] - elements == 2 * TRIALS
+    assert after['magnitudes'].count - count == 2 * metrics['add_batch_magnitude']['count']
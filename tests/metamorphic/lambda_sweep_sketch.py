@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+from tests.utils import lambda_sweep, sketches
+from tests.utils.algebra_api import mul_batch, project, project_batch
+from tests.utils.generators import gen_UN_batch
+from tests.utils.oracles import interval_width_mul, interval_width_mul_batch
+from tests.utils.sample_bank import draw_stream
+from tests.utils.results import merge_metric
+from tests.utils.sketches import LogHistogram, QuantileSketch
+from tests.utils.ssot_loader import get_trials, get_seed
+
+SEED = get_seed('metamorphic')
+TRIALS = get_trials(override=1000)
+QS = (0.0, 0.01, 0.5, 0.9, 0.99, 0.999, 1.0)
+
+
+def test_broadcast_sweep_matches_per_lambda_mul():
+    xs, ys = draw_stream(SEED, TRIALS, 2)
+    x, y = xs.as_batch(), ys.as_batch()
+    lams = np.array(lambda_sweep.DEFAULT_LAMS)
+    w_u, w_int = lambda_sweep.widths(x, y, lams)
+    assert w_u.shape == (len(lams), TRIALS)
+    for lam, row in zip(lams, w_u):
+        assert np.array_equal(row, 2 * project_batch(mul_batch(x, y, lam=float(lam)))[1])
+    scalar = [interval_width_mul(project(xi), project(yi)) for xi, yi in zip(xs, ys)]
+    assert np.array_equal(w_int, np.array(scalar))
+    assert np.array_equal(w_int, interval_width_mul_batch(project_batch(x), project_batch(y)))
+
+
+def test_quantile_sketch_relative_accuracy():
+    rng = np.random.default_rng(SEED)
+    values = np.concatenate((-np.exp(rng.normal(0, 3, TRIALS)), np.zeros(TRIALS // 10),
+                             np.exp(rng.normal(0, 5, TRIALS * 10))))
+    for alpha in (1e-2, 1e-4):
+        sketch = QuantileSketch(alpha, max_buckets=1 << 20)
+        sketch.add(values)
+        for q in QS:
+            exact = np.quantile(values, q, method='lower')
+            assert abs(sketch.quantile(q) - exact) <= alpha * abs(exact), (alpha, q)
+
+
+def test_quantile_sketch_merge_is_exact():
+    rng = np.random.default_rng(SEED)
+    values = rng.lognormal(0.3, 0.2, TRIALS * 10) * np.where(rng.random(TRIALS * 10) < 0.1, -1, 1)
+    whole = QuantileSketch(1e-4)
+    whole.add(values)
+    merged = QuantileSketch(1e-4)
+    for part in np.array_split(values, 7):
+        shard = QuantileSketch(1e-4)
+        shard.add(part)
+        merged.merge(shard)
+    assert merged.count == whole.count and merged.zero_count == whole.zero_count
+    assert np.array_equal(merged.quantiles(QS), whole.quantiles(QS))
+
+
+def test_sweep_quantiles_match_exact_at_every_lambda():
+    n = 50_000
+    res = lambda_sweep.sweep(np.random.default_rng(SEED), n, chunk=n)
+    rng = np.random.default_rng(SEED)
+    x, y = gen_UN_batch(rng, n), gen_UN_batch(rng, n)
+    w_u, w_int = lambda_sweep.widths(x, y, res.lams)
+    pos = w_int > 0
+    ratios = w_u[:, pos] / w_int[pos]
+    for lam, row, est in zip(res.lams, ratios, res.quantiles):
+        exact = np.quantile(row, res.qs, method='lower')
+        assert np.all(np.abs(est - exact) <= lambda_sweep.ALPHA * exact), (lam, est, exact)
+        assert res.max_ratio[res.lams == lam][0] == row.max()
+
+
+def test_sweep_chunking_does_not_change_quantiles():
+    a = lambda_sweep.sweep(np.random.default_rng(SEED), 4096, chunk=4096)
+    acc = lambda_sweep.LambdaSweep()
+    rng = np.random.default_rng(SEED)
+    x, y = gen_UN_batch(rng, 4096), gen_UN_batch(rng, 4096)
+    for lo in range(0, 4096, 1000):
+        sl = slice(lo, lo + 1000)
+        acc.feed(*[((n_a[sl], u_t[sl]), (n_m[sl], u_m[sl])) for (n_a, u_t), (n_m, u_m) in (x, y)])
+    b = acc.result()
+    assert np.array_equal(a.quantiles, b.quantiles)
+    assert np.array_equal(a.coverage_violations, b.coverage_violations)
+
+
+def test_log_histogram_quantiles_within_one_bucket():
+    rng = np.random.default_rng(SEED)
+    values = np.concatenate((-10 ** rng.uniform(-12, 12, TRIALS), np.zeros(TRIALS // 10),
+                             10 ** rng.uniform(-14, 14, TRIALS * 10)))
+    hist = LogHistogram()
+    hist.add(values)
+    assert hist.count == len(values) and hist.zero_count == TRIALS // 10
+    width = 10 ** (1 / hist.per_decade)
+    for q in QS:
+        exact = np.quantile(values, q, method='lower')
+        est = hist.quantile(q)
+        if exact == 0.0 or 1e-12 <= abs(exact) < 1e12:
+            assert est == exact or (np.sign(est) == np.sign(exact) and
+                                    1 / width <= est / exact <= width), (q, est, exact)
+
+
+def test_sketches_round_trip_through_json():
+    rng = np.random.default_rng(SEED)
+    values = rng.normal(size=TRIALS) * 10 ** rng.uniform(-13, 13, TRIALS)
+    for sketch in (LogHistogram(), QuantileSketch(1e-2), LogHistogram(-20, 4, 4)):
+        sketch.add(values)
+        back = sketches.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        assert back == sketch
+        assert np.array_equal(back.quantiles(QS), sketch.quantiles(QS))
+        merged_json = merge_metric('dist', sketch.to_dict(), back.to_dict())
+        assert sketches.from_dict(merged_json).count == 2 * sketch.count
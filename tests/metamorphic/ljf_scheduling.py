@@ -0,0 +1,40 @@
+import numpy as np
+from tests.utils.scheduling import ALPHA, expected_costs, pack, update_history
+from tests.utils.ssot_loader import get_seed
+
+SEED = get_seed('metamorphic')
+
+
+def test_pack_is_longest_job_first():
+    costs = {'a': 7.0, 'b': 5.0, 'c': 4.0, 'd': 3.0, 'e': 3.0, 'f': 2.0}
+    bins = pack(costs, 3)
+    assert sorted(n for b in bins for n in b) == sorted(costs)
+    # each test goes to the lightest bin so far, ties to the lowest index
+    assert bins == [['a', 'f'], ['b', 'e'], ['c', 'd']]
+    assert pack(costs, 3) == bins
+    assert pack(costs, 10) == [[n] for n in sorted(costs, key=lambda n: (-costs[n], n))]
+    assert pack(costs, 1) == [sorted(costs, key=lambda n: (-costs[n], n))]
+
+
+def test_pack_balances_random_costs():
+    rng = np.random.default_rng(SEED)
+    for jobs in (2, 4, 8):
+        costs = {f't{i}': float(c) for i, c in enumerate(rng.lognormal(size=200))}
+        loads = [sum(costs[n] for n in b) for b in pack(costs, jobs)]
+        # Graham's bound for LPT: within 4/3 of the optimum, itself >= mean load
+        assert max(loads) <= 4 / 3 * max(sum(loads) / jobs, max(costs.values())) + 1e-9
+
+
+def test_history_smooths_and_aggregates_by_id():
+    history = {'tests': {}, 'ids': {}}
+    update_history(history, {'f.py::a': {'id': 'INV-01', 'seconds': 2.0, 'trials': 1000},
+                             'f.py::b': {'id': 'INV-01', 'seconds': 1.0, 'trials': None},
+                             'g.py::c': {'id': None, 'seconds': 4.0, 'trials': 10}})
+    update_history(history, {'f.py::a': {'id': 'INV-01', 'seconds': 4.0, 'trials': 1000}})
+    a = history['tests']['f.py::a']
+    assert a['seconds'] == ALPHA * 4.0 + (1 - ALPHA) * 2.0 and a['runs'] == 2
+    assert a['trials_per_sec'] == 1000 / a['seconds']
+    assert history['ids'] == {'INV-01': {'seconds': a['seconds'] + 1.0, 'trials': 1000, 'tests': 2,
+                                         'trials_per_sec': 1000 / (a['seconds'] + 1.0)}}
+    costs = expected_costs(['f.py::a', 'f.py::b', 'new.py::x'], history)
+    assert costs['new.py::x'] == (a['seconds'] + 1.0) / 2
@@ -1,21 +1,29 @@
 import numpy as np
-from tests.utils.generators import gen_UN
-from tests.utils.algebra_api import add, mul, project
+from tests.utils import eft
+from tests.utils.algebra_api import add_batch, mul_batch, project_batch
 from tests.utils.oracles import classical_add, classical_mul
+from tests.utils.sample_bank import draw_stream
 from tests.utils.ssot_loader import get_trials, get_seed
 
 SEED = get_seed('metamorphic')
 TRIALS = get_trials(override=1000)
 
 def test_project_vs_operate():
-    rng = np.random.default_rng(SEED)
-    for _ in range(TRIALS):
-        x = gen_UN(rng); y = gen_UN(rng)
-        # add
-        u_add = project(add(x,y))[1]
-        c_add = classical_add(project(x), project(y))[1]
-        assert u_add >= c_add
-        # mul
-        u_mul = project(mul(x,y,lam=1.0))[1]
-        c_mul = classical_mul(project(x), project(y))[1]
-        assert u_mul >= c_mul
+    # π(x ○ y).u >= (π(x) ○ π(y)).u holds exactly; the comparison allows only the
+    # provable rounding error of both float evaluations (add is exact-equal, so
+    # a plain >= fails by an ulp when the two sides round differently).
+    xs, ys = draw_stream(SEED, TRIALS, 2)
+    x, y = xs.as_batch(), ys.as_batch()
+    px, py = eft.project_ref(x), eft.project_ref(y)
+    # add
+    u_add = project_batch(add_batch(x, y))[1]
+    c_add = classical_add(project_batch(x), project_batch(y))[1]
+    check = eft.check_le(c_add, u_add, eft.classical_add_ref(px, py)[1],
+                         eft.project_ref(eft.add_ref(x, y))[1])
+    assert check.count == 0, f"add: {check.count} violations, max excess {check.max_excess}"
+    # mul
+    u_mul = project_batch(mul_batch(x, y, lam=1.0))[1]
+    c_mul = classical_mul(project_batch(x), project_batch(y))[1]
+    check = eft.check_le(c_mul, u_mul, eft.classical_mul_ref(px, py)[1],
+                         eft.project_ref(eft.mul_ref(x, y, lam=1.0))[1])
+    assert check.count == 0, f"mul: {check.count} violations, max excess {check.max_excess}"
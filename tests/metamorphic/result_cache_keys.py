@@ -0,0 +1,78 @@
+import os
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from tests.utils import result_cache
+from tests.utils.result_cache import ROOT, cache_key, dependencies
+from tests.utils.ssot_loader import get_float_type
+
+
+def _rel(paths):
+    return {p.relative_to(ROOT).as_posix() for p in paths}
+
+
+@contextmanager
+def _env(name, value):
+    """Set name to value (None: unset) for the duration of the block."""
+    old = os.environ.get(name)
+    if value is None:
+        os.environ.pop(name, None)
+    else:
+        os.environ[name] = value
+    try:
+        yield
+    finally:
+        if old is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = old
+
+
+def _item(path, nodeid, **module):
+    return SimpleNamespace(path=ROOT / path, nodeid=nodeid, module=SimpleNamespace(**module))
+
+
+def test_dependencies_follow_imports_transitively():
+    deps = _rel(dependencies(ROOT / 'tests/properties/inv01_triangle.py'))
+    # direct imports, what they import in turn, and the packages on the way
+    assert {'tests/properties/inv01_triangle.py', 'tests/utils/generators.py',
+            'tests/utils/algebra_api.py', 'tests/utils/instrument.py', 'tests/utils/sketches.py',
+            'tests/__init__.py', 'tests/utils/__init__.py', 'tests/properties/__init__.py'} <= deps
+    assert 'tests/utils/scheduling.py' not in deps and 'tests/utils/reduction.py' not in deps
+    assert 'tests/utils/scheduling.py' in _rel(dependencies(ROOT / 'tests/conftest.py'))
+
+
+def test_key_tracks_parameters_and_content():
+    item = _item('tests/properties/inv01_triangle.py', 'tests/properties/inv01_triangle.py::t',
+                 SEED=1, TRIALS=100)
+    key = cache_key(item)
+    assert cache_key(item) == key
+    assert cache_key(_item(item.path, item.nodeid, SEED=2, TRIALS=100)) != key
+    assert cache_key(_item(item.path, item.nodeid, SEED=1, TRIALS=101)) != key
+    assert cache_key(_item(item.path, item.nodeid + 'x', SEED=1, TRIALS=100)) != key
+    other_dtype = 'longdouble' if get_float_type().name == 'float32' else 'float32'
+    for name, value in (('SSOT_FLOAT_TYPE', other_dtype), ('SSOT_TRIALS', '7'),
+                        ('SSOT_TIME_BUDGET', '0.001'), ('SSOT_TARGET_RATE', '1e-3')):
+        with _env(name, value):
+            assert cache_key(item) != key, name
+    # switches that do not change outcomes leave the key alone (SSOT_REPORT
+    # enters separately, since a replay must bring back the records); each is
+    # toggled from unset, whatever the surrounding run (make report, profile) set
+    for name in result_cache.ENV_IGNORED:
+        with _env(name, None):
+            off = cache_key(item)
+            with _env(name, '1'):
+                assert (cache_key(item) == off) != (name == 'SSOT_REPORT'), name
+    assert cache_key(item) == key
+    # files a module declares it reads are part of its key
+    with_script = _item(item.path, item.nodeid, SEED=1, TRIALS=100,
+                        DEPENDENCIES=('scripts/hash_tree.py',))
+    assert cache_key(with_script) != key
+    # a changed digest of any dependency, however deep, changes the key
+    path = (ROOT / 'tests/utils/algebra_api.py').resolve()
+    stamp, digest = result_cache._DIGESTS[path]
+    result_cache._DIGESTS[path] = (stamp, '0' * 64)
+    try:
+        assert cache_key(item) != key
+    finally:
+        result_cache._DIGESTS[path] = (stamp, digest)
@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+from tests.utils.result_cache import ENV_IGNORED, ENV_RERUN, ROOT, get_result_cache_dir
+
+# run, replayed, run: the replayed test sits between two that really run, and
+# shares its module with the first but not its directory with the last
+RUN = 'tests/metamorphic/ljf_scheduling.py::test_pack_is_longest_job_first'
+REPLAY = 'tests/metamorphic/ljf_scheduling.py::test_history_smooths_and_aggregates_by_id'
+LAST = 'tests/properties/inv01_triangle.py::test_inv01_triangle_smoke'
+
+
+def _pytest(*nodeids, rerun=False):
+    # none of the surrounding run's switches: SSOT_INSTRUMENT would turn the
+    # cache off, SSOT_REPORT would write into its results stream
+    env = {k: v for k, v in os.environ.items() if k not in ENV_IGNORED + ('PYTEST_ADDOPTS',)}
+    env[ENV_RERUN] = '1' if rerun else '0'
+    return subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider', *nodeids],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+
+
+def _forget(*nodeids):
+    for path in get_result_cache_dir().glob('*.json'):
+        try:
+            if json.loads(path.read_text()).get('test') in nodeids:
+                path.unlink()
+        except (OSError, ValueError):
+            pass
+
+
+def test_replay_between_real_runs_keeps_setup_state():
+    assert _pytest(REPLAY, rerun=True).returncode == 0
+    _forget(RUN, LAST)
+    run = _pytest(RUN, REPLAY, LAST)
+    assert run.returncode == 0, run.stdout[-3000:]
+    assert '3 passed' in run.stdout and '1 unchanged tests replayed' in run.stdout, run.stdout[-3000:]
@@ -0,0 +1,48 @@
+import numpy as np
+from tests.utils.generators import gen_UN_batch
+from tests.utils.algebra_api import add_batch, mul_batch
+from tests.utils.sharding import ShardResult, run_sharded, shard_plan
+from tests.utils.sketches import LogHistogram, QuantileSketch
+from tests.utils.ssot_loader import get_trials, get_seed
+
+SEED = get_seed('metamorphic')
+TRIALS = get_trials(override=20000)
+
+
+def _widths(rng, n):
+    x = gen_UN_batch(rng, n); y = gen_UN_batch(rng, n)
+    (_, ut_s), (_, um_s) = add_batch(x, y)
+    (_, ut_p), (_, um_p) = mul_batch(x, y, lam=1.0)
+    return ut_s + um_s, ut_p + um_p
+
+
+def _width_shard(rng, n):
+    u_sum, u_prod = _widths(rng, n)
+    sum_dist, prod_dist = LogHistogram(), QuantileSketch()
+    sum_dist.add(u_sum)
+    prod_dist.add(u_prod)
+    return ShardResult(
+        trials=n,
+        violations=int(np.count_nonzero(u_prod > u_sum)),
+        max_deltas={'u_sum': float(np.max(u_sum)), 'u_prod': float(np.max(u_prod))},
+        sketches={'u_sum_dist': sum_dist, 'u_prod_dist': prod_dist},
+    )
+
+
+def test_sharded_run_independent_of_worker_count():
+    serial = run_sharded(_width_shard, TRIALS, SEED, workers=1, shard_size=max(1, TRIALS // 8))
+    pooled = run_sharded(_width_shard, TRIALS, SEED, workers=3, shard_size=max(1, TRIALS // 8))
+    assert serial == pooled
+    assert serial.trials == TRIALS
+
+
+def test_sharded_sketches_match_single_pass():
+    """Merged shard sketches equal one sketch fed all values at once."""
+    shard_size = max(1, TRIALS // 8)
+    merged = run_sharded(_width_shard, TRIALS, SEED, workers=1, shard_size=shard_size)
+    widths = [_widths(np.random.default_rng(seq), n) for seq, n in shard_plan(TRIALS, SEED, shard_size)]
+    sum_dist, prod_dist = LogHistogram(), QuantileSketch()
+    sum_dist.add(np.concatenate([w[0] for w in widths]))
+    prod_dist.add(np.concatenate([w[1] for w in widths]))
+    assert merged.sketches == {'u_sum_dist': sum_dist, 'u_prod_dist': prod_dist}
+    assert sum_dist.count == TRIALS
@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+from tests.utils.generators import gen_UN_batch, gen_UN_batch_scaled
+from tests.utils.sliding_window import SlidingWindow, WindowedStream, windowed
+from tests.utils.ssot_loader import get_seed
+
+SEED = get_seed('metamorphic')
+LAM = 0.7
+
+
+def _rows(batch):
+    (na, ut), (nm, um) = batch
+    return np.column_stack((na, ut, nm, um))
+
+
+def _slice(batch, a, b):
+    (na, ut), (nm, um) = batch
+    return ((na[a:b], ut[a:b]), (nm[a:b], um[a:b]))
+
+
+def _fed(x, size, op, cuts):
+    stream = WindowedStream(size, op, LAM)
+    bounds = [0] + list(cuts) + [len(x[0][0])]
+    return np.concatenate([_rows(stream.feed(_slice(x, a, b))) for a, b in zip(bounds, bounds[1:])])
+
+
+def test_chunking_does_not_change_windows():
+    rng = np.random.default_rng(SEED)
+    n = 600
+    x = gen_UN_batch_scaled(rng, n)
+    # long ⊗ windows still reach inf/nan in float32: compare those bit-for-bit too
+    with np.errstate(over='ignore', invalid='ignore'):
+        for op in ('add', 'mul'):
+            for size in (1, 7, 64, 250):
+                whole = _rows(windowed(x, size, op, LAM))
+                assert len(whole) == n - size + 1
+                # chunks smaller and larger than the window, empty ones, and cuts on
+                # and off block boundaries
+                for cuts in ([1, 2, 3], [size, 2 * size], [5, 5, 300], sorted(rng.integers(0, n, 12))):
+                    assert np.array_equal(_fed(x, size, op, cuts), whole, equal_nan=True), (op, size, cuts)
+                window = SlidingWindow(size, op, LAM)
+                pushed = [window.push(((x[0][0][i], x[0][1][i]), (x[1][0][i], x[1][1][i])))
+                          for i in range(n)][size - 1:]
+                assert np.array_equal(np.array([[a, b, c, d] for (a, b), (c, d) in pushed],
+                                               dtype=whole.dtype), whole, equal_nan=True), (op, size)
+
+
+def test_add_windows_are_sums_of_their_own_elements():
+    rng = np.random.default_rng(SEED + 1)
+    n, size = 20_000, 100
+    x = gen_UN_batch(rng, n, dtype=np.float64)
+    # one huge early sample: differencing running totals would lose the small ones after it
+    for leaf in (x[0][1], x[1][1]):
+        leaf[0] = 1e12
+    stream = WindowedStream(size, 'add')
+    out = np.concatenate([_rows(stream.feed(_slice(x, a, a + 2500))) for a in range(0, n, 2500)])
+    rows = _rows(x)
+    for e in range(size, n, 997):
+        exact = [math.fsum(rows[e - size + 1:e + 1, k]) for k in range(4)]
+        got = out[e - size + 1]
+        for k in range(4):
+            assert abs(got[k] - exact[k]) <= 1e-12 * math.fsum(abs(rows[e - size + 1:e + 1, k])), (e, k)
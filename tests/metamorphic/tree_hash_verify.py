@@ -0,0 +1,35 @@
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPT = Path(__file__).parent.parent.parent / 'scripts' / 'hash_tree.py'
+DEPENDENCIES = ('scripts/hash_tree.py',)  # run, not imported: part of the result-cache key
+
+
+def _hash_tree(root, *args):
+    return subprocess.run([sys.executable, str(SCRIPT), '--root', str(root), *args],
+                          capture_output=True, text=True)
+
+
+def test_verify_ignores_run_state_under_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'tests').mkdir()
+        (root / 'tests' / 'a.py').write_text('x = 1\n')
+        (root / '.cache').mkdir()
+        (root / '.cache' / 'timings.json').write_text('{}')
+        manifest = root / 'REPO_TREE_SHA256.txt'
+        assert _hash_tree(root, '--out', str(manifest)).returncode == 0
+        # what a test run leaves behind: result cache entries, timings, banks
+        (root / '.cache' / 'results').mkdir()
+        (root / '.cache' / 'results' / '0f.json').write_text('{"key": "0f"}')
+        (root / '.cache' / 'timings.json').write_text('{"tests": {}}')
+        (root / '.cache' / 'sample_bank').mkdir()
+        (root / '.cache' / 'sample_bank' / 'bank.npy').write_bytes(b'\0' * 64)
+        run = _hash_tree(root, '--verify', str(manifest))
+        assert run.returncode == 0 and run.stdout.strip() == 'OK', run.stderr
+        # a real change is still caught
+        (root / 'tests' / 'a.py').write_text('x = 2\n')
+        run = _hash_tree(root, '--verify', str(manifest))
+        assert run.returncode == 1 and 'changed: tests/a.py' in run.stderr
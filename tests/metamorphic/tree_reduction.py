@@ -0,0 +1,61 @@
+import numpy as np
+from tests.utils.algebra_api import add, mul
+from tests.utils.generators import gen_UN_batch
+from tests.utils.predicates import close
+from tests.utils.reduction import reduce_add, reduce_mul
+from tests.utils.sample_bank import get_bank
+from tests.utils.ssot_loader import get_trials, get_seed
+
+SEED = get_seed('metamorphic')
+TRIALS = get_trials(override=20000)
+N_REF = 1000  # scalar reference folds are slow
+
+
+def _near_one(rng, n):
+    """Elements with nominals ~1 and small u, so long ⊗ chains stay finite and nonzero."""
+    (n_a, u_t), (n_m, u_m) = gen_UN_batch(rng, n, dtype=np.float64)
+    c = 1e-3 / np.maximum(np.maximum(np.abs(n_a), np.abs(n_m)), np.maximum(u_t, u_m))
+    return ((1.0 + n_a * c, u_t * c), (1.0 + n_m * c, u_m * c))
+
+
+def _tree_reference(op, xs):
+    """The documented order, one scalar op at a time."""
+    while len(xs) > 1:
+        carry = xs[-1:] if len(xs) % 2 else []
+        xs = [op(xs[i], xs[i + 1]) for i in range(0, len(xs) - 1, 2)] + carry
+    return xs[0]
+
+
+def _elements(x):
+    (n_a, u_t), (n_m, u_m) = x
+    return [((a, t), (m, u)) for a, t, m, u in zip(n_a.tolist(), u_t.tolist(), n_m.tolist(), u_m.tolist())]
+
+
+def test_reduction_independent_of_workers_and_block():
+    x = get_bank(SEED, TRIALS + 77).as_batch()
+    y = _near_one(np.random.default_rng(SEED), TRIALS + 77)
+    for reduce, data in ((reduce_add, x), (reduce_mul, y)):
+        serial = reduce(data, block=1 << 14, workers=1)
+        for block, workers in ((1 << 10, 3), (1 << 6, 8), (1, 2), (1 << 20, 4)):
+            assert reduce(data, block=block, workers=workers) == serial, (reduce.__name__, block, workers)
+
+
+def test_reduction_follows_documented_tree_order():
+    x = get_bank(SEED, N_REF + 3).as_batch()
+    y = _near_one(np.random.default_rng(SEED), N_REF + 3)
+    assert reduce_add(x, block=64, workers=3) == _tree_reference(add, _elements(x))
+    assert reduce_mul(y, block=64, workers=3) == _tree_reference(lambda a, b: mul(a, b, lam=1.0), _elements(y))
+    assert reduce_mul(y, lam=0.5, block=8) == _tree_reference(lambda a, b: mul(a, b, lam=0.5), _elements(y))
+
+
+def test_reduce_add_matches_left_fold():
+    xs = _elements(get_bank(SEED, N_REF).as_batch())
+    folded = xs[0]
+    for x in xs[1:]:
+        folded = add(folded, x)
+    tree = reduce_add(get_bank(SEED, N_REF).as_batch())
+    for i in (0, 1):
+        for j in (0, 1):
+            # both orders are within n·eps of the exact sum of magnitudes
+            scale = sum(abs(x[i][j]) for x in xs)
+            assert close(tree[i][j], folded[i][j], atol=N_REF * 2.0 ** -52 * scale)
@@ -1,18 +1,24 @@
 import numpy as np
 import pytest
-from tests.utils.generators import gen_UN, boundary_ok
+from tests.utils.generators import gen_UN_batch, gen_UN_batch_scaled, boundary_ok
 from tests.utils.algebra_api import add, mul, flip, catch
+from tests.utils.expr_tree import gen_expr_tree, compile_tree, evaluate_batch
+from tests.utils.predicates import check_triangle
+from tests.utils.results import record_invariant
+from tests.utils.sample_bank import draw_stream
 from tests.utils.ssot_loader import get_trials, get_seed, get_atol
 
 SEED = get_seed('properties')
 TRIALS = get_trials(override=2000)  # Use 2000 for local; can be overridden via SSOT_TRIALS env var
 ATOL = get_atol()
+N_TREES = 200
+TREE_DEPTH = 4
+TREE_FANOUT = 3
+N_LEAVES = 6
 
-def check_all_ops(un):
+def check_all_ops(un, other):
     assert boundary_ok(un, atol=ATOL)
     # add with another sample
-    rng = np.random.default_rng(SEED)
-    other = gen_UN(rng)
     assert boundary_ok(add(un, other), atol=ATOL)
     # mul with another sample
     assert boundary_ok(mul(un, other, lam=1.0), atol=ATOL)
@@ -22,7 +28,30 @@ def check_all_ops(un):
     assert boundary_ok(catch(un), atol=ATOL)
 
 def test_inv01_triangle_smoke():
+    uns, others = draw_stream(SEED, TRIALS, 2)
+    for un, other in zip(uns, others):
+        check_all_ops(un, other)
+
+def test_inv01_triangle_batch_generator():
+    rng = np.random.default_rng(SEED)
+    (n_a, u_t), (n_m, u_m) = gen_UN_batch(rng, TRIALS)
+    assert np.all(u_t >= 0) and np.all(u_m >= 0)
+    assert np.all(boundary_ok(((n_a, u_t), (n_m, u_m)), atol=ATOL))
+
+def test_inv01_triangle_expr_trees():
+    """Triangle preservation through random compositions of ⊕, ⊗(λ), scalar×, B, Cα."""
     rng = np.random.default_rng(SEED)
-    for _ in range(TRIALS):
-        un = gen_UN(rng)
-        check_all_ops(un)
+    leaves = [gen_UN_batch_scaled(rng, TRIALS) for _ in range(N_LEAVES)]
+    violations, failures = 0, []
+    for _ in range(N_TREES):
+        tree = gen_expr_tree(rng, depth=TREE_DEPTH, fanout=TREE_FANOUT, n_leaves=N_LEAVES)
+        check = check_triangle(evaluate_batch(compile_tree(tree), leaves))
+        violations += check.count
+        if check.count:
+            failures.append((tree, check))
+    record_invariant('INV-01', {'trials': N_TREES * TRIALS, 'violations': violations})
+    for tree, check in failures[:1]:
+        assert check.count == 0, (
+            f"Triangle violated {check.count}/{TRIALS} times (max excess {check.max_excess}) "
+            f"for tree {tree}"
+        )
@@ -1,30 +1,53 @@
 import numpy as np
-from tests.utils.generators import gen_UN
-from tests.utils.algebra_api import add, mul, project
+from tests.utils import eft
+from tests.utils.algebra_api import add_batch, mul_batch, project_batch
 from tests.utils.oracles import classical_add, classical_mul
-from tests.utils.ssot_loader import get_trials, get_seed, get_atol, get_rtol
+from tests.utils.results import record_invariant
+from tests.utils.sample_bank import draw_stream
+from tests.utils.sketches import LogHistogram
+from tests.utils.ssot_loader import get_trials, get_seed
 
 SEED = get_seed('properties')
 TRIALS = get_trials(override=2000)
-ATOL = get_atol()
-RTOL = get_rtol()
+
+
+def _record_gap(op, n_u, n_c, check):
+    # gap relative to the classical width: ~1e-16 rounding for ⊕, O(1) for ⊗
+    gap = LogHistogram(-20, 4)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gap.add((n_u[1] - n_c[1]) / n_c[1])
+    record_invariant('INV-03', {'trials': TRIALS, 'violations': check.count,
+                                f'max_conservativity_excess_{op}': check.max_excess,
+                                'conservativity_gap_dist': gap})
 
 def test_inv03_projection_conservativity_add():
     # project(add(x,y)).u = (ut1+ut2)+(um1+um2)
     # classical_add(project(x),project(y)).u = (ut1+um1)+(ut2+um2)
-    # These are mathematically equal; floating-point addition order can differ at high scale.
-    rng = np.random.default_rng(SEED)
-    for _ in range(TRIALS):
-        x = gen_UN(rng); y = gen_UN(rng)
-        n_u = project(add(x, y))
-        n_c = classical_add(project(x), project(y))
-        tol = ATOL + RTOL * max(abs(n_u[1]), abs(n_c[1]))
-        assert n_u[1] >= n_c[1] - tol, f"Projection conservativity add: {n_u[1]} < {n_c[1]} - {tol}"
+    # These are mathematically equal; floating-point addition order can differ at high scale,
+    # so the comparison allows exactly the provable rounding error of both sides.
+    xs, ys = draw_stream(SEED, TRIALS, 2)
+    x, y = xs.as_batch(), ys.as_batch()
+    n_u = project_batch(add_batch(x, y))
+    n_c = classical_add(project_batch(x), project_batch(y))
+    check = eft.check_le(n_c[1], n_u[1],
+                         eft.classical_add_ref(eft.project_ref(x), eft.project_ref(y))[1],
+                         eft.project_ref(eft.add_ref(x, y))[1])
+    _record_gap('add', n_u, n_c, check)
+    assert check.count == 0, (
+        f"Projection conservativity add violated {check.count}/{TRIALS} times beyond rounding, "
+        f"max excess: {check.max_excess}"
+    )
 
 def test_inv03_projection_conservativity_mul():
-    rng = np.random.default_rng(SEED)
-    for _ in range(TRIALS):
-        x = gen_UN(rng); y = gen_UN(rng)
-        n_u = project(mul(x, y, lam=1.0))
-        n_c = classical_mul(project(x), project(y))
-        assert n_u[1] >= n_c[1]
+    xs, ys = draw_stream(SEED, TRIALS, 2)
+    x, y = xs.as_batch(), ys.as_batch()
+    n_u = project_batch(mul_batch(x, y, lam=1.0))
+    n_c = classical_mul(project_batch(x), project_batch(y))
+    check = eft.check_le(n_c[1], n_u[1],
+                         eft.classical_mul_ref(eft.project_ref(x), eft.project_ref(y))[1],
+                         eft.project_ref(eft.mul_ref(x, y, lam=1.0))[1])
+    _record_gap('mul', n_u, n_c, check)
+    assert check.count == 0, (
+        f"Projection conservativity mul violated {check.count}/{TRIALS} times beyond rounding, "
+        f"max excess: {check.max_excess}"
+    )
@@ -1,13 +1,14 @@
 import numpy as np
 import pytest
-from tests.utils.generators import gen_UN, boundary_ok
+from tests.utils.generators import boundary_ok
 from tests.utils.algebra_api import add
-from tests.utils.ssot_loader import get_trials, get_seed, get_atol, get_rtol
+from tests.utils.predicates import triangle_ok
+from tests.utils.sample_bank import draw_stream
+from tests.utils.ssot_loader import get_trials, get_seed, get_atol
 
 SEED = get_seed('properties')
 TRIALS = get_trials(override=2000)
 ATOL = get_atol()
-RTOL = get_rtol()
 
 
 def test_inv04_triangle_preservation_addition():
@@ -15,12 +16,10 @@ def test_inv04_triangle_preservation_addition():
     Test that Triangle(x) ∧ Triangle(y) ⇒ Triangle(x ⊕ y).
     If both x and y satisfy the triangle inequality, their sum should too.
     """
-    rng = np.random.default_rng(SEED)
+    xs, ys = draw_stream(SEED, TRIALS, 2)
     violations = 0
 
-    for _ in range(TRIALS):
-        x = gen_UN(rng)
-        y = gen_UN(rng)
+    for x, y in zip(xs, ys):
 
         # Verify inputs satisfy triangle inequality
         assert boundary_ok(x, atol=ATOL), "Generated x violates triangle inequality"
@@ -30,9 +29,7 @@ def test_inv04_triangle_preservation_addition():
         result = add(x, y)
 
         # Check that result satisfies triangle inequality (scale-relative tolerance)
-        (na_r, ut_r), (nm_r, um_r) = result
-        scale = max(abs(na_r), abs(nm_r), ut_r, um_r, 1.0)
-        if not boundary_ok(result, atol=ATOL + RTOL * scale):
+        if not triangle_ok(result):
             violations += 1
 
     assert violations == 0, f"Triangle preservation violated {violations}/{TRIALS} times"
@@ -76,9 +73,7 @@ def test_inv04_triangle_boundary_cases():
         # Result should still satisfy triangle (possibly at boundary).
         # Use scale-relative tolerance: at boundary, floating-point rounding can
         # produce |nm-na| slightly above ut+um by ~rtol*scale.
-        (na_r, ut_r), (nm_r, um_r) = result
-        scale = max(abs(na_r), abs(nm_r), ut_r, um_r, 1.0)
-        assert boundary_ok(result, atol=ATOL + RTOL * scale), "Triangle violated at boundary case"
+        assert triangle_ok(result), "Triangle violated at boundary case"
 
 
 def test_inv04_componentwise_addition():
@@ -86,11 +81,9 @@ def test_inv04_componentwise_addition():
     Verify that component-wise addition preserves triangle inequality.
     For addition: (n_a1+n_a2, u_t1+u_t2), (n_m1+n_m2, u_m1+u_m2)
     """
-    rng = np.random.default_rng(SEED)
+    xs, ys = draw_stream(SEED, TRIALS, 2)
 
-    for _ in range(TRIALS):
-        x = gen_UN(rng)
-        y = gen_UN(rng)
+    for x, y in zip(xs, ys):
 
         (na1, ut1), (nm1, um1) = x
         (na2, ut2), (nm2, um2) = y
@@ -112,6 +105,4 @@ def test_inv04_componentwise_addition():
         # By triangle inequality of absolute values and the fact that
         # |nm1-na1| ≤ ut1+um1 and |nm2-na2| ≤ ut2+um2, this should hold
 
-        (na_r2, ut_r2), (nm_r2, um_r2) = result
-        scale2 = max(abs(na_r2), abs(nm_r2), ut_r2, um_r2, 1.0)
-        assert boundary_ok(result, atol=ATOL + RTOL * scale2)
+        assert triangle_ok(result)
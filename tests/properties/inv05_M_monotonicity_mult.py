@@ -1,16 +1,62 @@
 import numpy as np
-from tests.utils.generators import gen_UN, M
-from tests.utils.algebra_api import mul
+from tests.utils.generators import gen_UN_batch, M
+from tests.utils.algebra_api import mul, mul_batch
+from tests.utils.adversarial import search, uniform_baseline
+from tests.utils.predicates import check_le, margin_le
+from tests.utils.results import record_invariant
+from tests.utils.sharding import ShardResult, run_sharded
+from tests.utils.sketches import QuantileSketch
+from tests.utils.sample_bank import draw_stream
 from tests.utils.ssot_loader import get_trials, get_seed, get_atol
 
 SEED = get_seed('properties')
 TRIALS = get_trials(override=2000)
+SHARDED_TRIALS = get_trials()  # full SSOT count, split across SSOT_WORKERS processes
 ATOL = get_atol()
+ADV_POPULATION = 2048
+ADV_GENERATIONS = 30
+M_RATIO_ALPHA = 1e-2  # 4096 buckets then span ~36 decades of M(x⊗y)/(M(x)·M(y))
 
 def test_inv05_M_monotonicity_mult():
-    rng = np.random.default_rng(SEED)
-    for _ in range(TRIALS):
-        x = gen_UN(rng); y = gen_UN(rng)
+    xs, ys = draw_stream(SEED, TRIALS, 2)
+    for x, y in zip(xs, ys):
         lhs = M(mul(x, y, lam=1.0))
         rhs = M(x) * M(y)
         assert lhs <= rhs + ATOL
+
+def _M_monotonicity_shard(rng, n):
+    x = gen_UN_batch(rng, n); y = gen_UN_batch(rng, n)
+    lhs, rhs = M(mul_batch(x, y, lam=1.0)), M(x) * M(y)
+    check = check_le(lhs, rhs)
+    ratio = QuantileSketch(M_RATIO_ALPHA)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio.add(lhs / rhs)
+    return ShardResult(trials=n, violations=check.count, max_deltas={'max_M_excess': check.max_excess},
+                       sketches={'M_ratio_dist': ratio})
+
+def test_inv05_M_monotonicity_mult_sharded():
+    result = run_sharded(_M_monotonicity_shard, SHARDED_TRIALS, SEED)
+    record_invariant('INV-05', {'trials': result.trials, 'violations': result.violations,
+                                **result.max_deltas, **result.sketches})
+    assert result.trials == SHARDED_TRIALS
+    assert result.violations == 0, (
+        f"M-monotonicity violated {result.violations}/{result.trials} times, "
+        f"max excess: {result.max_deltas['max_M_excess']}"
+    )
+
+
+def _M_margin(x, y):
+    return margin_le(M(mul_batch(x, y, lam=1.0)), M(x) * M(y))
+
+def test_inv05_M_monotonicity_adversarial():
+    """Equality needs zero n_a's and boundary elements, which uniform sampling never hits."""
+    rng = np.random.default_rng(SEED)
+    result = search(_M_margin, 2, rng, ADV_POPULATION, ADV_GENERATIONS)
+    baseline = uniform_baseline(_M_margin, 2, rng, result.evaluations)
+    record_invariant('INV-05', {'adversarial_evaluations': result.evaluations,
+                                'min_adversarial_margin': result.min_margin,
+                                'min_uniform_margin': baseline})
+    assert result.violations == 0, (
+        f"M-monotonicity violated (margin {result.min_margin}) at {result.worst}"
+    )
+    assert result.min_margin <= baseline
@@ -1,40 +1,23 @@
 import numpy as np
 import pytest
 from tests.utils.generators import gen_UN
-from tests.utils.algebra_api import add, mul
-from tests.utils.ssot_loader import get_trials, get_seed, get_atol, get_rtol
+from tests.utils import eft
+from tests.utils.algebra_api import add, mul, mul_batch
+from tests.utils.predicates import close, un_close as epsilon_equal
+from tests.utils.results import record_invariant
+from tests.utils.sample_bank import draw_stream
+from tests.utils.ssot_loader import get_trials, get_seed
 
 SEED = get_seed('properties')
 TRIALS = get_trials(override=2000)
-ATOL = get_atol()
-RTOL = get_rtol()
-
-
-def epsilon_equal(un1, un2, atol=None, rtol=None):
-    """Check if two UN values are epsilon-equal (mixed absolute+relative tolerance)."""
-    if atol is None:
-        atol = ATOL
-    if rtol is None:
-        rtol = RTOL
-    (na1, ut1), (nm1, um1) = un1
-    (na2, ut2), (nm2, um2) = un2
-    return (
-        abs(na1 - na2) < atol + rtol * max(abs(na1), abs(na2)) and
-        abs(ut1 - ut2) < atol + rtol * max(abs(ut1), abs(ut2)) and
-        abs(nm1 - nm2) < atol + rtol * max(abs(nm1), abs(nm2)) and
-        abs(um1 - um2) < atol + rtol * max(abs(um1), abs(um2))
-    )
 
 
 def test_inv09_associativity_addition():
     """Test that (x ⊕ y) ⊕ z = x ⊕ (y ⊕ z)"""
-    rng = np.random.default_rng(SEED)
+    xs, ys, zs = draw_stream(SEED, TRIALS, 3)
     violations = 0
 
-    for _ in range(TRIALS):
-        x = gen_UN(rng)
-        y = gen_UN(rng)
-        z = gen_UN(rng)
+    for x, y, z in zip(xs, ys, zs):
 
         # Left associative: (x ⊕ y) ⊕ z
         left = add(add(x, y), z)
@@ -50,14 +33,11 @@ def test_inv09_associativity_addition():
 
 def test_inv09_associativity_multiplication():
     """Test that (x ⊗ y) ⊗ z = x ⊗ (y ⊗ z)"""
-    rng = np.random.default_rng(SEED)
+    xs, ys, zs = draw_stream(SEED, TRIALS, 3)
     violations = 0
     max_deltas = [0.0, 0.0, 0.0, 0.0]  # na, ut, nm, um
 
-    for _ in range(TRIALS):
-        x = gen_UN(rng)
-        y = gen_UN(rng)
-        z = gen_UN(rng)
+    for x, y, z in zip(xs, ys, zs):
 
         # Left associative: (x ⊗ y) ⊗ z
         left = mul(mul(x, y, lam=1.0), z, lam=1.0)
@@ -76,6 +56,11 @@ def test_inv09_associativity_multiplication():
         if not epsilon_equal(left, right):  # Mixed atol+rtol handles scale variation
             violations += 1
 
+    record_invariant('INV-09', {
+        'trials': TRIALS, 'mul_violations': violations,
+        **{f'max_mul_delta_{c}': d for c, d in zip(('na', 'ut', 'nm', 'um'), max_deltas)},
+    })
+
     # Note: Multiplication associativity may not hold exactly with placeholder implementation
     # This test documents the expected behavior
     if violations > 0:
@@ -85,6 +70,40 @@ def test_inv09_associativity_multiplication():
         )
 
 
+def test_inv09_associativity_multiplication_eft():
+    """
+    Separate rounding from algebra in ⊗ associativity: n_a, n_m and u_m must
+    agree up to the provable rounding error of both bracketings, and every
+    epsilon-level u_t mismatch must be a real difference between the exact
+    values (the cross-tier guard terms do not associate).
+    """
+    xs, ys, zs = draw_stream(SEED, TRIALS, 3)
+    x, y, z = xs.as_batch(), ys.as_batch(), zs.as_batch()
+    left = mul_batch(mul_batch(x, y, lam=1.0), z, lam=1.0)
+    right = mul_batch(x, mul_batch(y, z, lam=1.0), lam=1.0)
+    left_ref = eft.mul_ref(eft.mul_ref(x, y), z)
+    right_ref = eft.mul_ref(x, eft.mul_ref(y, z))
+
+    (na_l, ut_l), (nm_l, um_l) = left
+    (na_r, ut_r), (nm_r, um_r) = right
+    (na_lr, ut_lr), (nm_lr, um_lr) = left_ref
+    (na_rr, ut_rr), (nm_rr, um_rr) = right_ref
+    for name, a, b, a_ref, b_ref in (('n_a', na_l, na_r, na_lr, na_rr),
+                                     ('n_m', nm_l, nm_r, nm_lr, nm_rr),
+                                     ('u_m', um_l, um_r, um_lr, um_rr)):
+        check = eft.check_equal(a, b, a_ref, b_ref)
+        assert check.count == 0, (
+            f"{name} associativity violated beyond rounding {check.count}/{TRIALS} times, "
+            f"max excess: {check.max_excess}"
+        )
+
+    ut_mismatch = ~close(ut_l, ut_r)
+    algebraic = eft.refs_differ(ut_lr, ut_rr)
+    record_invariant('INV-09', {'mul_ut_algebraic_count': int(np.count_nonzero(algebraic)),
+                                'mul_ut_rounding_count': int(np.count_nonzero(ut_mismatch & ~algebraic))})
+    assert not np.any(ut_mismatch & ~algebraic), "u_t mismatch not explained by the exact values"
+
+
 def test_inv09_mixed_operations_not_associative():
     """Document that ⊕ and ⊗ do NOT associate with each other (sanity check)"""
     rng = np.random.default_rng(SEED)
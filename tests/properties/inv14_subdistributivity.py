@@ -1,13 +1,19 @@
 import numpy as np
 import pytest
-from tests.utils.generators import gen_UN
-from tests.utils.algebra_api import add, mul
-from tests.utils.ssot_loader import get_trials, get_seed, get_atol, get_rtol
+from tests.utils.generators import gen_UN_batch
+from tests.utils.algebra_api import add, mul, add_batch, mul_batch
+from tests.utils import eft
+from tests.utils.adversarial import search, uniform_baseline
+from tests.utils.predicates import close, tol, check_preceq, margin_le
+from tests.utils.results import record_invariant
+from tests.utils.sample_bank import draw_stream
+from tests.utils.ssot_loader import get_trials, get_seed
 
 SEED = get_seed('properties')
 TRIALS = get_trials(override=2000)
-ATOL = get_atol()
-RTOL = get_rtol()
+BATCH_TRIALS = get_trials()  # batch path runs the full SSOT count
+ADV_POPULATION = 2048
+ADV_GENERATIONS = 30
 
 
 def test_inv14_subdistributivity_nominals_equal():
@@ -15,13 +21,10 @@ def test_inv14_subdistributivity_nominals_equal():
     Test that nominals are equal for x ⊗ (y ⊕ z) and (x ⊗ y) ⊕ (x ⊗ z).
     Standard distributivity holds for nominals.
     """
-    rng = np.random.default_rng(SEED)
+    xs, ys, zs = draw_stream(SEED, TRIALS, 3)
     violations = 0
 
-    for _ in range(TRIALS):
-        x = gen_UN(rng)
-        y = gen_UN(rng)
-        z = gen_UN(rng)
+    for x, y, z in zip(xs, ys, zs):
 
         # Left: x ⊗ (y ⊕ z)
         left = mul(x, add(y, z), lam=1.0)
@@ -32,8 +35,7 @@ def test_inv14_subdistributivity_nominals_equal():
         (na_r, ut_r), (nm_r, um_r) = right
 
         # Check nominal equality (mixed tolerance)
-        if (abs(na_l - na_r) > ATOL + RTOL * max(abs(na_l), abs(na_r)) or
-                abs(nm_l - nm_r) > ATOL + RTOL * max(abs(nm_l), abs(nm_r))):
+        if not (close(na_l, na_r) and close(nm_l, nm_r)):
             violations += 1
 
     assert violations == 0, f"Nominal distributivity violated {violations}/{TRIALS} times"
@@ -44,16 +46,13 @@ def test_inv14_subdistributivity_uncertainties():
     Test that uncertainties satisfy x ⊗ (y ⊕ z) ⪯ (x ⊗ y) ⊕ (x ⊗ z).
     The left side (direct) should have tighter or equal uncertainties than the right (distributed).
     """
-    rng = np.random.default_rng(SEED)
+    xs, ys, zs = draw_stream(SEED, TRIALS, 3)
     violations_ut = 0
     violations_um = 0
     max_excess_ut = 0.0
     max_excess_um = 0.0
 
-    for _ in range(TRIALS):
-        x = gen_UN(rng)
-        y = gen_UN(rng)
-        z = gen_UN(rng)
+    for x, y, z in zip(xs, ys, zs):
 
         # Left: x ⊗ (y ⊕ z)
         left = mul(x, add(y, z), lam=1.0)
@@ -67,8 +66,8 @@ def test_inv14_subdistributivity_uncertainties():
         excess_ut = ut_l - ut_r
         excess_um = um_l - um_r
 
-        tol_ut = ATOL + RTOL * max(abs(ut_l), abs(ut_r))
-        tol_um = ATOL + RTOL * max(abs(um_l), abs(um_r))
+        tol_ut = tol(ut_l, ut_r)
+        tol_um = tol(um_l, um_r)
 
         if excess_ut > tol_ut:
             violations_ut += 1
@@ -78,6 +77,9 @@ def test_inv14_subdistributivity_uncertainties():
             violations_um += 1
             max_excess_um = max(max_excess_um, excess_um)
 
+    record_invariant('INV-14', {'trials': TRIALS, 'ut_violations': violations_ut,
+                                'um_violations': violations_um,
+                                'max_excess_ut': max_excess_ut, 'max_excess_um': max_excess_um})
     assert violations_ut == 0, (
         f"Sub-distributivity violated for u_t: {violations_ut}/{TRIALS} times, "
         f"max excess: {max_excess_ut}"
@@ -92,13 +94,10 @@ def test_inv14_subdistributivity_combined():
     """
     Test combined sub-distributivity: both tiers should satisfy the constraint.
     """
-    rng = np.random.default_rng(SEED)
+    xs, ys, zs = draw_stream(SEED, TRIALS, 3)
     violations = 0
 
-    for _ in range(TRIALS):
-        x = gen_UN(rng)
-        y = gen_UN(rng)
-        z = gen_UN(rng)
+    for x, y, z in zip(xs, ys, zs):
 
         # Left: x ⊗ (y ⊕ z)
         left = mul(x, add(y, z), lam=1.0)
@@ -112,8 +111,75 @@ def test_inv14_subdistributivity_combined():
 
         # Nominals should be equal (tested above)
         # Uncertainties should satisfy ut_l <= ut_r and um_l <= um_r
-        if (ut_l > ut_r + ATOL + RTOL * max(abs(ut_l), abs(ut_r)) or
-                um_l > um_r + ATOL + RTOL * max(abs(um_l), abs(um_r))):
+        if ut_l - ut_r > tol(ut_l, ut_r) or um_l - um_r > tol(um_l, um_r):
             violations += 1
 
     assert violations == 0, f"Combined sub-distributivity violated {violations}/{TRIALS} times"
+
+
+def test_inv14_subdistributivity_batch():
+    """
+    Batch form of the combined check at the full SSOT trial count:
+    x ⊗ (y ⊕ z) ⪯ (x ⊗ y) ⊕ (x ⊗ z) evaluated as a few array ops.
+    """
+    rng = np.random.default_rng(SEED)
+    x = gen_UN_batch(rng, BATCH_TRIALS)
+    y = gen_UN_batch(rng, BATCH_TRIALS)
+    z = gen_UN_batch(rng, BATCH_TRIALS)
+
+    left = mul_batch(x, add_batch(y, z), lam=1.0)
+    right = add_batch(mul_batch(x, y, lam=1.0), mul_batch(x, z, lam=1.0))
+
+    check = check_preceq(left, right)
+    assert check.count == 0, (
+        f"Sub-distributivity violated {check.count}/{BATCH_TRIALS} times, "
+        f"max excess: {check.max_excess}"
+    )
+
+
+def _sides(x, y, z):
+    return mul_batch(x, add_batch(y, z), lam=1.0), add_batch(mul_batch(x, y, lam=1.0), mul_batch(x, z, lam=1.0))
+
+
+def _uncertainty_margin(x, y, z):
+    ((_, ut_l), (_, um_l)), ((_, ut_r), (_, um_r)) = _sides(x, y, z)
+    return np.minimum(margin_le(ut_l, ut_r), margin_le(um_l, um_r))
+
+
+def _nominal_margin(x, y, z):
+    # tolerance = provable rounding error of both sides, so cancellation is accounted for
+    ((na_l, _), (nm_l, _)), ((na_r, _), (nm_r, _)) = _sides(x, y, z)
+    ((na_lr, _), (nm_lr, _)) = eft.mul_ref(x, eft.add_ref(y, z))
+    ((na_rr, _), (nm_rr, _)) = eft.add_ref(eft.mul_ref(x, y), eft.mul_ref(x, z))
+    return np.minimum(eft.margin_equal(na_l, na_r, na_lr, na_rr),
+                      eft.margin_equal(nm_l, nm_r, nm_lr, nm_rr))
+
+
+def test_inv14_adversarial_uncertainties():
+    """Local search toward u_L > u_R: boundary, rescaling, cancellation and zeroing moves."""
+    rng = np.random.default_rng(SEED)
+    result = search(_uncertainty_margin, 3, rng, ADV_POPULATION, ADV_GENERATIONS)
+    baseline = uniform_baseline(_uncertainty_margin, 3, rng, result.evaluations)
+    record_invariant('INV-14', {'adversarial_evaluations': result.evaluations,
+                                'min_adversarial_margin': result.min_margin,
+                                'min_uniform_margin': baseline})
+    assert result.violations == 0, (
+        f"Sub-distributivity violated (margin {result.min_margin}) at {result.worst}"
+    )
+    assert result.min_margin <= baseline
+
+
+def test_inv14_adversarial_nominals():
+    """
+    Nominal distributivity under adversarial cancellation.  When y ≈ -z,
+    x·y + x·z cancels catastrophically and misses an rtol-relative equality by
+    orders of magnitude; against the EFT rounding bound it must still hold.
+    """
+    rng = np.random.default_rng(SEED)
+    result = search(_nominal_margin, 3, rng, ADV_POPULATION, ADV_GENERATIONS)
+    record_invariant('INV-14', {'min_adversarial_nominal_margin': result.min_margin,
+                                'adversarial_nominal_violations': result.violations})
+    assert result.violations == 0, (
+        f"Nominal distributivity violated beyond rounding (margin {result.min_margin}) "
+        f"at {result.worst}"
+    )
@@ -1,4 +1,77 @@
-import pytest
-@pytest.mark.skip(reason="Scenario test to be implemented with domain-specific config.") 
+import numpy as np
+from tests.utils.algebra_api import from_batch
+from tests.utils.sliding_window import SlidingWindow, WindowedStream, windowed
+from tests.utils.predicates import check_triangle
+from tests.utils.results import record_scenario
+from tests.utils.ssot_loader import get_trials, get_seed
+
+SEED = get_seed('scenarios')
+STREAM = get_trials(override=2000) * 100
+WINDOW = 1000
+CHUNK = 25_000
+OUTLIER_AT = STREAM // 2
+MAGNITUDES = (1e1, 1e2, 1e3, 1e4)
+RECOVERY_RTOL = 1e-3
+
+
+def _stream(rng, n, outlier_mag=None):
+    """Unit-scale readings; optionally one outlier with inflated deviation and uncertainty."""
+    sigma = 10 ** rng.uniform(-2, -1, n)
+    n_a = np.ones(n)
+    n_m = n_a + rng.normal(size=n) * sigma
+    u_m = 2.0 * sigma
+    u_t = np.maximum(np.abs(n_m - n_a) - u_m, 0.0) + 1e-9 * sigma
+    if outlier_mag is not None:
+        n_m[OUTLIER_AT] += outlier_mag
+        u_m[OUTLIER_AT] = outlier_mag
+    return ((n_a, u_t), (n_m, u_m))
+
+
+def _windowed_width(x):
+    """Band width 2·(u_t + u_m) of the windowed ⊕, streamed chunk by chunk."""
+    ws = WindowedStream(WINDOW, 'add')
+    widths = []
+    for a in range(0, STREAM, CHUNK):
+        (_, ut), (_, um) = ws.feed(((x[0][0][a:a + CHUNK], x[0][1][a:a + CHUNK]),
+                                    (x[1][0][a:a + CHUNK], x[1][1][a:a + CHUNK])))
+        widths.append(2.0 * (ut + um))
+    return np.concatenate(widths)
+
+
 def test_scenario():
-    pass
+    """SCN-04: windowed ⊕ degrades linearly with outlier size and recovers once it leaves."""
+    seed_seq = np.random.SeedSequence(SEED)
+    clean = _windowed_width(_stream(np.random.default_rng(seed_seq), STREAM))
+    # window k covers samples [k, k + WINDOW - 1]
+    first_hit = OUTLIER_AT - WINDOW + 1
+
+    peaks, recoveries = [], []
+    for mag in MAGNITUDES:
+        x = _stream(np.random.default_rng(seed_seq), STREAM, outlier_mag=mag)
+        assert check_triangle(x).count == 0
+        width = _windowed_width(x)
+        excess = width - clean
+        peaks.append(float(np.max(excess)))
+        degraded = np.flatnonzero(np.abs(excess) > RECOVERY_RTOL * clean)
+        assert degraded[0] == first_hit
+        recoveries.append(int(degraded[-1] - first_hit + 1))
+
+    slope = float(np.polyfit(np.log10(MAGNITUDES), np.log10(peaks), 1)[0])
+    # ⊕ is linear in the outlier, and the window forgets it after exactly WINDOW steps
+    assert abs(slope - 1.0) < 0.05, f"Unexpected degradation slope {slope}"
+    assert all(r == WINDOW for r in recoveries), f"Recovery times {recoveries} != {WINDOW}"
+
+    record_scenario('SCN-04', {
+        'stream': STREAM, 'window': WINDOW,
+        'degradation_slope': slope, 'max_recovery_time': max(recoveries),
+    })
+
+
+def test_scenario_windowed_mul_matches_two_stack():
+    """Chunked ⊗ windows equal the streaming two-stack queue bit-for-bit."""
+    rng = np.random.default_rng(SEED)
+    x = _stream(rng, 600)
+    sw = SlidingWindow(37, 'mul')
+    streamed = [sw.push(e) for e in from_batch(x)][36:]
+    assert from_batch(windowed(x, 37, 'mul')) == streamed
+    assert check_triangle(windowed(x, 37, 'mul')).count == 0
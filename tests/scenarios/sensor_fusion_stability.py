@@ -1,4 +1,88 @@
-import pytest
-@pytest.mark.skip(reason="Scenario test to be implemented with domain-specific config.") 
+import time
+
+import numpy as np
+from tests.utils.algebra_api import add
+from tests.utils.fusion import FusionEngine
+from tests.utils.predicates import close
+from tests.utils.results import record_scenario
+from tests.utils.ssot_loader import get_float_type, get_rtol, get_trials, get_seed
+from tests.utils.un_array import UNArray
+
+SEED = get_seed('scenarios')
+READINGS = get_trials(override=2000) * 100
+CHUNK = 50_000
+TRUTH = 20.0
+CALIBRATION = ((1.0, 0.0), (1.0, 1e-3))  # gain known exactly on the actual tier
+FLOAT_TYPE = get_float_type()
+
+
+def sensor_stream(rng, total, chunk, dtype=np.float64):
+    """Chunks of noisy readings of TRUTH; each reading satisfies the triangle."""
+    left = total
+    while left > 0:
+        n = min(chunk, left)
+        sigma = 10 ** rng.uniform(-2, 0, n)
+        n_a = np.full(n, TRUTH)
+        n_m = TRUTH + rng.normal(size=n) * sigma
+        u_m = 3.0 * sigma
+        u_t = np.maximum(np.abs(n_m - n_a) - u_m, 0.0) + 0.1 * sigma
+        n_a, u_t, n_m, u_m = (v.astype(dtype, copy=False) for v in (n_a, u_t, n_m, u_m))
+        yield ((n_a, u_t), (n_m, u_m))
+        left -= n
+
+
 def test_scenario():
-    pass
+    """SCN-02: fuse a long reading stream; band width stays stable, no triangle violations."""
+    rng = np.random.default_rng(SEED)
+    violations = []
+    engine = FusionEngine(calibration=CALIBRATION,
+                          on_violation=lambda kind, idx: violations.append((kind, idx)))
+    t0 = time.perf_counter()
+    engine.consume(sensor_stream(rng, READINGS, CHUNK, FLOAT_TYPE))
+    runtime = time.perf_counter() - t0
+    stats = engine.stats()
+
+    assert stats['readings'] == READINGS
+    assert stats['triangle_violations'] == 0, f"Triangle violations reported: {violations[:3]}"
+    assert stats['band_width_stability'] < 0.05, f"Fused band width unstable: {stats}"
+
+    record_scenario('SCN-02', dict(stats, readings_per_sec=READINGS / runtime))
+
+
+def test_scenario_scalar_stream_matches_chunked():
+    """Scalar readings buffered by the engine fuse to the same result as ⊕ folded by hand."""
+    rng = np.random.default_rng(SEED)
+    (n_a, u_t), (n_m, u_m) = next(sensor_stream(rng, 5000, 5000))
+    readings = [((a, t), (m, u)) for a, t, m, u in zip(n_a, u_t, n_m, u_m)]
+
+    engine = FusionEngine(chunk_size=1024, dtype=np.float64).consume(iter(readings))
+    folded = readings[0]
+    for r in readings[1:]:
+        folded = add(folded, r)
+
+    (fa, ft), (fm, fu) = engine.fused()
+    (ea, et), (em, eu) = folded
+    assert close(fa, ea) and close(ft, et) and close(fm, em) and close(fu, eu)
+    assert engine.stats()['triangle_violations'] == 0
+
+    # the storage containers: UNArray chunks and the UNElems they iterate as,
+    # cut where the engine would cut, so the sums match bit for bit
+    arr = UNArray.from_tuples(readings)
+    for stream in ([arr[i:i + 1024] for i in range(0, len(arr), 1024)], iter(arr),
+                   [arr[:1024]] + list(arr[1024:])):
+        other = FusionEngine(chunk_size=1024, dtype=np.float64).consume(stream)
+        assert other.count == len(readings) and other.fused() == engine.fused()
+
+
+def test_scenario_float32_matches_float64():
+    """The float32 fast path fuses the same stream to the float64 result within float32 tolerance."""
+    stats = {}
+    for dtype in (np.float32, np.float64):
+        engine = FusionEngine(calibration=CALIBRATION, dtype=dtype)
+        stats[dtype] = engine.consume(sensor_stream(np.random.default_rng(SEED), 20 * CHUNK // 10,
+                                                    CHUNK // 10, dtype)).stats()
+        assert stats[dtype]['triangle_violations'] == 0
+    lo, hi = stats[np.float32], stats[np.float64]
+    rtol = get_rtol(np.float32)
+    for key in ('band_width_mean', 'min_band_width', 'max_band_width'):
+        assert close(lo[key], hi[key], atol=0.0, rtol=rtol), (key, lo[key], hi[key])
@@ -0,0 +1,137 @@
+"""
+Adaptive sequential trial budgeting driven by the zero-failure bound.
+
+With N violation-free trials the SSOT bound zero_fail_upper_bound_per_test
+("3/N", the rule of three) caps the per-trial failure rate at 95% confidence.
+Instead of a fixed get_trials() count, run_adaptive() draws trials in growing
+batches and stops as soon as
+
+    bound(N) <= target_rate          (enough evidence), or
+    a batch reports a violation      (stop at once, report it), or
+    max_trials / the time budget is exhausted.
+
+run_budgeted() does this for several invariants under one shared time budget.
+It always advances the unfinished check that has used the least time, so
+cheap invariants reach their target early and the time they leave unused is
+automatically spent on the expensive ones.
+
+Checks use the sharding signature, (rng, n) -> ShardResult.  Each check draws
+from its own SeedSequence child of `seed`, and batch sizes double on a fixed
+schedule, so the samples seen for a given N are reproducible.
+"""
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from tests.utils.sharding import ShardResult
+from tests.utils.ssot_loader import get_threshold, load_ssot
+
+Check = Callable[[np.random.Generator, int], ShardResult]
+
+FIRST_BATCH = 1_000
+MAX_BATCH = 1_000_000
+
+
+@dataclass
+class AdaptiveResult:
+    name: str
+    trials: int = 0
+    violations: int = 0
+    bound: float = math.inf        # zero-failure upper bound at `trials`
+    reached_target: bool = False
+    elapsed: float = 0.0
+    max_deltas: Dict[str, float] = field(default_factory=dict)
+
+
+def get_target_rate(override: Optional[float] = None) -> float:
+    """Target failure rate: override, then SSOT_TARGET_RATE, then SSOT defaults."""
+    if override is not None:
+        return override
+    env_rate = os.environ.get('SSOT_TARGET_RATE')
+    if env_rate:
+        return float(env_rate)
+    return float(load_ssot().get('defaults', {}).get('target_failure_rate', 3.0 / 50000))
+
+
+def zero_fail_bound(n: int) -> float:
+    """SSOT zero-failure upper bound for n clean trials (inf for n == 0)."""
+    if n <= 0:
+        return math.inf
+    return get_threshold('zero_fail_upper_bound_per_test')(n)
+
+
+def trials_for_target(target_rate: float) -> int:
+    """Smallest N whose zero-failure bound is <= target_rate."""
+    n = max(1, math.ceil(zero_fail_bound(1) / target_rate))
+    while zero_fail_bound(n) > target_rate:
+        n += 1
+    return n
+
+
+class _Runner:
+    def __init__(self, name: str, check: Check, seq: np.random.SeedSequence,
+                 target_rate: float, max_trials: Optional[int]):
+        self.check = check
+        self.rng = np.random.default_rng(seq)
+        self.needed = trials_for_target(target_rate)
+        self.max_trials = max_trials
+        self.batch = FIRST_BATCH
+        self.result = AdaptiveResult(name)
+
+    @property
+    def done(self) -> bool:
+        r = self.result
+        return (r.violations > 0 or r.reached_target or
+                (self.max_trials is not None and r.trials >= self.max_trials))
+
+    def step(self) -> None:
+        r = self.result
+        n = min(self.batch, self.needed - r.trials)
+        if self.max_trials is not None:
+            n = min(n, self.max_trials - r.trials)
+        t0 = time.perf_counter()
+        out = self.check(self.rng, n)
+        r.elapsed += time.perf_counter() - t0
+        r.trials += out.trials
+        r.violations += out.violations
+        for k, v in out.max_deltas.items():
+            r.max_deltas[k] = max(r.max_deltas.get(k, 0.0), v)
+        if r.violations == 0:
+            r.bound = zero_fail_bound(r.trials)
+            r.reached_target = r.trials >= self.needed
+        self.batch = min(self.batch * 2, MAX_BATCH)
+
+
+def run_adaptive(check: Check, seed: int, target_rate: Optional[float] = None,
+                 max_trials: Optional[int] = None, name: str = '') -> AdaptiveResult:
+    """Run one check until its zero-failure bound reaches target_rate or it fails."""
+    runner = _Runner(name, check, np.random.SeedSequence(seed), get_target_rate(target_rate), max_trials)
+    while not runner.done:
+        runner.step()
+    return runner.result
+
+
+def run_budgeted(checks: Dict[str, Check], seed: int, target_rate: Optional[float] = None,
+                 time_budget: Optional[float] = None,
+                 max_trials: Optional[int] = None) -> Dict[str, AdaptiveResult]:
+    """
+    Run several checks under one time budget (seconds; None = no limit).
+
+    Returns:
+        AdaptiveResult per check name, in the order given
+    """
+    target_rate = get_target_rate(target_rate)
+    seqs = np.random.SeedSequence(seed).spawn(len(checks))
+    runners = [_Runner(name, check, seq, target_rate, max_trials)
+               for (name, check), seq in zip(checks.items(), seqs)]
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    while True:
+        active = [r for r in runners if not r.done]
+        if not active or (deadline is not None and time.perf_counter() >= deadline):
+            break
+        min(active, key=lambda r: r.result.elapsed).step()
+    return {r.result.name: r.result for r in runners}
@@ -0,0 +1,158 @@
+"""
+Vectorized adversarial search for invariant violations.
+
+Uniform gen_UN sampling reaches the triangle-equality boundary, extreme scale
+ratios and cancelling nominals only by chance.  search() instead runs a
+batched local search over a whole population of candidate inputs at once:
+
+    score     margin(*args) for every candidate (predicates.margin_*:
+              0 at the tolerance edge, negative = violated)
+    keep      the ELITE fraction with the smallest margins
+    perturb   copies of the elite with one random move per candidate
+    immigrate a few fresh gen_UN_batch samples to avoid collapsing early
+
+and reports the smallest margin seen.  Moves (each applied to one argument
+of the candidate):
+
+    jitter     relative noise of log-uniform size 1e-16 .. 1e-1
+    boundary   push n_m onto the triangle edge |n_m - n_a| = u_t + u_m
+    rescale    multiply the whole element by 10**uniform(-6, 6)
+    cancel     set a nominal to minus the same nominal of another argument
+    zero       set one component to 0
+
+Perturbed elements are repaired to stay valid inputs (u >= 0, triangle holds
+exactly in floating point), so any negative margin is a genuine violation of
+the invariant, not of its preconditions.
+
+A candidate population is an array of shape (P, k, 4) with columns
+(n_a, u_t, n_m, u_m); margin functions receive k U/N batches.
+"""
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from tests.utils.generators import gen_UN_batch
+
+MarginFn = Callable[..., np.ndarray]
+
+ELITE = 0.25
+IMMIGRANTS = 0.05
+N_MOVES = 5
+
+
+class SearchResult(NamedTuple):
+    min_margin: float
+    worst: tuple                # k U/N elements reaching min_margin
+    history: np.ndarray         # best margin after each generation
+    evaluations: int
+    violations: int             # candidates evaluated with margin < 0
+
+
+def _batches(pop: np.ndarray):
+    return [((pop[:, j, 0], pop[:, j, 1]), (pop[:, j, 2], pop[:, j, 3]))
+            for j in range(pop.shape[1])]
+
+
+def _random(rng: np.random.Generator, n: int, k: int) -> np.ndarray:
+    pop = np.empty((n, k, 4))
+    for j in range(k):
+        (n_a, u_t), (n_m, u_m) = gen_UN_batch(rng, n)
+        pop[:, j] = np.column_stack((n_a, u_t, n_m, u_m))
+    return pop
+
+
+def repair(pop: np.ndarray) -> np.ndarray:
+    """Make every element a valid input: u >= 0 and |n_m - n_a| <= u_t + u_m exactly."""
+    pop[..., 1] = np.abs(pop[..., 1])
+    pop[..., 3] = np.abs(pop[..., 3])
+    d = np.abs(pop[..., 2] - pop[..., 0])
+    bad = d > pop[..., 1] + pop[..., 3]
+    pop[..., 1] = np.where(bad, np.maximum(d - pop[..., 3], 0.0), pop[..., 1])
+    # rounding in d - u_m can leave the sum an ulp short; step u_t up until it holds
+    for _ in range(4):
+        bad = np.abs(pop[..., 2] - pop[..., 0]) > pop[..., 1] + pop[..., 3]
+        if not bad.any():
+            break
+        pop[..., 1] = np.where(bad, np.nextafter(pop[..., 1], np.inf), pop[..., 1])
+    return pop
+
+
+def perturb(rng: np.random.Generator, parents: np.ndarray) -> np.ndarray:
+    """One random move per candidate, applied to one random argument."""
+    out = parents.copy()
+    n, k, _ = out.shape
+    rows = np.arange(n)
+    arg = rng.integers(k, size=n)
+    move = rng.integers(N_MOVES, size=n)
+    elem = out[rows, arg]  # (n, 4) copy; written back below
+
+    sel = move == 0  # jitter
+    eps = 10 ** rng.uniform(-16, -1, (n, 1))
+    elem[sel] *= 1.0 + eps[sel] * rng.normal(size=(n, 4))[sel]
+
+    sel = move == 1  # boundary
+    sign = np.where(rng.random(n) < 0.5, -1.0, 1.0)
+    elem[sel, 2] = elem[sel, 0] + sign[sel] * (elem[sel, 1] + elem[sel, 3])
+
+    sel = move == 2  # rescale
+    elem[sel] *= 10 ** rng.uniform(-6, 6, (n, 1))[sel]
+
+    sel = move == 3  # cancel
+    other = out[rows, rng.integers(k, size=n)]
+    col = np.where(rng.random(n) < 0.5, 0, 2)
+    elem[sel, col[sel]] = -other[sel, col[sel]]
+
+    sel = move == 4  # zero
+    elem[sel, rng.integers(4, size=n)[sel]] = 0.0
+
+    out[rows, arg] = elem
+    return repair(out)
+
+
+def search(margin: MarginFn, n_args: int, rng: np.random.Generator,
+           population: int = 4096, generations: int = 50,
+           stop_on_violation: bool = False) -> SearchResult:
+    """
+    Minimize margin(*args) over valid U/N inputs.
+
+    Args:
+        margin: Vectorized margin function of n_args U/N batches
+        n_args: Number of U/N arguments of the invariant
+        rng: Random generator
+        population: Candidates evaluated per generation
+        generations: Number of perturb/select rounds
+        stop_on_violation: Return as soon as a negative margin is found
+
+    Returns:
+        SearchResult with the smallest margin and the inputs reaching it
+    """
+    n_elite = max(1, int(population * ELITE))
+    n_new = max(1, int(population * IMMIGRANTS))
+    pop = _random(rng, population, n_args)
+    scores = margin(*_batches(pop))
+    evaluations, violations = population, int(np.count_nonzero(scores < 0))
+    history = []
+    for _ in range(generations):
+        history.append(float(scores.min()))
+        if stop_on_violation and violations:
+            break
+        order = np.argsort(scores, kind='stable')[:n_elite]
+        elite, elite_scores = pop[order], scores[order]
+        children = perturb(rng, elite[rng.integers(n_elite, size=population - n_elite - n_new)])
+        fresh = _random(rng, n_new, n_args)
+        new = np.concatenate((children, fresh))
+        new_scores = margin(*_batches(new))
+        evaluations += len(new)
+        violations += int(np.count_nonzero(new_scores < 0))
+        pop = np.concatenate((elite, new))
+        scores = np.concatenate((elite_scores, new_scores))
+    best = int(np.argmin(scores))
+    worst = tuple(((a, t), (m, u)) for a, t, m, u in pop[best].tolist())
+    history.append(float(scores[best]))
+    return SearchResult(float(scores[best]), worst, np.array(history), evaluations, violations)
+
+
+def uniform_baseline(margin: MarginFn, n_args: int, rng: np.random.Generator,
+                     evaluations: int) -> float:
+    """Smallest margin over `evaluations` plain gen_UN_batch samples, for comparison."""
+    return float(margin(*_batches(_random(rng, evaluations, n_args))).min())
@@ -2,10 +2,17 @@
 Adapter layer: map tests to your library's API.
 Replace stubs below with imports from your implementation.
 """
-from typing import Tuple
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
 
 UN = Tuple[Tuple[float, float], Tuple[float, float]]  # ((n_a,u_t),(n_m,u_m))
 
+def _like(v, c):
+    # c in v's numpy scalar type; numpy 1.x promotes a Python float times a
+    # float32 scalar to float64, which the batch ops' float32 arrays never do
+    return v.dtype.type(c) if isinstance(v, np.generic) else c
+
 def add(x: UN, y: UN) -> UN:
     # Placeholder reference addition (component-wise conservative add)
     (na1, ut1), (nm1, um1) = x
@@ -17,6 +24,7 @@ def mul(x: UN, y: UN, lam: float = 1.0) -> UN:
     # Source: un_algebra/core.py UNAlgebra.multiply()
     (na1, ut1), (nm1, um1) = x
     (na2, ut2), (nm2, um2) = y
+    lam = _like(ut1, lam)
 
     # Nominals: each tier multiplies independently
     na = na1 * na2
@@ -36,6 +44,12 @@ def mul(x: UN, y: UN, lam: float = 1.0) -> UN:
 
     return ((na, ut), (nm, um))
 
+def scale(x: UN, c: float) -> UN:
+    # Scalar multiplication: nominals scale by c, uncertainties by |c|.
+    (na, ut), (nm, um) = x
+    c = _like(ut, c)
+    return ((c * na, abs(c) * ut), (c * nm, abs(c) * um))
+
 def flip(x: UN) -> UN:
     (na, ut), (nm, um) = x
     return ((nm, um), (na, ut))
@@ -44,10 +58,101 @@ def catch(x: UN) -> UN:
     (na, ut), (nm, um) = x
     # Collapse actual tier to zero; preserve M = |na| + ut + |nm| + um.
     # M_after = 0 + 0 + |nm| + um_new = M_before  ⟹  um_new = |na| + ut + um
-    return ((0.0, 0.0), (nm, abs(na) + ut + um))
+    zero = _like(ut, 0.0)
+    return ((zero, zero), (nm, abs(na) + ut + um))
 
 def project(x: UN, known_na: bool = False) -> Tuple[float, float]:
     (na, ut), (nm, um) = x
     if known_na:
         return (nm, abs(nm - na) + um)
     return (nm, ut + um)
+
+
+# ---------------------------------------------------------------------------
+# Batch forms (structure-of-arrays)
+#
+# A batch has the same nested layout as UN, but every leaf is a 1-D float
+# array: ((n_a[:], u_t[:]), (n_m[:], u_m[:])).  Each batch op evaluates the
+# scalar formula above term-for-term in the same order, so element i of the
+# result is bit-identical to calling the scalar op on element i.  Ops keep
+# the leaves' dtype (float64, or float32/longdouble under the SSOT
+# float_type): Python-float parameters such as lam do not promote arrays,
+# under numpy 1.x value-based casting and numpy 2 alike.  Numpy scalars are
+# another matter under the pinned numpy 1.26 (Python float * float32 scalar
+# is float64), so the scalar ops above convert lam, c and catch's zeros to
+# the type of the components they are given.
+# ---------------------------------------------------------------------------
+
+UNBatch = Tuple[Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+
+def to_batch(xs: Sequence[UN], dtype=np.float64) -> UNBatch:
+    """Pack a sequence of UN tuples into a structure-of-arrays batch."""
+    cols = np.array(xs, dtype=dtype).reshape(-1, 4)
+    return ((cols[:, 0], cols[:, 1]), (cols[:, 2], cols[:, 3]))
+
+
+def from_batch(xb: UNBatch) -> List[UN]:
+    """Unpack a batch into a list of UN tuples (Python floats)."""
+    (na, ut), (nm, um) = xb
+    return [((a, t), (m, u)) for a, t, m, u in
+            zip(na.tolist(), ut.tolist(), nm.tolist(), um.tolist())]
+
+
+def add_batch(x: UNBatch, y: UNBatch) -> UNBatch:
+    (na1, ut1), (nm1, um1) = x
+    (na2, ut2), (nm2, um2) = y
+    return ((na1 + na2, ut1 + ut2), (nm1 + nm2, um1 + um2))
+
+
+def mul_batch(x: UNBatch, y: UNBatch, lam: Union[float, np.ndarray] = 1.0) -> UNBatch:
+    # Same term order as mul(); lam may be a scalar or a per-element array.
+    (na1, ut1), (nm1, um1) = x
+    (na2, ut2), (nm2, um2) = y
+
+    na = na1 * na2
+    nm = nm1 * nm2
+
+    u_t_tier   = np.abs(na1) * ut2 + np.abs(na2) * ut1
+    cross_guard = np.abs(nm1) * ut2 + np.abs(nm2) * ut1
+    quad_u_t   = lam * ut1 * ut2
+    quad_cross = lam * (ut1 * um2 + um1 * ut2)
+    ut = u_t_tier + cross_guard + quad_u_t + quad_cross
+
+    u_m_tier = np.abs(nm1) * um2 + np.abs(nm2) * um1
+    quad_u_m = lam * um1 * um2
+    um = u_m_tier + quad_u_m
+
+    return ((na, ut), (nm, um))
+
+
+def scale_batch(x: UNBatch, c: Union[float, np.ndarray]) -> UNBatch:
+    (na, ut), (nm, um) = x
+    # abs, not np.abs: np.abs(-1.3) is an np.float64 that promotes float32 leaves
+    return ((c * na, abs(c) * ut), (c * nm, abs(c) * um))
+
+
+def flip_batch(x: UNBatch) -> UNBatch:
+    (na, ut), (nm, um) = x
+    return ((nm, um), (na, ut))
+
+
+def catch_batch(x: UNBatch) -> UNBatch:
+    (na, ut), (nm, um) = x
+    zero = np.zeros_like(na)
+    return ((zero, zero.copy()), (nm, np.abs(na) + ut + um))
+
+
+def project_batch(x: UNBatch, known_na: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    (na, ut), (nm, um) = x
+    if known_na:
+        return (nm, np.abs(nm - na) + um)
+    return (nm, ut + um)
+
+
+# Opt-in instrumentation (SSOT_INSTRUMENT=1): rebind the ops above to recording
+# wrappers before any caller imports them.  When disabled nothing is wrapped.
+from tests.utils import instrument as _instrument  # noqa: E402
+
+if _instrument.enabled():
+    _instrument.install(globals())
@@ -0,0 +1,241 @@
+"""
+Error-free-transformation oracle: rigorous rounding-error bounds over batches.
+
+Every float64 operation's rounding error is itself a float64 that TwoSum
+(additions) and TwoProduct (multiplications, Dekker split) recover exactly.
+The oracle re-runs a U/N formula in the same evaluation order as the code
+under test and carries, for each intermediate,
+
+    Bounded(val, corr, err)   with   |exact - (val + corr)| <= err
+
+val is bit-for-bit the float result of that evaluation order, corr the
+accumulated (compensated) rounding error, and err a bound on what
+compensation itself leaves out.  The a-priori error of the float result is
+therefore
+
+    |val - exact| <= rounding_bound(ref) = |corr| + err
+
+which is tight (it is the actual rounding, not a worst case) and provable.
+check_le/check_equal use it as the tolerance for a relation that holds in
+exact arithmetic, so a failure is a real error, never rounding:
+
+    lhs <= rhs exactly   =>   lhs_fl - rhs_fl <= rounding_bound(lhs) + rounding_bound(rhs)
+
+The tolerance depends only on the references, so values that deviate from the
+mirrored computation (a real bug) are not excused by it.  add_ref/mul_ref/
+scale_ref/project_ref/M_ref mirror algebra_api term by term, classical_*_ref
+mirror oracles, and all accept scalars, arrays or U/N batches.
+
+Valid for |values| below ~1e290 (the Dekker split overflows beyond) and away
+from the subnormal range, where TwoProduct is no longer error-free.
+"""
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from tests.utils.predicates import Check, _check
+
+U = 2.0 ** -53            # unit roundoff of float64
+SPLITTER = 2.0 ** 27 + 1  # Dekker split constant
+ROUND_UP = 1 + 8 * U      # covers rounding in the error arithmetic itself
+
+
+class Bounded(NamedTuple):
+    val: np.ndarray    # float64 result in the mirrored evaluation order
+    corr: np.ndarray   # compensation: exact ≈ val + corr
+    err: np.ndarray    # |exact - (val + corr)| <= err
+
+
+# -- error-free transformations ------------------------------------------------
+
+def two_sum(a, b):
+    """s + e == a + b exactly, s = fl(a + b)."""
+    s = a + b
+    bb = s - a
+    e = (a - (s - bb)) + (b - bb)
+    return s, e
+
+
+def split(a):
+    c = SPLITTER * a
+    hi = c - (c - a)
+    return hi, a - hi
+
+
+def two_prod(a, b):
+    """p + e == a * b exactly, p = fl(a * b)."""
+    p = a * b
+    ah, al = split(a)
+    bh, bl = split(b)
+    e = ((ah * bh - p) + ah * bl + al * bh) + al * bl
+    return p, e
+
+
+# -- compensated arithmetic with running error bounds --------------------------
+
+def exact(a) -> Bounded:
+    a = np.asarray(a, dtype=np.float64)
+    z = np.zeros_like(a)
+    return Bounded(a, z, z)
+
+
+def _lift(x) -> Bounded:
+    return x if isinstance(x, Bounded) else exact(x)
+
+
+def b_add(x, y) -> Bounded:
+    x, y = _lift(x), _lift(y)
+    s, e = two_sum(x.val, y.val)
+    corr = (x.corr + y.corr) + e
+    # two float additions in corr: gamma_2 < 3u
+    err = (x.err + y.err + 3 * U * (np.abs(x.corr) + np.abs(y.corr) + np.abs(e))) * ROUND_UP
+    return Bounded(s, corr, err)
+
+
+def b_neg(x) -> Bounded:
+    x = _lift(x)
+    return Bounded(-x.val, -x.corr, x.err)
+
+
+def b_sub(x, y) -> Bounded:
+    return b_add(x, b_neg(y))
+
+
+def b_mul(x, y) -> Bounded:
+    x, y = _lift(x), _lift(y)
+    p, e = two_prod(x.val, y.val)
+    t1 = x.val * y.corr
+    t2 = y.val * x.corr
+    corr = e + (t1 + t2)
+    # exact = p + e + x.val*(y.corr+dy) + y.val*(x.corr+dx) + (x.corr+dx)*(y.corr+dy)
+    dropped = (np.abs(x.val) * y.err + np.abs(y.val) * x.err +
+               (np.abs(x.corr) + x.err) * (np.abs(y.corr) + y.err))
+    # two products and two additions in corr: gamma_3 < 4u
+    err = (dropped + 4 * U * (np.abs(e) + np.abs(t1) + np.abs(t2))) * ROUND_UP
+    return Bounded(p, corr, err)
+
+
+def b_abs(x) -> Bounded:
+    x = _lift(x)
+    sign = np.where(x.val < 0, -1.0, 1.0)
+    spread = np.abs(x.corr) + x.err
+    # the sign of the exact value is known unless val is within its own error of 0
+    known = np.abs(x.val) > spread * ROUND_UP
+    return Bounded(np.abs(x.val), np.where(known, sign * x.corr, 0.0),
+                   np.where(known, x.err, spread * ROUND_UP))
+
+
+def b_sum(*terms) -> Bounded:
+    """Left-to-right sum, matching the evaluation order of a + b + c ..."""
+    acc = _lift(terms[0])
+    for t in terms[1:]:
+        acc = b_add(acc, t)
+    return acc
+
+
+def value(x: Bounded) -> np.ndarray:
+    """Compensated (nearly exact) value."""
+    return x.val + x.corr
+
+
+def rounding_bound(ref: Bounded) -> np.ndarray:
+    """Provable bound on |ref.val - exact|: the rounding error of the float evaluation."""
+    return (np.abs(ref.corr) + ref.err) * ROUND_UP
+
+
+# -- U/N references mirroring algebra_api ---------------------------------------
+
+def add_ref(x, y):
+    (na1, ut1), (nm1, um1) = x
+    (na2, ut2), (nm2, um2) = y
+    return ((b_add(na1, na2), b_add(ut1, ut2)), (b_add(nm1, nm2), b_add(um1, um2)))
+
+
+def mul_ref(x, y, lam=1.0):
+    (na1, ut1), (nm1, um1) = x
+    (na2, ut2), (nm2, um2) = y
+    na = b_mul(na1, na2)
+    nm = b_mul(nm1, nm2)
+    u_t_tier = b_add(b_mul(b_abs(na1), ut2), b_mul(b_abs(na2), ut1))
+    cross_guard = b_add(b_mul(b_abs(nm1), ut2), b_mul(b_abs(nm2), ut1))
+    quad_u_t = b_mul(b_mul(lam, ut1), ut2)
+    quad_cross = b_mul(lam, b_add(b_mul(ut1, um2), b_mul(um1, ut2)))
+    ut = b_sum(u_t_tier, cross_guard, quad_u_t, quad_cross)
+    u_m_tier = b_add(b_mul(b_abs(nm1), um2), b_mul(b_abs(nm2), um1))
+    um = b_add(u_m_tier, b_mul(b_mul(lam, um1), um2))
+    return ((na, ut), (nm, um))
+
+
+def scale_ref(x, c):
+    (na, ut), (nm, um) = x
+    return ((b_mul(c, na), b_mul(b_abs(c), ut)), (b_mul(c, nm), b_mul(b_abs(c), um)))
+
+
+def project_ref(x, known_na: bool = False) -> Tuple[Bounded, Bounded]:
+    (na, ut), (nm, um) = x
+    if known_na:
+        return (_lift(nm), b_add(b_abs(b_sub(nm, na)), um))
+    return (_lift(nm), b_add(ut, um))
+
+
+def M_ref(x) -> Bounded:
+    (na, ut), (nm, um) = x
+    return b_sum(b_abs(na), ut, b_abs(nm), um)
+
+
+def classical_add_ref(x, y) -> Tuple[Bounded, Bounded]:
+    """oracles.classical_add on (n, u) pairs."""
+    (nx, ux), (ny, uy) = x, y
+    return (b_add(nx, ny), b_add(ux, uy))
+
+
+def classical_mul_ref(x, y) -> Tuple[Bounded, Bounded]:
+    """oracles.classical_mul on (n, u) pairs."""
+    (nx, ux), (ny, uy) = x, y
+    return (b_mul(nx, ny), b_sum(b_mul(b_abs(nx), uy), b_mul(b_abs(ny), ux), b_mul(ux, uy)))
+
+
+# -- predicates with provable tolerances ------------------------------------------
+
+def check_le(lhs, rhs, lhs_ref: Bounded, rhs_ref: Bounded) -> Check:
+    """Violations of lhs <= rhs beyond the rounding of both sides (exact lhs <= rhs assumed)."""
+    lhs = np.asarray(lhs, dtype=np.float64)
+    rhs = np.asarray(rhs, dtype=np.float64)
+    s, e = two_sum(lhs, -rhs)
+    bound = rounding_bound(lhs_ref) + rounding_bound(rhs_ref)
+    return _check(s + e, s <= bound + np.abs(e))
+
+
+def check_equal(a, b, a_ref: Bounded, b_ref: Bounded) -> Check:
+    """Violations of a == b beyond the rounding of both sides (exact a == b assumed)."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    s, e = two_sum(a, -b)
+    bound = rounding_bound(a_ref) + rounding_bound(b_ref)
+    return _check(np.abs(s + e), np.abs(s) <= bound + np.abs(e))
+
+
+def _margin(slack, bound):
+    # same scale as predicates.margin_*: 1 = equal, 0 = at the bound, < 0 = violated
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m = np.where(bound > 0, slack / bound, np.where(slack >= 0, 0.0, -np.inf)) + 1.0
+    return np.where(np.isnan(m), -np.inf, m)
+
+
+def margin_le(lhs, rhs, lhs_ref: Bounded, rhs_ref: Bounded):
+    """check_le as a margin normalized by the provable rounding bound."""
+    bound = rounding_bound(lhs_ref) + rounding_bound(rhs_ref)
+    return _margin(np.asarray(rhs, dtype=np.float64) - lhs, bound)
+
+
+def margin_equal(a, b, a_ref: Bounded, b_ref: Bounded):
+    """check_equal as a margin normalized by the provable rounding bound."""
+    bound = rounding_bound(a_ref) + rounding_bound(b_ref)
+    return _margin(-np.abs(np.asarray(a, dtype=np.float64) - b), bound)
+
+
+def refs_differ(x_ref: Bounded, y_ref: Bounded) -> np.ndarray:
+    """True where the exact values behind two references provably differ."""
+    s, e = two_sum(x_ref.val, -y_ref.val)
+    rest = e + (x_ref.corr - y_ref.corr)
+    return np.abs(s) > (np.abs(rest) + x_ref.err + y_ref.err) * ROUND_UP
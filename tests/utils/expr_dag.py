@@ -0,0 +1,144 @@
+"""
+Hash-consed expression DAG over the U/N algebra with a bounded LRU value cache.
+
+Building an expression returns an integer node id.  Structurally identical
+subexpressions intern to the same id, which means a quantity that a control
+pipeline reuses many times is one node and is computed once per batch.  ⊕,
+and ⊗ at λ = 1, are bitwise commutative, so their operands are put in
+canonical order first; ⊗ at λ ≠ 1 rounds lam·u1·u2 differently with the
+operands swapped, so it keeps the order it was built with.
+
+ExprDAG.value(node) evaluates over the leaf batches bound at construction.
+Results are memoized in an LRU cache of at most `cache_size` entries; values
+needed only inside one evaluation are dropped as soon as their last consumer
+has run.  A chain thousands of stages deep therefore holds O(frontier +
+cache_size) arrays, not its whole history.  Evicted nodes are recomputed on
+demand from their operands.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tests.utils.algebra_api import (
+    UNBatch, add_batch, mul_batch, scale_batch, flip_batch, catch_batch,
+)
+
+Node = Tuple[str, Optional[float], Tuple[int, ...]]  # (op, param, children)
+
+
+class ExprDAG:
+    def __init__(self, leaves: Sequence[UNBatch], cache_size: int = 64):
+        self.leaves = list(leaves)
+        self.cache_size = cache_size
+        self.nodes: List[Node] = []
+        self._intern: Dict[Node, int] = {}
+        self._cache: 'OrderedDict[int, UNBatch]' = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'computed': 0, 'evicted': 0}
+
+    # -- construction (hash-consing) -------------------------------------------
+
+    def _node(self, op: str, param: Optional[float], children: Tuple[int, ...]) -> int:
+        key = (op, param, children)
+        nid = self._intern.get(key)
+        if nid is None:
+            nid = len(self.nodes)
+            self.nodes.append(key)
+            self._intern[key] = nid
+        return nid
+
+    def leaf(self, i: int) -> int:
+        return self._node('leaf', float(i), ())
+
+    def add(self, a: int, b: int) -> int:
+        return self._node('add', None, (min(a, b), max(a, b)))
+
+    def mul(self, a: int, b: int, lam: float = 1.0) -> int:
+        if lam == 1.0:
+            a, b = min(a, b), max(a, b)
+        return self._node('mul', float(lam), (a, b))
+
+    def scale(self, a: int, c: float) -> int:
+        return self._node('scale', float(c), (a,))
+
+    def flip(self, a: int) -> int:
+        return self._node('flip', None, (a,))
+
+    def catch(self, a: int) -> int:
+        return self._node('catch', None, (a,))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    # -- evaluation ------------------------------------------------------------
+
+    def _lookup(self, nid: int) -> Optional[UNBatch]:
+        val = self._cache.get(nid)
+        if val is not None:
+            self._cache.move_to_end(nid)
+        return val
+
+    def _store(self, nid: int, val: UNBatch) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[nid] = val
+        self._cache.move_to_end(nid)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.stats['evicted'] += 1
+
+    def _compute(self, nid: int, args: List[UNBatch]) -> UNBatch:
+        op, param, _ = self.nodes[nid]
+        self.stats['computed'] += 1
+        if op == 'leaf':
+            return self.leaves[int(param)]
+        if op == 'add':
+            return add_batch(args[0], args[1])
+        if op == 'mul':
+            return mul_batch(args[0], args[1], lam=param)
+        if op == 'scale':
+            return scale_batch(args[0], param)
+        if op == 'flip':
+            return flip_batch(args[0])
+        return catch_batch(args[0])
+
+    def value(self, nid: int) -> UNBatch:
+        """Evaluate node nid over the bound leaf batches."""
+        val = self._lookup(nid)
+        if val is not None:
+            self.stats['hits'] += 1
+            return val
+        self.stats['misses'] += 1
+
+        # Uncached subgraph under nid; cached operands are pinned into `live`
+        # up front so eviction during this call cannot lose them.
+        live: Dict[int, UNBatch] = {}
+        uses: Dict[int, int] = {}
+        todo = [nid]
+        pending = {nid}
+        while todo:
+            n = todo.pop()
+            for c in self.nodes[n][2]:
+                uses[c] = uses.get(c, 0) + 1
+                if c in pending or c in live:
+                    continue
+                cached = self._lookup(c)
+                if cached is not None:
+                    self.stats['hits'] += 1
+                    live[c] = cached
+                else:
+                    pending.add(c)
+                    todo.append(c)
+
+        # Children always have smaller ids than their parents
+        for n in sorted(pending):
+            children = self.nodes[n][2]
+            val = self._compute(n, [live[c] for c in children])
+            for c in children:
+                uses[c] -= 1
+                if uses[c] == 0:
+                    del live[c]
+            live[n] = val
+            self._store(n, val)
+        return live[nid]
+
+    def cached_nodes(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,175 @@
+"""
+Random expression trees over the U/N algebra and a flat batch evaluator.
+
+A tree is a nested tuple:
+
+    ('leaf', i)                    leaf sample i
+    ('add', child, child, ...)     n-ary ⊕, folded left to right
+    ('mul', lam, child, child, ...) n-ary ⊗(λ), folded left to right
+    ('scale', c, child)            scalar× by c
+    ('flip', child)                B
+    ('catch', child)               Cα
+
+compile_tree() flattens a tree into a post-order instruction list over a
+small register file (registers are recycled as soon as their value has been
+consumed).  evaluate_batch() runs that program once per instruction over whole
+leaf batches, so a tree costs len(program) array ops regardless of batch size.
+evaluate() is the node-by-node scalar reference; both fold in the same order,
+so results agree bit-for-bit.
+"""
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tests.utils.algebra_api import (
+    UN, UNBatch, add, mul, scale, flip, catch,
+    add_batch, mul_batch, scale_batch, flip_batch, catch_batch,
+)
+
+OPS = ('add', 'mul', 'scale', 'flip', 'catch')
+
+
+def gen_expr_tree(rng: np.random.Generator, depth: int = 4, fanout: int = 2,
+                  n_leaves: int = 4, ops: Sequence[str] = OPS,
+                  lams: Sequence[float] = (1.0,), leaf_prob: float = 0.2,
+                  scale_decades: float = 1.0):
+    """
+    Generate a random expression tree.
+
+    Args:
+        rng: Random generator
+        depth: Maximum depth; nodes at depth 0 are leaves
+        fanout: Maximum arity of ⊕/⊗ nodes (at least 2)
+        n_leaves: Leaf indices are drawn from range(n_leaves)
+        ops: Operators to choose from (subset of OPS)
+        lams: λ values for ⊗ nodes
+        leaf_prob: Chance of stopping early with a leaf above depth 0
+        scale_decades: scalar× factors are ±10**uniform(-d, d)
+
+    Returns:
+        Nested tuple tree
+    """
+    if depth <= 0 or rng.random() < leaf_prob:
+        return ('leaf', int(rng.integers(n_leaves)))
+    op = ops[int(rng.integers(len(ops)))]
+    child = lambda: gen_expr_tree(rng, depth - 1, fanout, n_leaves, ops, lams,
+                                  leaf_prob, scale_decades)
+    if op == 'add':
+        return ('add',) + tuple(child() for _ in range(int(rng.integers(2, max(fanout, 2) + 1))))
+    if op == 'mul':
+        lam = float(lams[int(rng.integers(len(lams)))])
+        return ('mul', lam) + tuple(child() for _ in range(int(rng.integers(2, max(fanout, 2) + 1))))
+    if op == 'scale':
+        c = float(10 ** rng.uniform(-scale_decades, scale_decades)) * (1 if rng.random() < 0.5 else -1)
+        return ('scale', c, child())
+    if op in ('flip', 'catch'):
+        return (op, child())
+    raise ValueError(f"Unknown op: {op!r}")
+
+
+class Instr(NamedTuple):
+    op: str                  # 'leaf' or one of OPS
+    dst: int                 # destination register
+    srcs: Tuple[int, ...]    # source registers (leaf index for 'leaf')
+    param: Optional[float]   # λ for mul, c for scale
+
+
+class Program(NamedTuple):
+    instrs: Tuple[Instr, ...]
+    n_regs: int
+    out: int
+
+
+def compile_tree(tree) -> Program:
+    """Flatten a tree into a post-order register program."""
+    instrs: List[Instr] = []
+    free: List[int] = []
+    n_regs = 0
+
+    def alloc() -> int:
+        nonlocal n_regs
+        if free:
+            return free.pop()
+        n_regs += 1
+        return n_regs - 1
+
+    # Iterative post-order so deep trees do not hit the recursion limit
+    stack = [(tree, False)]
+    results: List[int] = []
+    while stack:
+        node, expanded = stack.pop()
+        kind = node[0]
+        if kind == 'leaf':
+            dst = alloc()
+            instrs.append(Instr('leaf', dst, (node[1],), None))
+            results.append(dst)
+            continue
+        children = node[2:] if kind in ('mul', 'scale') else node[1:]
+        if not expanded:
+            stack.append((node, True))
+            for c in reversed(children):
+                stack.append((c, False))
+            continue
+        srcs = tuple(results[-len(children):])
+        del results[-len(children):]
+        free.extend(reversed(srcs))
+        dst = alloc()
+        param = node[1] if kind in ('mul', 'scale') else None
+        instrs.append(Instr(kind, dst, srcs, param))
+        results.append(dst)
+    return Program(tuple(instrs), n_regs, results[-1])
+
+
+def evaluate_batch(program: Program, leaves: Sequence[UNBatch]) -> UNBatch:
+    """Run a compiled program over leaf batches (all of the same length)."""
+    regs: List[Optional[UNBatch]] = [None] * program.n_regs
+    for ins in program.instrs:
+        op = ins.op
+        if op == 'leaf':
+            val = leaves[ins.srcs[0]]
+        elif op == 'add':
+            val = regs[ins.srcs[0]]
+            for s in ins.srcs[1:]:
+                val = add_batch(val, regs[s])
+        elif op == 'mul':
+            val = regs[ins.srcs[0]]
+            for s in ins.srcs[1:]:
+                val = mul_batch(val, regs[s], lam=ins.param)
+        elif op == 'scale':
+            val = scale_batch(regs[ins.srcs[0]], ins.param)
+        elif op == 'flip':
+            val = flip_batch(regs[ins.srcs[0]])
+        else:
+            val = catch_batch(regs[ins.srcs[0]])
+        regs[ins.dst] = val
+    return regs[program.out]
+
+
+def evaluate(tree, leaves: Sequence[UN]) -> UN:
+    """Scalar node-by-node reference evaluation."""
+    kind = tree[0]
+    if kind == 'leaf':
+        return leaves[tree[1]]
+    if kind == 'add':
+        val = evaluate(tree[1], leaves)
+        for c in tree[2:]:
+            val = add(val, evaluate(c, leaves))
+        return val
+    if kind == 'mul':
+        val = evaluate(tree[2], leaves)
+        for c in tree[3:]:
+            val = mul(val, evaluate(c, leaves), lam=tree[1])
+        return val
+    if kind == 'scale':
+        return scale(evaluate(tree[2], leaves), tree[1])
+    if kind == 'flip':
+        return flip(evaluate(tree[1], leaves))
+    return catch(evaluate(tree[1], leaves))
+
+
+def tree_depth(tree) -> int:
+    kind = tree[0]
+    if kind == 'leaf':
+        return 0
+    children = tree[2:] if kind in ('mul', 'scale') else tree[1:]
+    return 1 + max(tree_depth(c) for c in children)
@@ -0,0 +1,159 @@
+"""
+Streaming sensor fusion over U/N readings in constant memory.
+
+FusionEngine folds readings with ⊕ (optionally after a calibration ⊗ applied
+to every reading) and keeps only running state:
+
+    - the fused sum, per component, with Neumaier compensation across chunks
+    - Welford/Chan statistics of per-reading band width 2·(u_t + u_m)
+    - Welford statistics of the fused mean's band width at chunk boundaries,
+      reported as band_width_stability (coefficient of variation)
+    - triangle violation counts for readings and for the accumulator
+
+Readings arrive either as chunked batches ((n_a, u_t), (n_m, u_m)) or
+UNArrays, or as an iterable of scalar U/N tuples or UNElems, which is
+buffered into chunks.  Violations are
+reported as they happen through on_violation(kind, indices), with indices
+counted from the start of the stream.  Chunked input is the fast path: all
+per-reading work is a handful of array ops per chunk.  Chunks are processed
+in their own dtype (e.g. float32 readings stay float32, with float32
+tolerances); scalar readings are buffered into dtype chunks, by default the
+SSOT float_type.  The running sums are always kept in Python floats.
+"""
+from typing import Callable, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from tests.utils.algebra_api import UN, UNBatch, mul_batch, project_batch, scale, to_batch
+from tests.utils.predicates import check_triangle
+from tests.utils.ssot_loader import get_float_type
+from tests.utils.un_array import UNArray, UNElem
+
+DEFAULT_CHUNK = 65_536
+
+
+class _Welford:
+    __slots__ = ('n', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        self.min, self.max = float('inf'), float('-inf')
+
+    def update(self, values: np.ndarray) -> None:
+        """Chan et al. parallel merge of a whole chunk."""
+        k = values.size
+        if k == 0:
+            return
+        mean_b = float(np.mean(values))
+        m2_b = float(np.sum((values - mean_b) ** 2))
+        n = self.n + k
+        delta = mean_b - self.mean
+        self.mean += delta * k / n
+        self.m2 += m2_b + delta * delta * self.n * k / n
+        self.n = n
+        self.min = min(self.min, float(np.min(values)))
+        self.max = max(self.max, float(np.max(values)))
+
+    @property
+    def std(self) -> float:
+        return (self.m2 / (self.n - 1)) ** 0.5 if self.n > 1 else 0.0
+
+
+class FusionEngine:
+    def __init__(self, calibration: Optional[UN] = None, lam: float = 1.0,
+                 chunk_size: int = DEFAULT_CHUNK,
+                 on_violation: Optional[Callable[[str, np.ndarray], None]] = None,
+                 dtype=None):
+        self.calibration = calibration
+        self.lam = lam
+        self.chunk_size = chunk_size
+        self.on_violation = on_violation
+        self.dtype = get_float_type(dtype)
+        self.count = 0
+        self._sum = [0.0, 0.0, 0.0, 0.0]
+        self._comp = [0.0, 0.0, 0.0, 0.0]
+        self._width = _Welford()
+        self._fused_width = _Welford()
+        self.reading_violations = 0
+        self.fused_violations = 0
+
+    def feed(self, chunk: Union[UNBatch, UNArray]) -> None:
+        """Fold one chunk of readings into the running state."""
+        if isinstance(chunk, UNArray):
+            chunk = chunk.as_batch()
+        if self.calibration is not None:
+            # A scalar U/N calibration broadcasts against the chunk arrays
+            chunk = mul_batch(self.calibration, chunk, lam=self.lam)
+
+        check = check_triangle(chunk)
+        if check.count:
+            self.reading_violations += check.count
+            if self.on_violation is not None:
+                self.on_violation('reading', self.count + np.flatnonzero(check.mask))
+
+        _, u = project_batch(chunk)
+        self._width.update(2.0 * u)
+
+        (n_a, u_t), (n_m, u_m) = chunk
+        for i, col in enumerate((n_a, u_t, n_m, u_m)):
+            # Neumaier-compensated fold of the per-chunk sums
+            part = float(np.sum(col))
+            s = self._sum[i]
+            t = s + part
+            if abs(s) >= abs(part):
+                self._comp[i] += (s - t) + part
+            else:
+                self._comp[i] += (part - t) + s
+            self._sum[i] = t
+        self.count += len(n_a)
+
+        fused = self.fused()
+        if check_triangle(fused).count:
+            self.fused_violations += 1
+            if self.on_violation is not None:
+                self.on_violation('fused', np.array([self.count - 1]))
+        (_, ut_f), (_, um_f) = self.mean()
+        self._fused_width.update(np.array([2.0 * (ut_f + um_f)]))
+
+    def consume(self, readings: Iterable) -> 'FusionEngine':
+        """Fold an iterable of chunks (batches, UNArrays) or of scalar readings (tuples, UNElems)."""
+        buf = []
+        for item in readings:
+            if isinstance(item, UNArray):
+                item = item.as_batch()
+            elif isinstance(item, UNElem):
+                item = item.to_tuple()
+            if isinstance(item[0][0], np.ndarray):
+                if buf:
+                    self.feed(to_batch(buf, self.dtype))
+                    buf = []
+                self.feed(item)
+                continue
+            buf.append(item)
+            if len(buf) >= self.chunk_size:
+                self.feed(to_batch(buf, self.dtype))
+                buf = []
+        if buf:
+            self.feed(to_batch(buf, self.dtype))
+        return self
+
+    def fused(self) -> UN:
+        """⊕ of every reading so far."""
+        s = [a + c for a, c in zip(self._sum, self._comp)]
+        return ((s[0], s[1]), (s[2], s[3]))
+
+    def mean(self) -> UN:
+        """Fused sum scaled by 1/count."""
+        return scale(self.fused(), 1.0 / max(self.count, 1))
+
+    def stats(self) -> Dict[str, float]:
+        fw = self._fused_width
+        return {
+            'readings': self.count,
+            'triangle_violations': self.reading_violations + self.fused_violations,
+            'band_width_mean': self._width.mean,
+            'band_width_std': self._width.std,
+            'min_band_width': self._width.min,
+            'max_band_width': self._width.max,
+            'band_width_stability': fw.std / fw.mean if fw.mean > 0 else 0.0,
+        }
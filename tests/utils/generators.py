@@ -1,5 +1,26 @@
 import numpy as np
 
+from tests.utils.ssot_loader import FloatType, get_float_type
+
+SLACK = 1e-12  # triangle repair slack relative to scale, for float64
+
+
+def decades_for(dtype: FloatType) -> int:
+    """
+    Half-width in decades of the log-uniform scale for dtype: 12 for float64
+    and longdouble, 6 for float32, so that products of a few generated
+    magnitudes stay clear of both overflow and the subnormal range.
+    """
+    return min(12, int(np.log10(np.finfo(dtype).max)) // 6)
+
+
+def slack_for(dtype: FloatType) -> float:
+    """SLACK in units of dtype's machine epsilon (exactly SLACK for float64)."""
+    dtype = np.dtype(dtype)
+    if dtype == np.float64:
+        return SLACK
+    return SLACK * float(np.finfo(dtype).eps / np.finfo(np.float64).eps)
+
 def gen_UN(rng: np.random.Generator):
     """
     Generate a valid U/N element: ((n_a, u_t), (n_m, u_m))
@@ -17,15 +38,76 @@ def gen_UN(rng: np.random.Generator):
     d = abs(n_m - n_a)
     if d > u_t + u_m:
         # enforce triangle; push near boundary with tiny slack
-        slack = s * 1e-12
+        slack = s * SLACK
         bump = d - (u_t + u_m) + slack
         share = rng.uniform(0.2, 0.8)
         u_t += bump * share
         u_m += bump * (1.0 - share)
     return ((n_a, max(u_t, 0.0)), (n_m, max(u_m, 0.0)))
 
+def gen_UN_batch(rng: np.random.Generator, n: int, mode: str = 'fast', dtype=None):
+    """
+    Generate n valid U/N elements as a batch ((n_a, u_t), (n_m, u_m)) of arrays.
+
+    Same distribution as gen_UN: log-uniform scale over 1e-12..1e12, boundary
+    bias and triangle repair with slack s*1e-12 split by a uniform(0.2, 0.8) share.
+
+    dtype (default: the SSOT float_type) selects the array type in 'fast'
+    mode.  Draws are the same float64 stream for every dtype; for other types
+    the scale range shrinks to decades_for(dtype), the components are rounded
+    to dtype and the triangle repair runs in dtype with slack_for(dtype), so
+    the triangle holds in that type's own arithmetic.  float64 output is
+    unchanged by the dtype parameter.
+
+    Modes:
+        'fast':   one vectorized draw per component (n scales, then n n_a
+                  draws, ...). Deterministic for a given rng state, but a
+                  different stream from gen_UN.
+        'scalar': reproduces exactly the samples that n successive gen_UN(rng)
+                  calls would return, leaving rng in the same state. Use this
+                  to replay the SSOT seed streams, e.g.
+                  gen_UN_batch(np.random.default_rng(get_seed('properties')), n,
+                  mode='scalar') yields the sequence the property tests see.
+    """
+    if mode == 'scalar':
+        if dtype is not None and np.dtype(dtype) != np.float64:
+            raise ValueError("'scalar' mode replays the float64 gen_UN stream; use 'fast' for other dtypes")
+        out = np.empty((n, 4), dtype=np.float64)
+        for i in range(n):
+            (n_a, u_t), (n_m, u_m) = gen_UN(rng)
+            out[i] = (n_a, u_t, n_m, u_m)
+        return ((out[:, 0], out[:, 1]), (out[:, 2], out[:, 3]))
+    if mode != 'fast':
+        raise ValueError(f"Unknown gen_UN_batch mode: {mode!r}")
+
+    dtype = get_float_type(dtype)
+    decades = decades_for(dtype)
+    s = 10 ** rng.uniform(-decades, decades, n)
+    n_a = rng.normal(size=n) * s
+    n_m = n_a + rng.normal(size=n) * s
+    u_t = np.abs(rng.normal(size=n)) * s
+    u_m = np.abs(rng.normal(size=n)) * s
+    share = rng.uniform(0.2, 0.8, n)
+    if dtype != np.float64:
+        s, n_a, n_m, u_t, u_m, share = (v.astype(dtype) for v in (s, n_a, n_m, u_t, u_m, share))
+
+    d = np.abs(n_m - n_a)
+    bump = np.where(d > u_t + u_m, d - (u_t + u_m) + s * slack_for(dtype), 0.0)
+    u_t += bump * share
+    u_m += bump * (1.0 - share)
+    return ((n_a, np.maximum(u_t, 0.0)), (n_m, np.maximum(u_m, 0.0)))
+
+def gen_UN_batch_scaled(rng: np.random.Generator, n: int, scale: float = 1.0):
+    """
+    gen_UN_batch samples rescaled so each element's largest component is
+    ~scale; at the default 1.0 deep ⊗ chains stay finite.
+    """
+    (n_a, u_t), (n_m, u_m) = gen_UN_batch(rng, n)
+    c = scale / np.maximum(np.maximum(np.abs(n_a), np.abs(n_m)), np.maximum(u_t, u_m))
+    return ((n_a * c, u_t * c), (n_m * c, u_m * c))
+
 def M(un):
-    """Epistemic budget M = |n_a| + u_t + |n_m| + u_m"""
+    """Epistemic budget M = |n_a| + u_t + |n_m| + u_m (elementwise for batches)"""
     (n_a, u_t), (n_m, u_m) = un
     return abs(n_a) + u_t + abs(n_m) + u_m
 
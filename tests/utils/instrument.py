@@ -0,0 +1,224 @@
+"""
+Opt-in instrumentation of the algebra_api operations.
+
+With SSOT_INSTRUMENT=1 in the environment, algebra_api wraps add, mul, scale,
+flip, catch, project and their *_batch forms when it is first imported, before
+any test binds them.  Each wrapper records, per calling test and per op:
+
+    calls       number of calls
+    elements    U/N elements processed (1 per scalar call, the batch length
+                per batch call)
+    seconds     wall time inside the op
+    magnitudes  LogHistogram of |input components| over 1e-40 .. 1e40
+
+Scalar inputs are buffered and histogrammed FLUSH at a time; batch inputs
+contribute a strided subsample of at most SAMPLE values per leaf, so the
+histograms describe the distribution of magnitudes, not exact counts.
+Without the variable algebra_api is left untouched and nothing here runs, so
+disabled instrumentation costs nothing.
+
+The conftest hooks switch the context to each test's node id and attach its
+stats to the test's teardown report (REPORT_PROPERTY in user_properties);
+with SSOT_REPORT=1 they also join the results stream, and results.json then
+carries per-test and per-op totals.  The terminal summary lists the ops by
+time from the reported stats, folded in by add_reported(), so tests run in
+--ssot-jobs workers, whose reports are relayed to the parent, are counted
+like local ones.  Work done in process-pool shard workers inside a test is
+not seen by the process running the test; thread pools (reduction.py) are.
+"""
+import functools
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+
+from tests.utils.sketches import LogHistogram
+
+ENV = 'SSOT_INSTRUMENT'
+SCALAR_OPS = ('add', 'mul', 'scale', 'flip', 'catch', 'project')
+BATCH_OPS = tuple(f'{op}_batch' for op in SCALAR_OPS)
+FLUSH = 4096
+SAMPLE = 1 << 16
+HIST_RANGE = (-40, 40, 4)  # LogHistogram(lo, hi, per_decade)
+SESSION = '<session>'
+FIELDS = ('call_count', 'element_count', 'seconds', 'magnitude')
+REPORT_PROPERTY = 'ssot_instrument'
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV, '') not in ('', '0')
+
+
+class OpStats:
+    __slots__ = ('calls', 'elements', 'seconds', 'magnitudes', '_pending')
+
+    def __init__(self):
+        self.calls = 0
+        self.elements = 0
+        self.seconds = 0.0
+        self.magnitudes = LogHistogram(*HIST_RANGE)
+        self._pending = []
+
+    def add_scalars(self, values: Iterable) -> None:
+        self._pending.extend(values)
+        if len(self._pending) >= FLUSH:
+            self.flush()
+
+    def add_array(self, values) -> None:
+        v = np.asarray(values).ravel()
+        step = max(1, len(v) // SAMPLE)
+        self.magnitudes.add(np.abs(v[::step]))
+
+    def flush(self) -> None:
+        if self._pending:
+            try:
+                # float64 also takes the Fractions of exact-arithmetic references
+                values = np.array(self._pending, dtype=np.float64)
+            except (TypeError, ValueError):
+                # a scalar op applied to arrays: ragged, flatten one by one
+                values = np.concatenate([np.ravel(np.asarray(v, dtype=np.float64)) for v in self._pending])
+            self.magnitudes.add(np.abs(values))
+            self._pending.clear()
+
+    def metrics(self, op: str) -> Dict[str, Any]:
+        self.flush()
+        values = (self.calls, self.elements, self.seconds, self.magnitudes)
+        return {f'{op}_{field}': v for field, v in zip(FIELDS, values)}
+
+
+_STATS: Dict[Tuple[str, str], OpStats] = {}
+_REPORTED: Dict[str, Dict[str, Any]] = {}
+_context = SESSION
+
+
+def set_context(name: str) -> None:
+    """Attribute subsequent calls to `name` (a test node id)."""
+    global _context
+    _context = name
+
+
+def _stats(op: str) -> OpStats:
+    key = (_context, op)
+    s = _STATS.get(key)
+    if s is None:
+        s = _STATS[key] = OpStats()
+    return s
+
+
+def _un_args(op: str, args):
+    # the leading positional arguments are U/N elements (tuples, UNElems or
+    # batches); lam, c and flags come after
+    return args[:2] if op.startswith(('add', 'mul')) else args[:1]
+
+
+def _wrap_scalar(op: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        dt = time.perf_counter() - t0
+        s = _stats(op)
+        s.calls += 1
+        s.elements += 1
+        s.seconds += dt
+        s.add_scalars([v for x in _un_args(op, args) for tier in x for v in tier])
+        return out
+    return wrapper
+
+
+def _wrap_batch(op: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        dt = time.perf_counter() - t0
+        s = _stats(op)
+        leaves = [v for x in _un_args(op, args) for tier in x for v in tier]
+        s.calls += 1
+        s.elements += max((np.size(v) for v in leaves), default=0)
+        s.seconds += dt
+        for v in leaves:
+            s.add_array(v)
+        return out
+    return wrapper
+
+
+def install(namespace: Dict[str, Any]) -> None:
+    """Replace the ops in an algebra_api module namespace with recording wrappers."""
+    for op in SCALAR_OPS:
+        namespace[op] = _wrap_scalar(op, namespace[op])
+    for op in BATCH_OPS:
+        namespace[op] = _wrap_batch(op, namespace[op])
+
+
+def split_metric(name: str) -> Tuple[str, str]:
+    """('mul_batch', 'seconds') from 'mul_batch_seconds'."""
+    for field in FIELDS:
+        if name.endswith('_' + field):
+            return name[:-len(field) - 1], field
+    raise ValueError(f"Not an instrumentation metric: {name!r}")
+
+
+def collect(context: str) -> Dict[str, Any]:
+    """Flattened metrics of every op called under `context`."""
+    out: Dict[str, Any] = {}
+    for (ctx, op), s in _STATS.items():
+        if ctx == context:
+            out.update(s.metrics(op))
+    return out
+
+
+def encode(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """collect() output as plain JSON values, histograms serialized."""
+    return json.loads(json.dumps({k: v.to_dict() if isinstance(v, LogHistogram) else v
+                                  for k, v in metrics.items()}, default=float))
+
+
+def _total(out: Dict[str, Dict[str, Any]], op: str) -> Dict[str, Any]:
+    return out.setdefault(op, {'calls': 0, 'elements': 0, 'seconds': 0.0,
+                               'magnitudes': LogHistogram(*HIST_RANGE)})
+
+
+def add_reported(report) -> None:
+    """Fold the stats a test report carries (see REPORT_PROPERTY) into totals()."""
+    for key, metrics in report.user_properties:
+        if key != REPORT_PROPERTY:
+            continue
+        for name, value in metrics.items():
+            op, field = split_metric(name)
+            t = _total(_REPORTED, op)
+            if field == 'magnitude':
+                t['magnitudes'].merge(LogHistogram.from_dict(value))
+            else:
+                t[{'call_count': 'calls', 'element_count': 'elements'}.get(field, field)] += value
+
+
+def totals() -> Dict[str, Dict[str, Any]]:
+    """
+    Per-op stats of every reported test (from this process or a worker) plus
+    the calls made here outside any test.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    for op, r in _REPORTED.items():
+        t = _total(out, op)
+        for field in ('calls', 'elements', 'seconds'):
+            t[field] += r[field]
+        t['magnitudes'].merge(r['magnitudes'])
+    for (ctx, op), s in _STATS.items():
+        if ctx != SESSION:
+            continue  # a test's stats arrive through its report
+        s.flush()
+        t = _total(out, op)
+        t['calls'] += s.calls
+        t['elements'] += s.elements
+        t['seconds'] += s.seconds
+        t['magnitudes'].merge(s.magnitudes)
+    return out
+
+
+def reset() -> None:
+    _STATS.clear()
+    _REPORTED.clear()
+    set_context(SESSION)
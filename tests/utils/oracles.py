@@ -1,6 +1,8 @@
 from typing import Tuple
 import math
 
+import numpy as np
+
 NU = Tuple[float, float]  # (n, u)
 
 def classical_add(x: NU, y: NU) -> NU:
@@ -20,3 +22,11 @@ def interval_width_mul(x: NU, y: NU) -> float:
     c, d = ny - uy, ny + uy
     products = [a*c, a*d, b*c, b*d]
     return max(products) - min(products)
+
+def interval_width_mul_batch(x, y):
+    """interval_width_mul over (n, u) arrays; broadcasts like numpy."""
+    nx, ux = x; ny, uy = y
+    a, b = nx - ux, nx + ux
+    c, d = ny - uy, ny + uy
+    products = (a*c, a*d, b*c, b*d)
+    return np.maximum.reduce(products) - np.minimum.reduce(products)
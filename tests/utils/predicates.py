@@ -0,0 +1,173 @@
+"""
+Array predicates for invariant checks.
+
+Every function accepts Python floats, NumPy arrays or U/N batches
+((n_a, u_t), (n_m, u_m)) and uses the SSOT mixed tolerance
+
+    |a - b| < atol + rtol * max(|a|, |b|)
+
+with atol/rtol defaulting to get_atol()/get_rtol() for the float type of the
+arguments (Python floats count as float64), so float32 data is checked with
+the float32 tolerance profile.  The check_* functions
+return a Check with the violation mask, the violation count and the largest
+raw excess (lhs - rhs) among the violations.  The margin_* functions give the
+same predicates as a tolerance-normalized distance to failure: 1 when the two
+sides are exactly equal, 0 at the tolerance edge, negative when violated
+(equality predicates, being strict, also fail at exactly 0).  NaN margins are
+returned as -inf.
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from tests.utils.generators import M
+from tests.utils.ssot_loader import get_atol, get_rtol
+
+
+class Check(NamedTuple):
+    mask: np.ndarray      # True where the predicate is violated
+    count: int            # number of violations
+    max_excess: float     # largest lhs - rhs among violations (0.0 if none)
+
+
+def _float_type(values) -> np.dtype:
+    dtype = np.result_type(*values)
+    return dtype if dtype.kind == 'f' else np.dtype(np.float64)
+
+
+def _tols(atol: Optional[float], rtol: Optional[float], *values):
+    dtype = _float_type(values) if values and (atol is None or rtol is None) else None
+    return (get_atol(dtype) if atol is None else atol,
+            get_rtol(dtype) if rtol is None else rtol)
+
+
+def _check(excess, ok) -> Check:
+    # NaN compares False, so it lands in the violation mask
+    mask = ~np.asarray(ok)
+    count = int(np.count_nonzero(mask))
+    max_excess = float(np.max(np.where(mask, excess, 0.0))) if count else 0.0
+    return Check(mask, count, max_excess)
+
+
+def tol(a, b, atol: Optional[float] = None, rtol: Optional[float] = None):
+    """Mixed absolute+relative tolerance for values at arbitrary scale."""
+    atol, rtol = _tols(atol, rtol, a, b)
+    return atol + rtol * np.maximum(abs(a), abs(b))
+
+
+def close(a, b, atol: Optional[float] = None, rtol: Optional[float] = None):
+    """Elementwise mixed-tolerance equality."""
+    return abs(a - b) < tol(a, b, atol, rtol)
+
+
+def un_close(x, y, atol: Optional[float] = None, rtol: Optional[float] = None):
+    """Component-wise mixed-tolerance equality for U/N elements or batches."""
+    (na1, ut1), (nm1, um1) = x
+    (na2, ut2), (nm2, um2) = y
+    return (close(na1, na2, atol, rtol) & close(ut1, ut2, atol, rtol) &
+            close(nm1, nm2, atol, rtol) & close(um1, um2, atol, rtol))
+
+
+def triangle_ok(x, atol: Optional[float] = None, rtol: Optional[float] = None):
+    """|n_m - n_a| <= u_t + u_m, with rtol scaled by the element's largest component (at least 1)."""
+    return ~check_triangle(x, atol, rtol).mask
+
+
+def _triangle_scale(n_a, u_t, n_m, u_m):
+    # floored at 1 as in the original inv04 check: below unit scale the
+    # tolerance is atol + rtol, so rounding in elements whose components all
+    # sit near zero is not held to an ever smaller relative bound
+    return np.maximum(np.maximum(np.maximum(np.abs(n_a), np.abs(n_m)), np.maximum(u_t, u_m)), 1.0)
+
+
+def check_triangle(x, atol: Optional[float] = None, rtol: Optional[float] = None) -> Check:
+    """Violations of the triangle constraint |n_m - n_a| <= u_t + u_m."""
+    (n_a, u_t), (n_m, u_m) = x
+    atol, rtol = _tols(atol, rtol, n_a, u_t, n_m, u_m)
+    scale = _triangle_scale(n_a, u_t, n_m, u_m)
+    excess = np.abs(n_m - n_a) - (u_t + u_m)
+    return _check(excess, excess <= atol + rtol * scale)
+
+
+def check_le(lhs, rhs, atol: Optional[float] = None, rtol: Optional[float] = None) -> Check:
+    """Violations of lhs <= rhs (e.g. M(x ⊗ y) <= M(x)·M(y))."""
+    excess = lhs - rhs
+    return _check(excess, excess <= tol(lhs, rhs, atol, rtol))
+
+
+def check_equal(a, b, atol: Optional[float] = None, rtol: Optional[float] = None) -> Check:
+    """Violations of a == b under the mixed tolerance."""
+    excess = np.abs(a - b)
+    return _check(excess, excess < tol(a, b, atol, rtol))
+
+
+def check_M_equal(x, y, atol: Optional[float] = None, rtol: Optional[float] = None) -> Check:
+    """Violations of M(x) == M(y)."""
+    return check_equal(M(x), M(y), atol, rtol)
+
+
+def check_un_equal(x, y, atol: Optional[float] = None, rtol: Optional[float] = None) -> Check:
+    """Violations of component-wise epsilon equality; excess is the worst component."""
+    return _merge([check_equal(a, b, atol, rtol) for a, b in zip(_leaves(x), _leaves(y))])
+
+
+def check_preceq(x, y, atol: Optional[float] = None, rtol: Optional[float] = None) -> Check:
+    """
+    Violations of x ⪯ y: nominals epsilon-equal and u_t, u_m of x no larger
+    than those of y.
+    """
+    (na1, ut1), (nm1, um1) = x
+    (na2, ut2), (nm2, um2) = y
+    return _merge([
+        check_equal(na1, na2, atol, rtol),
+        check_equal(nm1, nm2, atol, rtol),
+        check_le(ut1, ut2, atol, rtol),
+        check_le(um1, um2, atol, rtol),
+    ])
+
+
+def _margin(slack, t):
+    m = np.asarray(slack / t + 1.0, dtype=np.float64)
+    return np.where(np.isnan(m), -np.inf, m)
+
+
+def margin_le(lhs, rhs, atol: Optional[float] = None, rtol: Optional[float] = None):
+    """Margin of lhs <= rhs: (rhs - lhs) / tol + 1."""
+    return _margin(rhs - lhs, tol(lhs, rhs, atol, rtol))
+
+
+def margin_equal(a, b, atol: Optional[float] = None, rtol: Optional[float] = None):
+    """Margin of a == b: 1 - |a - b| / tol."""
+    return _margin(-np.abs(a - b), tol(a, b, atol, rtol))
+
+
+def margin_triangle(x, atol: Optional[float] = None, rtol: Optional[float] = None):
+    """Margin of |n_m - n_a| <= u_t + u_m, scaled like check_triangle."""
+    (n_a, u_t), (n_m, u_m) = x
+    atol, rtol = _tols(atol, rtol, n_a, u_t, n_m, u_m)
+    scale = _triangle_scale(n_a, u_t, n_m, u_m)
+    return _margin(u_t + u_m - np.abs(n_m - n_a), atol + rtol * scale)
+
+
+def margin_preceq(x, y, atol: Optional[float] = None, rtol: Optional[float] = None):
+    """Margin of x ⪯ y: the smallest of its four component margins."""
+    (na1, ut1), (nm1, um1) = x
+    (na2, ut2), (nm2, um2) = y
+    return np.minimum.reduce([
+        margin_equal(na1, na2, atol, rtol),
+        margin_equal(nm1, nm2, atol, rtol),
+        margin_le(ut1, ut2, atol, rtol),
+        margin_le(um1, um2, atol, rtol),
+    ])
+
+
+def _leaves(x):
+    (n_a, u_t), (n_m, u_m) = x
+    return (n_a, u_t, n_m, u_m)
+
+
+def _merge(checks) -> Check:
+    mask = checks[0].mask
+    for c in checks[1:]:
+        mask = mask | c.mask
+    return Check(mask, int(np.count_nonzero(mask)), max(c.max_excess for c in checks))
@@ -0,0 +1,112 @@
+"""
+Pairwise tree reduction of U/N batches: n-ary ⊕ and ⊗ without Python folds.
+
+reduce_add/reduce_mul fold a whole batch in one canonical order, the
+pairwise tree
+
+    level 0:  x_0, x_1, ..., x_{n-1}
+    level k:  y_i = level_{k-1}[2i] ○ level_{k-1}[2i+1]   (left operand first)
+              an odd trailing element passes up unchanged
+    result:   the single element left at the top
+
+which is independent of how the work is split.  Because BLOCK is a power of
+two, every aligned block of BLOCK elements (and the shorter last block) is a
+subtree of this tree: blocks are reduced independently, level by level as
+whole-array ops, and the block results enter the same tree at level
+log2(BLOCK).  The result is therefore bit-identical for any worker count and
+any power-of-two block size.
+
+⊗ is not associative in floating point, nor, through its λ and cross-tier
+terms, in exact arithmetic, so reduce_mul is defined as this tree, not as a
+left fold; ⊕ gets the usual error bound of pairwise summation, O(log n)
+rather than O(n) ulps.
+
+Blocks are spread over a thread pool (ufuncs release the GIL, and threads
+read the caller's arrays without copying); worker count comes from
+SSOT_WORKERS like sharding.get_workers().
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from tests.utils.algebra_api import UN, UNBatch, add_batch, mul_batch
+from tests.utils.sharding import get_workers
+
+BLOCK = 1 << 14
+
+Op = Callable[[UNBatch, UNBatch], UNBatch]
+
+
+def _map(f, x: UNBatch) -> UNBatch:
+    (na, ut), (nm, um) = x
+    return ((f(na), f(ut)), (f(nm), f(um)))
+
+
+def _concat(parts, axis: int = -1) -> UNBatch:
+    return ((np.concatenate([p[0][0] for p in parts], axis), np.concatenate([p[0][1] for p in parts], axis)),
+            (np.concatenate([p[1][0] for p in parts], axis), np.concatenate([p[1][1] for p in parts], axis)))
+
+
+def _tree(op: Op, x: UNBatch) -> UNBatch:
+    """Reduce along the last axis to length 1, in the canonical pairwise order."""
+    m = x[0][0].shape[-1]
+    while m > 1:
+        even = m - (m & 1)
+        pairs = op(_map(lambda a: a[..., 0:even:2], x), _map(lambda a: a[..., 1:even:2], x))
+        if m & 1:
+            pairs = _concat((pairs, _map(lambda a: a[..., even:], x)))
+        x, m = pairs, (m + 1) // 2
+    return x
+
+
+def _reduce_blocks(op: Op, x: UNBatch, first: int, stop: int, block: int) -> UNBatch:
+    """Results of the full blocks first..stop-1, shape (stop - first,) per leaf."""
+    rows = stop - first
+    blocks = _map(lambda a: a[first * block:stop * block].reshape(rows, block), x)
+    return _map(lambda a: a[:, 0], _tree(op, blocks))
+
+
+def tree_reduce(op: Op, x: UNBatch, block: int = BLOCK,
+                workers: Optional[int] = None) -> UN:
+    """
+    Fold a batch with op in the canonical pairwise-tree order.
+
+    Args:
+        op: Batch binary op, e.g. add_batch
+        x: Batch of U/N elements
+        block: Elements per independently reduced block (a power of two)
+        workers: Threads (default: get_workers(), i.e. SSOT_WORKERS or 1)
+
+    Returns:
+        The reduced element as a U/N tuple of scalars of the batch dtype
+    """
+    if block < 1 or block & (block - 1):
+        raise ValueError(f"block must be a power of two, got {block}")
+    n = len(x[0][0])
+    if n == 0:
+        raise ValueError("Cannot reduce an empty batch: ⊗ has no identity element")
+    n_full = n // block
+    workers = max(1, min(get_workers(workers), n_full))
+    bounds = np.linspace(0, n_full, workers + 1).astype(int)
+    spans = [(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+    if len(spans) > 1:
+        with ThreadPoolExecutor(max_workers=len(spans)) as pool:
+            parts = list(pool.map(lambda s: _reduce_blocks(op, x, s[0], s[1], block), spans))
+    else:
+        parts = [_reduce_blocks(op, x, lo, hi, block) for lo, hi in spans]
+    if n % block:
+        parts.append(_tree(op, _map(lambda a: a[n_full * block:], x)))
+    (na, ut), (nm, um) = _tree(op, _concat(parts))
+    return ((na[0], ut[0]), (nm[0], um[0]))
+
+
+def reduce_add(x: UNBatch, block: int = BLOCK, workers: Optional[int] = None) -> UN:
+    """⊕ of every element of x, in the canonical pairwise-tree order."""
+    return tree_reduce(add_batch, x, block, workers)
+
+
+def reduce_mul(x: UNBatch, lam: float = 1.0, block: int = BLOCK,
+               workers: Optional[int] = None) -> UN:
+    """⊗_λ of every element of x, in the canonical pairwise-tree order."""
+    return tree_reduce(lambda a, b: mul_batch(a, b, lam=lam), x, block, workers)
@@ -0,0 +1,253 @@
+"""
+Content-addressed cache of test verdicts.
+
+A test's result is a function of the files it runs and the knobs it reads, so
+each test is keyed by the sha256 of
+
+    - its node id
+    - the content of every file it depends on: the test file, every tests.*
+      module it imports (transitively, found by parsing the imports with ast,
+      function-level imports included), the package __init__ files on the
+      way, tests/conftest.py with its own imports, and tests/SSOT.yaml
+    - the module's SEED and TRIALS, the working dtype (get_float_type()) and
+      every SSOT_* environment variable (SSOT_TRIALS, SSOT_TIME_BUDGET, ...)
+      except the ENV_IGNORED switches
+    - whether SSOT_REPORT is on, and the Python and numpy versions
+
+A test that passed or skipped stores its serialized pytest reports and the
+results records (record_invariant/record_scenario) it wrote, in
+.cache/results/<key>.json.  When the key is seen again the test is not run:
+its reports are replayed through pytest_runtest_logreport and its records
+appended to the results stream again, so the terminal output, exit status and
+results.json are those of the original run.  Failures are never stored and
+always re-run.
+
+--ssot-rerun (or SSOT_RERUN=1) runs every test regardless and refreshes the
+entries.  With SSOT_INSTRUMENT=1 the cache is bypassed, since the point is to
+measure a real run.  Anything a test reads without importing it (other than
+SSOT.yaml) is outside the key: list it, relative to the repo root, in the test
+module's DEPENDENCIES tuple, or in EXTRA_DEPENDENCIES if every test reads it.
+"""
+import ast
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+import numpy as np
+import pytest
+
+from tests.utils import instrument
+from tests.utils.results import get_writer, reporting_enabled
+from tests.utils.ssot_loader import get_float_type
+
+CACHE_VERSION = 1
+ENV_RERUN = 'SSOT_RERUN'
+# every SSOT_* variable is part of the key except these, which only switch
+# reporting, instrumentation, the cache itself or the --ssot-jobs plumbing
+ENV_IGNORED = ('SSOT_REPORT', 'SSOT_INSTRUMENT', ENV_RERUN, 'SSOT_JOBS', 'SSOT_SCHED_WORKER')
+ROOT = Path(__file__).resolve().parent.parent.parent
+EXTRA_DEPENDENCIES = ('tests/SSOT.yaml', 'tests/conftest.py')
+REPLAYED = ('ssot_cache', 'replayed')
+
+_IMPORTS: Dict[Path, FrozenSet[Path]] = {}
+_DIGESTS: Dict[Path, tuple] = {}
+
+
+def get_result_cache_dir() -> Path:
+    return ROOT / '.cache' / 'results'
+
+
+def _module_files(name: str) -> List[Path]:
+    """Files executed by importing `name`: each package __init__ and the module."""
+    parts = name.split('.')
+    if parts[0] != 'tests':
+        return []
+    out = []
+    for i in range(1, len(parts) + 1):
+        base = ROOT.joinpath(*parts[:i])
+        if (base / '__init__.py').is_file():
+            out.append(base / '__init__.py')
+        elif base.with_suffix('.py').is_file():
+            out.append(base.with_suffix('.py'))
+    return out
+
+
+def _direct_imports(path: Path) -> Set[Path]:
+    package = '.'.join(path.relative_to(ROOT).with_suffix('').parts[:-1])
+    found: Set[Path] = set()
+    for node in ast.walk(ast.parse(path.read_bytes(), str(path))):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                found.update(_module_files(alias.name))
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package.split('.')[:len(package.split('.')) - node.level + 1]
+                module = '.'.join(base + ([node.module] if node.module else []))
+            else:
+                module = node.module or ''
+            found.update(_module_files(module))
+            for alias in node.names:
+                # `from tests.utils import algebra_api` imports a submodule
+                found.update(_module_files(f'{module}.{alias.name}')[-1:])
+    return found
+
+
+def dependencies(path: Path) -> FrozenSet[Path]:
+    """path, its package __init__ files and every repo file they import, transitively."""
+    path = Path(path).resolve()
+    if path not in _IMPORTS:
+        name = '.'.join(path.relative_to(ROOT).with_suffix('').parts)
+        seen = {path} | {p.resolve() for p in _module_files(name)}
+        todo = list(seen)
+        while todo:
+            for dep in _direct_imports(todo.pop()):
+                dep = dep.resolve()
+                if dep not in seen:
+                    seen.add(dep)
+                    todo.append(dep)
+        _IMPORTS[path] = frozenset(seen)
+    return _IMPORTS[path]
+
+
+def _digest(path: Path) -> str:
+    st = path.stat()
+    stamp = (st.st_size, st.st_mtime_ns)
+    hit = _DIGESTS.get(path)
+    if hit is None or hit[0] != stamp:
+        hit = _DIGESTS[path] = (stamp, hashlib.sha256(path.read_bytes()).hexdigest())
+    return hit[1]
+
+
+def key_environment() -> Dict[str, str]:
+    """The SSOT_* environment that can change a test's outcome."""
+    return {k: v for k, v in sorted(os.environ.items())
+            if k.startswith('SSOT_') and k not in ENV_IGNORED}
+
+
+def cache_key(item) -> str:
+    """sha256 over the test's dependency contents and run parameters."""
+    files = set(dependencies(item.path))
+    module = getattr(item, 'module', None)
+    for extra in EXTRA_DEPENDENCIES + tuple(getattr(module, 'DEPENDENCIES', ())):
+        files |= dependencies(ROOT / extra) if extra.endswith('.py') else {(ROOT / extra).resolve()}
+    payload = {
+        'version': CACHE_VERSION,
+        'test': item.nodeid,
+        'files': {p.relative_to(ROOT).as_posix(): _digest(p) for p in sorted(files)},
+        'seed': getattr(module, 'SEED', None),
+        'trials': getattr(module, 'TRIALS', None),
+        'float_type': get_float_type().name,
+        'env': key_environment(),
+        'report': reporting_enabled(),
+        'python': sys.version,
+        'numpy': np.__version__,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def load_entry(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        entry = json.loads((get_result_cache_dir() / f'{key}.json').read_text())
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get('key') == key else None
+
+
+def save_entry(entry: Dict[str, Any]) -> None:
+    path = get_result_cache_dir() / f"{entry['key']}.json"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write-then-rename so concurrent workers never read a partial entry
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(entry, fp, default=str)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # read-only checkout: run without a cache
+
+
+def is_replayed(report) -> bool:
+    return any(tuple(p) == REPLAYED for p in report.user_properties)
+
+
+def add_options(parser) -> None:
+    parser.getgroup('ssot', 'SSOT suite').addoption(
+        '--ssot-rerun', action='store_true', default=False,
+        help=f"Run every test even if a cached result matches (or ${ENV_RERUN}=1)")
+
+
+def rerun_requested(config) -> bool:
+    return config.getoption('ssot_rerun') or os.environ.get(ENV_RERUN, '') not in ('', '0')
+
+
+class ResultCachePlugin:
+    def __init__(self, config):
+        self.config = config
+        self.enabled = not instrument.enabled()
+        self.rerun = rerun_requested(config)
+        self.replayed: Set[str] = set()
+        self._key: Optional[str] = None
+        self._reports: Optional[List[Dict[str, Any]]] = None
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if not self.enabled:
+            return (yield)
+        self._key, self._reports = cache_key(item), []
+        writer = get_writer()
+        if writer is not None:
+            writer.capture = []
+        try:
+            result = yield
+        finally:
+            records = writer.capture if writer is not None else []
+            if writer is not None:
+                writer.capture = None
+            reports, self._reports = self._reports, None
+        if item.nodeid not in self.replayed and reports and all(
+                r['outcome'] in ('passed', 'skipped') for r in reports):
+            save_entry({'key': self._key, 'test': item.nodeid, 'reports': reports,
+                        'records': [r for r in records if r['metrics']]})
+        return result
+
+    @pytest.hookimpl(tryfirst=True, specname='pytest_runtest_protocol')
+    def pytest_runtest_replay(self, item, nextitem):
+        if not self.enabled or self.rerun:
+            return None
+        entry = load_entry(self._key)
+        if entry is None:
+            return None
+        hook = self.config.hook
+        hook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for data in entry['reports']:
+            report = hook.pytest_report_from_serializable(config=self.config, data=data)
+            report.user_properties.append(REPLAYED)
+            hook.pytest_runtest_logreport(report=report)
+        # the item before this one left the collectors it shared with this one
+        # set up; tear down those the next item does not need, as the teardown
+        # phase skipped here would have
+        item.session._setupstate.teardown_exact(nextitem)
+        hook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        writer = get_writer()
+        if writer is not None:
+            for rec in entry['records']:
+                writer.append(rec)
+        self.replayed.add(item.nodeid)
+        return True
+
+    def pytest_runtest_logreport(self, report):
+        if self._reports is not None and not is_replayed(report):
+            self._reports.append(self.config.hook.pytest_report_to_serializable(
+                config=self.config, report=report))
+        if is_replayed(report) and report.when == 'teardown':
+            self.replayed.add(report.nodeid)  # relayed from a scheduled worker
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.replayed:
+            terminalreporter.write_line(
+                f'{len(self.replayed)} unchanged tests replayed from the result cache '
+                f'(--ssot-rerun to run them)')
@@ -0,0 +1,256 @@
+"""
+Streaming results pipeline for reporting/results.json and reporting/summary.md.
+
+Enabled by SSOT_REPORT=1 (see `make report`).  While tests run, every
+record_invariant()/record_scenario() call appends one JSON line to
+reporting/results.jsonl, so nothing is held in memory.  At session end
+finalize() folds the stream into one entry per invariant/scenario and writes
+the schema.json-shaped results.json plus the markdown summary.
+
+Metrics merge by name, so a test may record the same metric many times
+(per chunk, per shard) and memory stays proportional to the number of
+distinct metric names:
+
+    max_*                     -> max
+    min_*                     -> min
+    trials, *violations, *_count -> sum
+    sketches                  -> exact sketch merge
+    anything else             -> last value recorded
+
+A sketch metric (tests.utils.sketches) is recorded as the sketch itself and
+stored serialized; results.json keeps the merged sketch, so runs can be merged
+again later, plus a `summary` of count, min/max and p50/p99/p99.9.  Entries
+whose SSOT metrics list violation_rate get violations / trials.
+"""
+import json
+import os
+import platform
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from tests.utils import instrument, sketches
+from tests.utils.ssot_loader import get_float_type, get_registry, get_seed, load_ssot
+
+_STATUS_RANK = {'passed': 0, 'skipped': 1, 'failed': 2}
+
+_WRITER: Optional['ResultsWriter'] = None
+
+
+def reporting_enabled() -> bool:
+    return os.environ.get('SSOT_REPORT', '') not in ('', '0')
+
+
+def get_report_paths() -> Dict[str, Path]:
+    """Output paths from the SSOT `reports` section, resolved against the repo root."""
+    root = Path(__file__).parent.parent.parent
+    paths = {r['format']: root / r['path'] for r in load_ssot().get('reports', [])}
+    json_path = paths.get('json', root / 'reporting' / 'results.json')
+    return {
+        'json': json_path,
+        'jsonl': json_path.with_suffix('.jsonl'),
+        'md': paths.get('md', root / 'reporting' / 'summary.md'),
+    }
+
+
+def merge_metric(name: str, old: Any, new: Any) -> Any:
+    if sketches.is_serialized(new):
+        if not sketches.is_serialized(old):
+            return new
+        return sketches.from_dict(old).merge(sketches.from_dict(new)).to_dict()
+    if old is None or not isinstance(new, (int, float)) or isinstance(new, bool):
+        return new
+    if name.startswith('max_'):
+        return max(old, new)
+    if name.startswith('min_'):
+        return min(old, new)
+    if name == 'trials' or name.endswith('violations') or name.endswith('_count'):
+        return old + new
+    return new
+
+
+class ResultsWriter:
+    def __init__(self, jsonl_path: Path):
+        self.path = Path(jsonl_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # set to a list to keep a copy of every record (see result_cache)
+        self.capture: Optional[List[Dict[str, Any]]] = None
+
+    def reset(self) -> None:
+        self.path.write_text('')
+
+    def record(self, kind: str, entry_id: str, metrics: Optional[Dict[str, Any]] = None,
+               status: Optional[str] = None, test: Optional[str] = None) -> None:
+        self.append({
+            'kind': kind, 'id': entry_id, 'test': test, 'status': status,
+            'metrics': _encode(metrics or {}),
+        })
+
+    def append(self, rec: Dict[str, Any]) -> None:
+        """Append one raw record to the stream."""
+        line = json.dumps(rec, default=float) + '\n'
+        if self.capture is not None:
+            self.capture.append(json.loads(line))
+        # One O_APPEND write per record keeps lines whole across processes
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with open(self.path, 'r') as fp:
+            for line in fp:
+                if line.strip():
+                    yield json.loads(line)
+
+    def aggregate(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Fold the stream into {kind: {id: entry}}; one pass, bounded by distinct ids."""
+        out: Dict[str, Dict[str, Dict[str, Any]]] = {'invariant': {}, 'scenario': {}}
+        for rec in self.iter_records():
+            entry = out.setdefault(rec['kind'], {}).setdefault(
+                rec['id'], {'id': rec['id'], 'status': None, 'tests': {}, 'metrics': {}})
+            if rec.get('status'):
+                if rec.get('test'):
+                    entry['tests'][rec['test']] = rec['status']
+                if entry['status'] is None or _STATUS_RANK[rec['status']] > _STATUS_RANK[entry['status']]:
+                    entry['status'] = rec['status']
+            for name, value in rec['metrics'].items():
+                entry['metrics'][name] = merge_metric(name, entry['metrics'].get(name), value)
+        return out
+
+    def finalize(self) -> Dict[str, Any]:
+        """Write results.json and summary.md from the stream; returns the results dict."""
+        ssot = load_ssot()
+        reg = get_registry()
+        specs = {spec.id: spec for spec in
+                 list(reg.invariants.values()) + list(reg.scenarios.values())}
+        agg = self.aggregate()
+
+        def entries(kind):
+            out = []
+            for i, e in sorted(agg.get(kind, {}).items()):
+                spec = specs.get(i)
+                out.append(dict(e, name=spec.name if spec else '',
+                                metrics=_finish_metrics(e['metrics'], spec.metrics if spec else ())))
+            return out
+
+        results = {
+            'suite': ssot.get('suite', ''),
+            'version': ssot.get('version', ''),
+            'run_id': time.strftime('%Y%m%dT%H%M%SZ', time.gmtime()) + '-' + uuid.uuid4().hex[:8],
+            'seed': get_seed('global'),
+            'env': {'python': sys.version.split()[0], 'platform': platform.platform(),
+                    'float_type': get_float_type().name},
+            'invariants': entries('invariant'),
+            'scenarios': entries('scenario'),
+        }
+        if agg.get('instrumentation'):
+            results['instrumentation'] = _instrumentation(agg['instrumentation'])
+        paths = get_report_paths()
+        paths['json'].write_text(json.dumps(results, indent=2, default=float) + '\n')
+        paths['md'].write_text(render_summary(results))
+        return results
+
+
+def _encode(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v.to_dict() if isinstance(v, sketches.BaseSketch) else v
+            for k, v in metrics.items()}
+
+
+def _finish_metrics(metrics: Dict[str, Any], metric_names) -> Dict[str, Any]:
+    out = {}
+    for name, value in metrics.items():
+        if sketches.is_serialized(value):
+            value = dict(value, summary=sketches.from_dict(value).summary())
+        out[name] = value
+    if 'violation_rate' in metric_names and metrics.get('trials') and 'violations' in metrics:
+        out['violation_rate'] = metrics['violations'] / metrics['trials']
+    return out
+
+
+def render_summary(results: Dict[str, Any]) -> str:
+    lines = [
+        '# Test Run Summary', '',
+        f"Suite `{results['suite']}` v{results['version']}, run `{results['run_id']}`, "
+        f"seed {results['seed']}, Python {results['env']['python']}.", '',
+    ]
+    for title, key in (('Invariants', 'invariants'), ('Scenarios', 'scenarios')):
+        lines += [f'## {title}', '', '| ID | Name | Status | Metrics |', '|----|------|--------|---------|']
+        for e in results[key]:
+            metrics = ', '.join(f'{k}={_fmt(v)}' for k, v in sorted(e['metrics'].items()))
+            lines.append(f"| {e['id']} | {e['name']} | {e['status'] or '-'} | {metrics or '-'} |")
+        lines.append('')
+    if 'instrumentation' in results:
+        lines += ['## Instrumentation', '', '| Op | Calls | Elements | Seconds | Magnitude |',
+                  '|----|-------|----------|---------|-----------|']
+        for op, t in results['instrumentation']['ops'].items():
+            lines.append(f"| {op} | {t.get('call_count', 0)} | {t.get('element_count', 0)} | "
+                         f"{_fmt(t.get('seconds', 0.0))} | {_fmt(t['magnitude']) if 'magnitude' in t else '-'} |")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def _instrumentation(tests: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-test op stats (SSOT_INSTRUMENT=1) plus per-op totals over all tests."""
+    ops: Dict[str, Dict[str, Any]] = {}
+    for e in tests.values():
+        for name, value in e['metrics'].items():
+            op, field = instrument.split_metric(name)
+            t = ops.setdefault(op, {})
+            if field == 'seconds':
+                t[field] = t.get(field, 0.0) + value
+            else:
+                t[field] = merge_metric(field, t.get(field), value)
+    for t in ops.values():
+        if sketches.is_serialized(t.get('magnitude')):
+            t['magnitude'] = dict(t['magnitude'], summary=sketches.from_dict(t['magnitude']).summary())
+    return {
+        'tests': [{'test': i, 'metrics': _finish_metrics(e['metrics'], ())}
+                  for i, e in sorted(tests.items())],
+        'ops': dict(sorted(ops.items(), key=lambda kv: -kv[1].get('seconds', 0.0))),
+    }
+
+
+def _fmt(value: Any) -> str:
+    if sketches.is_serialized(value):
+        summary = value.get('summary') or sketches.from_dict(value).summary()
+        return '[' + ' '.join(f'{k}={_fmt(v)}' for k, v in summary.items()) + ']'
+    if isinstance(value, float):
+        return f'{value:.6g}'
+    return str(value)
+
+
+def get_writer() -> Optional[ResultsWriter]:
+    """The session writer, or None when reporting is disabled."""
+    global _WRITER
+    if not reporting_enabled():
+        return None
+    if _WRITER is None:
+        _WRITER = ResultsWriter(get_report_paths()['jsonl'])
+    return _WRITER
+
+
+def record_invariant(inv_id: str, metrics: Dict[str, Any], status: Optional[str] = None,
+                     test: Optional[str] = None) -> None:
+    """Append metrics for an invariant (no-op unless SSOT_REPORT is set)."""
+    writer = get_writer()
+    if writer is not None:
+        writer.record('invariant', inv_id, metrics, status, test)
+
+
+def record_scenario(scn_id: str, metrics: Dict[str, Any], status: Optional[str] = None,
+                    test: Optional[str] = None) -> None:
+    """Append metrics for a scenario (no-op unless SSOT_REPORT is set)."""
+    writer = get_writer()
+    if writer is not None:
+        writer.record('scenario', scn_id, metrics, status, test)
+
+
+def entry_for_file(path: str):
+    """(kind, id) of the SSOT invariant/scenario whose `files` list contains path."""
+    return get_registry().entry_for_file(path)
@@ -0,0 +1,137 @@
+"""
+Shared, memory-mapped bank of generated U/N samples.
+
+Most property tests replay the same stream: default_rng(get_seed(...)) and
+then gen_UN(rng) once or a few times per trial.  get_bank() generates such a
+stream once, stores it as an (n, 2, 2) float64 .npy file and returns a
+read-only memory-mapped UNArray.  Every test, and every pool worker, that asks
+for the same stream maps the same file, so the samples are shared through the
+page cache and never regenerated or copied.
+
+Files live in .cache/sample_bank/ at the repo root (or $SSOT_BANK_DIR) and are
+named by generator version, mode, seed and length.  In 'scalar' mode the bank
+is exactly the sequence of successive gen_UN(rng) calls, so any bank is also a
+valid prefix of the stream: a request is served from the smallest existing
+bank that is long enough, and new banks are rounded up to a power of two
+(at least MIN_BANK) so that different TRIALS settings share one file.
+'fast' mode banks depend on their length and are only reused for an exact
+match.
+
+Bump GENERATOR_VERSION whenever gen_UN or gen_UN_batch changes its output.
+"""
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from tests.utils.generators import gen_UN_batch
+from tests.utils.un_array import UNArray
+
+GENERATOR_VERSION = 1
+MIN_BANK = 1 << 16
+CHUNK = 1 << 16
+
+# Largest bank mapped so far in this process, per (seed, mode[, count])
+_OPEN: Dict[tuple, UNArray] = {}
+
+
+def get_bank_dir() -> Path:
+    env_dir = os.environ.get('SSOT_BANK_DIR')
+    if env_dir:
+        return Path(env_dir)
+    return Path(__file__).parent.parent.parent / '.cache' / 'sample_bank'
+
+
+def _bank_name(seed: int, count: int, mode: str) -> str:
+    return f'gen_un-v{GENERATOR_VERSION}-{mode}-seed{seed}-n{count}.npy'
+
+
+def _find_bank(seed: int, count: int, mode: str) -> Optional[Path]:
+    bank_dir = get_bank_dir()
+    if mode != 'scalar':
+        path = bank_dir / _bank_name(seed, count, mode)
+        return path if path.exists() else None
+    pattern = re.compile(rf'gen_un-v{GENERATOR_VERSION}-{mode}-seed{seed}-n(\d+)\.npy')
+    best = None
+    if bank_dir.is_dir():
+        for path in bank_dir.iterdir():
+            m = pattern.fullmatch(path.name)
+            if m and int(m.group(1)) >= count and (best is None or int(m.group(1)) < best[0]):
+                best = (int(m.group(1)), path)
+    return best[1] if best else None
+
+
+def _fill(out: np.ndarray, seed: int, mode: str) -> None:
+    rng = np.random.default_rng(seed)
+    if mode == 'fast':
+        (n_a, u_t), (n_m, u_m) = gen_UN_batch(rng, len(out), mode='fast', dtype=np.float64)
+        out[:, 0, 0], out[:, 0, 1], out[:, 1, 0], out[:, 1, 1] = n_a, u_t, n_m, u_m
+        return
+    # scalar mode continues one rng across chunks, so the stream is unchanged
+    for start in range(0, len(out), CHUNK):
+        stop = min(start + CHUNK, len(out))
+        (n_a, u_t), (n_m, u_m) = gen_UN_batch(rng, stop - start, mode='scalar', dtype=np.float64)
+        block = out[start:stop]
+        block[:, 0, 0], block[:, 0, 1], block[:, 1, 0], block[:, 1, 1] = n_a, u_t, n_m, u_m
+
+
+def _generate(seed: int, count: int, mode: str) -> np.ndarray:
+    path = get_bank_dir() / _bank_name(seed, count, mode)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write-then-rename so concurrent workers never map a partial bank
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        os.close(fd)
+        out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float64, shape=(count, 2, 2))
+        _fill(out, seed, mode)
+        out.flush()
+        del out
+        os.replace(tmp, path)
+    except OSError:
+        # read-only checkout: keep the bank in memory for this process only
+        out = np.empty((count, 2, 2), dtype=np.float64)
+        _fill(out, seed, mode)
+        out.flags.writeable = False
+        return out
+    return np.load(path, mmap_mode='r')
+
+
+def get_bank(seed: int, count: int, mode: str = 'scalar') -> UNArray:
+    """
+    The first `count` samples of the (seed, mode) stream as a read-only UNArray.
+
+    Args:
+        seed: Seed for np.random.default_rng
+        count: Number of samples
+        mode: gen_UN_batch mode; 'scalar' replays successive gen_UN(rng) calls
+
+    Returns:
+        Zero-copy view into the memory-mapped bank
+    """
+    if mode not in ('scalar', 'fast'):
+        raise ValueError(f"Unknown sample bank mode: {mode!r}")
+    key = (seed, mode) if mode == 'scalar' else (seed, mode, count)
+    bank = _OPEN.get(key)
+    if bank is None or len(bank) < count:
+        path = _find_bank(seed, count, mode)
+        if path is not None:
+            data = np.load(path, mmap_mode='r')
+        else:
+            size = count if mode != 'scalar' else max(MIN_BANK, 1 << max(count - 1, 0).bit_length())
+            data = _generate(seed, size, mode)
+        bank = _OPEN[key] = UNArray(data)
+    return bank[:count]
+
+
+def draw_stream(seed: int, trials: int, per_trial: int = 1) -> Tuple[UNArray, ...]:
+    """
+    Samples for a loop that calls gen_UN(rng) per_trial times per trial.
+
+    Returns per_trial strided views; zipping them yields exactly the tuples
+    the loop would have generated from default_rng(seed).
+    """
+    bank = get_bank(seed, trials * per_trial)
+    return tuple(bank[i::per_trial] for i in range(per_trial))
@@ -0,0 +1,293 @@
+"""
+Cost-aware pytest plugin: per-test timing history and longest-job-first runs.
+
+Every run records, for each test, its wall time (setup + call + teardown),
+its TRIALS and the SSOT invariant/scenario id of its file, and folds them
+into .cache/timings.json at the repo root:
+
+    {'tests': {nodeid: {'id', 'seconds', 'trials', 'trials_per_sec', 'runs'}},
+     'ids':   {ssot_id: {'seconds', 'trials', 'trials_per_sec', 'tests'}}}
+
+`seconds` is an exponential moving average (weight ALPHA on the newest run),
+so one noisy run does not reshuffle the schedule.  The terminal summary lists
+the slowest SSOT ids of the run.
+
+With --ssot-jobs N (or SSOT_JOBS=N, 'auto' for os.cpu_count()) the collected
+tests are packed into N bins longest-job-first: in order of decreasing
+expected cost, each test goes to the currently lightest bin.  Tests without
+history cost the mean of the known ones.  Each bin runs as its own pytest
+subprocess, heaviest tests first; workers stream their serialized reports back
+and the parent replays them through pytest_runtest_logreport, so the terminal
+output, exit status, SSOT_REPORT results and the timing history are the same
+as for a serial run.  If a worker dies, the test it was running fails with the
+tail of the worker log and a fresh worker takes over the rest of its bin.
+
+SSOT_JOBS is independent of SSOT_WORKERS, which shards trials inside a test;
+use one or the other to avoid oversubscribing the cores.
+"""
+import heapq
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pytest
+
+from tests.utils import result_cache
+from tests.utils.results import entry_for_file
+
+ENV_JOBS = 'SSOT_JOBS'
+ENV_WORKER = 'SSOT_SCHED_WORKER'
+ALPHA = 0.5
+DEFAULT_COST = 1.0
+POLL = 0.05
+LOG_TAIL = 4000
+
+
+def get_timings_path() -> Path:
+    return Path(__file__).parent.parent.parent / '.cache' / 'timings.json'
+
+
+def get_jobs(value: Optional[str] = None) -> int:
+    """Worker processes for a scheduled run: value, then SSOT_JOBS, then 1."""
+    value = value or os.environ.get(ENV_JOBS)
+    if value == 'auto':
+        return os.cpu_count() or 1
+    return max(1, int(value)) if value else 1
+
+
+def is_worker() -> bool:
+    return bool(os.environ.get(ENV_WORKER))
+
+
+def load_history(path: Optional[Path] = None) -> Dict[str, Any]:
+    path = path or get_timings_path()
+    try:
+        history = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {'tests': {}, 'ids': {}}
+    history.setdefault('tests', {})
+    history.setdefault('ids', {})
+    return history
+
+
+def update_history(history: Dict[str, Any], runs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fold this run's {nodeid: {'id', 'seconds', 'trials'}} into history.
+
+    Returns history, with the per-id totals recomputed over every known test.
+    """
+    tests = history['tests']
+    for nodeid, run in runs.items():
+        old = tests.get(nodeid)
+        seconds = run['seconds']
+        if old is not None:
+            seconds = ALPHA * seconds + (1 - ALPHA) * old['seconds']
+        tests[nodeid] = {
+            'id': run['id'], 'seconds': seconds, 'trials': run['trials'],
+            'trials_per_sec': run['trials'] / seconds if run['trials'] and seconds > 0 else None,
+            'runs': (old or {}).get('runs', 0) + 1,
+        }
+    ids: Dict[str, Dict[str, Any]] = {}
+    for t in tests.values():
+        if t['id'] is None:
+            continue
+        e = ids.setdefault(t['id'], {'seconds': 0.0, 'trials': 0, 'tests': 0})
+        e['seconds'] += t['seconds']
+        e['trials'] += t['trials'] or 0
+        e['tests'] += 1
+    for e in ids.values():
+        e['trials_per_sec'] = e['trials'] / e['seconds'] if e['trials'] and e['seconds'] > 0 else None
+    history['ids'] = dict(sorted(ids.items()))
+    return history
+
+
+def save_history(history: Dict[str, Any], path: Optional[Path] = None) -> None:
+    path = path or get_timings_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w') as fp:
+        json.dump(history, fp, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def expected_costs(nodeids: Sequence[str], history: Dict[str, Any]) -> Dict[str, float]:
+    known = {n: history['tests'][n]['seconds'] for n in nodeids if n in history['tests']}
+    default = sum(known.values()) / len(known) if known else DEFAULT_COST
+    return {n: known.get(n, default) for n in nodeids}
+
+
+def pack(costs: Dict[str, float], bins: int) -> List[List[str]]:
+    """
+    Longest-job-first packing of costs into at most `bins` bins.
+
+    Each bin lists its tests heaviest first; ties break on node id, so the
+    schedule is deterministic.  Empty bins are dropped.
+    """
+    order = sorted(costs, key=lambda n: (-costs[n], n))
+    heap: List[Tuple[float, int]] = [(0.0, i) for i in range(max(1, bins))]
+    out: List[List[str]] = [[] for _ in heap]
+    for nodeid in order:
+        load, i = heapq.heappop(heap)
+        out[i].append(nodeid)
+        heapq.heappush(heap, (load + costs[nodeid], i))
+    return [b for b in out if b]
+
+
+def add_options(parser) -> None:
+    group = parser.getgroup('ssot', 'SSOT suite')
+    group.addoption('--ssot-jobs', default=None,
+                    help=f"Run tests in N worker processes, longest job first ('auto' = cpu count; "
+                         f"default ${ENV_JOBS} or 1)")
+    group.addoption('--ssot-report-to', default=None, help="(internal) worker report stream")
+
+
+class SchedulerPlugin:
+    def __init__(self, config):
+        self.config = config
+        self.jobs = get_jobs(config.getoption('ssot_jobs'))
+        self.report_to = config.getoption('ssot_report_to')
+        self.items: Dict[str, Any] = {}
+        self.runs: Dict[str, Dict[str, Any]] = {}
+
+    # -- timing -----------------------------------------------------------
+
+    def pytest_collection_modifyitems(self, items):
+        self.items = {item.nodeid: item for item in items}
+
+    def pytest_runtest_logreport(self, report):
+        if self.report_to:
+            self._emit(report)
+            return
+        if result_cache.is_replayed(report):
+            return  # not run here: keep the history's real timings
+        run = self.runs.get(report.nodeid)
+        if run is None:
+            item = self.items.get(report.nodeid)
+            entry = entry_for_file(report.nodeid.split('::')[0])
+            trials = getattr(getattr(item, 'module', None), 'TRIALS', None)
+            run = self.runs[report.nodeid] = {
+                'id': entry[1] if entry else None, 'seconds': 0.0,
+                'trials': trials if isinstance(trials, int) else None,
+            }
+        run['seconds'] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        if self.report_to or not self.runs or self.config.option.collectonly:
+            return
+        save_history(update_history(load_history(), self.runs))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.report_to or not self.runs:
+            return
+        by_id: Dict[str, List[float]] = {}
+        for run in self.runs.values():
+            if run['id'] is not None:
+                t = by_id.setdefault(run['id'], [0.0, 0])
+                t[0] += run['seconds']
+                t[1] += run['trials'] or 0
+        if not by_id:
+            return
+        terminalreporter.write_sep('=', 'slowest SSOT ids')
+        for ssot_id, (seconds, trials) in sorted(by_id.items(), key=lambda kv: -kv[1][0])[:10]:
+            rate = f'{trials / seconds:>12.4g} trials/s' if trials and seconds > 0 else ''
+            terminalreporter.write_line(f'{ssot_id:<10}{seconds:>9.2f}s{rate}')
+
+    # -- scheduling -------------------------------------------------------
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if self.report_to or self.jobs < 2 or len(self.items) < 2 or self.config.option.collectonly:
+            return None
+        if session.testsfailed:
+            return None  # collection errors: let pytest's own loop abort the run
+        bins = pack(expected_costs(list(self.items), load_history()), self.jobs)
+        with tempfile.TemporaryDirectory(prefix='ssot-jobs-') as tmp:
+            self._tmp, self._spawned = Path(tmp), 0
+            self._relay(session, [self._spawn(b) for b in bins])
+        return True
+
+    def _spawn(self, nodeids: List[str]) -> Dict[str, Any]:
+        index, self._spawned = self._spawned, self._spawned + 1
+        stream, log = self._tmp / f'worker{index}.jsonl', self._tmp / f'worker{index}.log'
+        stream.touch()
+        args = [sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+                f'--rootdir={self.config.rootpath}', f'--ssot-report-to={stream}']
+        if self.config.inipath:
+            args += ['-c', str(self.config.inipath)]
+        env = dict(os.environ, **{ENV_WORKER: str(index)})
+        env.pop(ENV_JOBS, None)
+        if result_cache.rerun_requested(self.config):
+            env[result_cache.ENV_RERUN] = '1'
+        with open(log, 'wb') as out:
+            proc = subprocess.Popen(args + nodeids, cwd=self.config.rootpath, env=env,
+                                    stdout=out, stderr=subprocess.STDOUT)
+        return {'proc': proc, 'stream': open(stream, 'r'), 'log': log, 'buffer': '',
+                'pending': list(nodeids), 'current': None}
+
+    def _relay(self, session, workers: List[Dict[str, Any]]) -> None:
+        hook = self.config.hook
+        try:
+            while workers:
+                for w in list(workers):
+                    done = w['proc'].poll() is not None
+                    self._drain(hook, w)
+                    if not done:
+                        continue
+                    w['stream'].close()
+                    workers.remove(w)
+                    if w['pending']:
+                        # the worker died: fail the test it was running, restart the rest
+                        self._fail_crashed(hook, w)
+                        if w['pending'] and not (session.shouldfail or session.shouldstop):
+                            workers.append(self._spawn(w['pending']))
+                if session.shouldfail or session.shouldstop:
+                    break
+                time.sleep(POLL)
+        finally:
+            for w in workers:
+                w['proc'].kill()
+                w['proc'].wait()
+                w['stream'].close()
+
+    def _drain(self, hook, w: Dict[str, Any]) -> None:
+        w['buffer'] += w['stream'].read()
+        *lines, w['buffer'] = w['buffer'].split('\n')
+        for line in lines:
+            data = json.loads(line)
+            report = hook.pytest_report_from_serializable(config=self.config, data=data)
+            if report.when == 'setup':
+                w['current'] = report.nodeid
+                hook.pytest_runtest_logstart(nodeid=report.nodeid, location=report.location)
+            hook.pytest_runtest_logreport(report=report)
+            if report.when == 'teardown':
+                hook.pytest_runtest_logfinish(nodeid=report.nodeid, location=report.location)
+                w['current'] = None
+                if report.nodeid in w['pending']:
+                    w['pending'].remove(report.nodeid)
+
+    def _fail_crashed(self, hook, w: Dict[str, Any]) -> None:
+        from _pytest.reports import TestReport
+        nodeid = w['current'] or w['pending'][0]
+        w['pending'].remove(nodeid)
+        tail = w['log'].read_bytes()[-LOG_TAIL:].decode('utf-8', 'replace')
+        reason = f"worker exited with status {w['proc'].returncode} while running this test:\n{tail}"
+        location = self.items[nodeid].location
+        report = TestReport(nodeid, location, {}, 'failed', reason, 'call')
+        if w['current'] is None:
+            hook.pytest_runtest_logstart(nodeid=nodeid, location=location)
+        hook.pytest_runtest_logreport(report=report)
+        hook.pytest_runtest_logfinish(nodeid=nodeid, location=location)
+
+    def _emit(self, report) -> None:
+        data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+        line = json.dumps(data, default=str) + '\n'
+        fd = os.open(self.report_to, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
@@ -0,0 +1,103 @@
+"""
+Deterministic trial sharding across a process pool.
+
+A run of `trials` is cut into fixed-size shards (independent of the worker
+count).  Shard i draws from its own stream, spawned from the SSOT seed:
+
+    SeedSequence(seed).spawn(n_shards)[i]
+
+and shard results are merged in shard order, so the merged ShardResult is the
+same for 1 worker or 64.  Distribution metrics travel as named sketches
+(tests.utils.sketches), which merge exactly.  The check function receives (rng, n) and must be
+defined at module level so it can be pickled to the workers.
+
+Worker count comes from the SSOT_WORKERS environment variable ('auto' means
+os.cpu_count()); the default of 1 runs every shard in-process.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from tests.utils.sketches import Sketch, merge_all
+
+DEFAULT_SHARD_SIZE = 50_000
+
+
+@dataclass
+class ShardResult:
+    trials: int = 0
+    violations: int = 0
+    max_deltas: Dict[str, float] = field(default_factory=dict)
+    sketches: Dict[str, Sketch] = field(default_factory=dict)
+
+    def merge(self, other: 'ShardResult') -> 'ShardResult':
+        keys = list(self.max_deltas) + [k for k in other.max_deltas if k not in self.max_deltas]
+        return ShardResult(
+            trials=self.trials + other.trials,
+            violations=self.violations + other.violations,
+            max_deltas={
+                k: max(self.max_deltas.get(k, 0.0), other.max_deltas.get(k, 0.0)) for k in keys
+            },
+            sketches=merge_all(self.sketches, other.sketches),
+        )
+
+
+Check = Callable[[np.random.Generator, int], ShardResult]
+
+
+def get_workers(override: Optional[int] = None) -> int:
+    """Worker processes for sharded runs: override, then SSOT_WORKERS, then 1."""
+    if override is not None:
+        return max(1, override)
+    env_workers = os.environ.get('SSOT_WORKERS')
+    if env_workers == 'auto':
+        return os.cpu_count() or 1
+    if env_workers:
+        return max(1, int(env_workers))
+    return 1
+
+
+def shard_plan(trials: int, seed: int, shard_size: int = DEFAULT_SHARD_SIZE):
+    """List of (SeedSequence, n) per shard; depends only on trials, seed and shard_size."""
+    n_shards = max(1, -(-trials // shard_size))
+    seqs = np.random.SeedSequence(seed).spawn(n_shards)
+    sizes = [shard_size] * (n_shards - 1) + [trials - shard_size * (n_shards - 1)]
+    return list(zip(seqs, sizes))
+
+
+def _run_shard(task) -> ShardResult:
+    check, seq, n = task
+    return check(np.random.default_rng(seq), n)
+
+
+def run_sharded(check: Check, trials: int, seed: int,
+                workers: Optional[int] = None,
+                shard_size: int = DEFAULT_SHARD_SIZE) -> ShardResult:
+    """
+    Run check over `trials` samples split into shards, merging deterministically.
+
+    Args:
+        check: Module-level function (rng, n) -> ShardResult
+        trials: Total trial count (e.g. get_trials())
+        seed: Root seed (e.g. get_seed('properties'))
+        workers: Process count; defaults to get_workers()
+        shard_size: Trials per shard; part of the reproducibility contract
+
+    Returns:
+        Merged ShardResult
+    """
+    tasks = [(check, seq, n) for seq, n in shard_plan(trials, seed, shard_size)]
+    workers = min(get_workers(workers), len(tasks))
+    if workers == 1:
+        results: List[ShardResult] = [_run_shard(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_shard, tasks))
+
+    merged = ShardResult()
+    for r in results:
+        merged = merged.merge(r)
+    return merged
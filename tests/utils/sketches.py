@@ -0,0 +1,324 @@
+"""
+Fixed-memory, mergeable streaming sketches for metric distributions.
+
+Distribution metrics (conservativity_gap_dist, M_ratio_dist, ...) cannot be
+kept as raw per-trial values at 1e8 trials, so tests record a sketch instead.
+Both kinds are updated with whole batches, merge exactly (shard sketches
+merged in any order equal one sketch over all values) and round-trip through
+to_dict()/from_dict(), which is how they travel through ShardResult,
+reporting/results.jsonl and into reporting/results.json.
+
+LogHistogram has fixed bucket edges: per_decade log-spaced buckets per sign
+over the decades [lo, hi) (default the 24 decades 1e-12 .. 1e12 that gen_UN
+spans), plus underflow/overflow buckets and a zero count.  Its size never
+depends on the data, and quantiles are resolved to one bucket.
+
+QuantileSketch is a log-bucketed (DDSketch-style) quantile sketch: a value
+x > 0 goes to bucket k = ceil(log_gamma(x)) with gamma = (1 + alpha) / (1 - alpha),
+so every quantile is returned within relative error alpha of the true order
+statistic, independent of the distribution.  Negative values use a mirrored
+store and exact zeros are counted separately.  Batches are added with one
+bincount, and two sketches with the same alpha merge by adding bucket counts,
+which is exact: merging shard sketches gives the same counts as one pass over
+all values.
+
+Memory is bounded by max_buckets per sign; when a store would exceed it, its
+lowest-magnitude buckets are collapsed into one, so only quantiles in that
+extreme low tail lose accuracy.
+"""
+import copy
+import math
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+SUMMARY_QUANTILES = {'p50': 0.5, 'p99': 0.99, 'p99_9': 0.999}
+
+
+class _Store:
+    """Dense bucket counts for one sign; counts[i] is bucket offset + i."""
+    __slots__ = ('counts', 'offset', 'max_buckets')
+
+    def __init__(self, max_buckets: int):
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.offset = 0
+        self.max_buckets = max_buckets
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def add_keys(self, keys: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        if len(keys) == 0:
+            return
+        lo, hi = int(keys.min()), int(keys.max())
+        self._cover(lo, hi)
+        counts = np.bincount(keys - lo, weights=weights, minlength=hi - lo + 1)
+        start = lo - self.offset
+        self.counts[start:start + len(counts)] += counts.astype(np.int64)
+        self._collapse()
+
+    def _cover(self, lo: int, hi: int) -> None:
+        if len(self.counts) == 0:
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+            self.offset = lo
+            return
+        new_lo = min(lo, self.offset)
+        new_hi = max(hi, self.offset + len(self.counts) - 1)
+        if new_lo == self.offset and new_hi == self.offset + len(self.counts) - 1:
+            return
+        grown = np.zeros(new_hi - new_lo + 1, dtype=np.int64)
+        grown[self.offset - new_lo:self.offset - new_lo + len(self.counts)] = self.counts
+        self.counts, self.offset = grown, new_lo
+
+    def _collapse(self) -> None:
+        excess = len(self.counts) - self.max_buckets
+        if excess > 0:
+            self.counts[excess] += self.counts[:excess].sum()
+            self.counts = self.counts[excess:].copy()
+            self.offset += excess
+
+    def merge(self, other: '_Store') -> None:
+        if len(other.counts):
+            nz = np.nonzero(other.counts)[0]
+            if len(nz):
+                self.add_keys(nz + other.offset, other.counts[nz])
+
+
+class BaseSketch:
+    kind = ''
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        return np.array([self.quantile(q) for q in qs])
+
+    def copy(self):
+        return copy.deepcopy(self)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BaseSketch) and self.to_dict() == other.to_dict()
+
+    def summary(self) -> Dict[str, Any]:
+        """count, exact min/max and SUMMARY_QUANTILES, for reports."""
+        out: Dict[str, Any] = {'count': self.count}
+        if self.count:
+            out.update(min=self.min, max=self.max)
+            out.update({name: self.quantile(q) for name, q in SUMMARY_QUANTILES.items()})
+        return out
+
+    def _header(self) -> Dict[str, Any]:
+        return {'sketch': self.kind, 'count': self.count, 'zero_count': self.zero_count,
+                'min': self.min if self.count else None, 'max': self.max if self.count else None}
+
+    def _load_header(self, d: Dict[str, Any]) -> None:
+        self.count = d['count']
+        self.zero_count = d['zero_count']
+        self.min = math.inf if d['min'] is None else d['min']
+        self.max = -math.inf if d['max'] is None else d['max']
+
+
+def _encode_counts(counts: np.ndarray, offset: int = 0) -> Dict[str, Any]:
+    nz = np.flatnonzero(counts)
+    if len(nz) == 0:
+        return {'offset': offset, 'counts': []}
+    return {'offset': offset + int(nz[0]), 'counts': counts[nz[0]:nz[-1] + 1].tolist()}
+
+
+def _rank_in(counts: np.ndarray, rank: int) -> int:
+    return int(np.searchsorted(np.cumsum(counts), rank, side='right'))
+
+
+class LogHistogram(BaseSketch):
+    kind = 'log_histogram'
+
+    def __init__(self, lo: int = -12, hi: int = 12, per_decade: int = 16):
+        if hi <= lo or per_decade < 1:
+            raise ValueError(f"Invalid LogHistogram range [{lo}, {hi}) x {per_decade}")
+        self.lo, self.hi, self.per_decade = lo, hi, per_decade
+        # index 0 is underflow (< 10**lo), index -1 overflow (>= 10**hi)
+        size = (hi - lo) * per_decade + 2
+        self.pos = np.zeros(size, dtype=np.int64)
+        self.neg = np.zeros(size, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, magnitudes: np.ndarray) -> np.ndarray:
+        i = np.floor((np.log10(magnitudes) - self.lo) * self.per_decade) + 1
+        return np.clip(i, 0, len(self.pos) - 1).astype(np.int64)
+
+    def add(self, values) -> None:
+        """Add a batch of values; NaN and ±inf are ignored."""
+        v = np.asarray(values, dtype=np.float64).ravel()
+        v = v[np.isfinite(v)]
+        if len(v) == 0:
+            return
+        self.count += len(v)
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        pos, neg = v[v > 0], v[v < 0]
+        self.zero_count += len(v) - len(pos) - len(neg)
+        self.pos += np.bincount(self._index(pos), minlength=len(self.pos))
+        self.neg += np.bincount(self._index(-neg), minlength=len(self.neg))
+
+    def _check_compatible(self, other: 'LogHistogram') -> None:
+        if (self.lo, self.hi, self.per_decade) != (other.lo, other.hi, other.per_decade):
+            raise ValueError("Cannot merge LogHistograms with different bucket edges")
+
+    def merge(self, other: 'LogHistogram') -> 'LogHistogram':
+        """Add other's counts into self (exact); returns self."""
+        self._check_compatible(other)
+        self.pos += other.pos
+        self.neg += other.neg
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _value(self, i: int) -> float:
+        if i == 0:
+            return 10.0 ** self.lo
+        if i == len(self.pos) - 1:
+            return 10.0 ** self.hi
+        return 10.0 ** (self.lo + (i - 0.5) / self.per_decade)  # geometric bucket midpoint
+
+    def edges(self) -> np.ndarray:
+        """Magnitude edges of the regular buckets (underflow/overflow excluded)."""
+        return 10.0 ** (self.lo + np.arange(len(self.pos) - 1) / self.per_decade)
+
+    def quantile(self, q: float) -> float:
+        """Value at rank floor(q * (count - 1)), resolved to its bucket."""
+        if self.count == 0:
+            return math.nan
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"q must be in [0, 1], got {q}")
+        rank = int(q * (self.count - 1))
+        neg_total = int(self.neg.sum())
+        if rank < neg_total:
+            value = -self._value(len(self.neg) - 1 - _rank_in(self.neg[::-1], rank))
+        elif rank < neg_total + self.zero_count:
+            value = 0.0
+        else:
+            value = self._value(_rank_in(self.pos, rank - neg_total - self.zero_count))
+        return min(max(value, self.min), self.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._header(), lo=self.lo, hi=self.hi, per_decade=self.per_decade,
+                    pos=_encode_counts(self.pos), neg=_encode_counts(self.neg))
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'LogHistogram':
+        h = cls(d['lo'], d['hi'], d['per_decade'])
+        h._load_header(d)
+        for name in ('pos', 'neg'):
+            enc = d[name]
+            getattr(h, name)[enc['offset']:enc['offset'] + len(enc['counts'])] = enc['counts']
+        return h
+
+
+class QuantileSketch(BaseSketch):
+    kind = 'quantile'
+
+    def __init__(self, alpha: float = 1e-3, max_buckets: int = 4096):
+        if not 0.0 < alpha < 1.0:
+            raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+        self.alpha = alpha
+        self.gamma = (1.0 + alpha) / (1.0 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self._pos = _Store(max_buckets)
+        self._neg = _Store(max_buckets)
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _keys(self, magnitudes: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def add(self, values) -> None:
+        """Add a batch of values; NaN and ±inf are ignored."""
+        v = np.asarray(values, dtype=np.float64).ravel()
+        v = v[np.isfinite(v)]
+        if len(v) == 0:
+            return
+        self.count += len(v)
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        pos, neg = v[v > 0], v[v < 0]
+        self.zero_count += len(v) - len(pos) - len(neg)
+        self._pos.add_keys(self._keys(pos))
+        self._neg.add_keys(self._keys(-neg))
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Add other's counts into self (exact); returns self."""
+        if other.gamma != self.gamma:
+            raise ValueError(f"Cannot merge QuantileSketches with alpha {self.alpha} and {other.alpha}")
+        self._pos.merge(other._pos)
+        self._neg.merge(other._neg)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _value(self, key: int) -> float:
+        # midpoint (in relative terms) of bucket (gamma^(k-1), gamma^k]
+        return 2.0 * self.gamma ** key / (self.gamma + 1.0)
+
+    def quantile(self, q: float) -> float:
+        """Value at rank floor(q * (count - 1)), within relative error alpha."""
+        if self.count == 0:
+            return math.nan
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"q must be in [0, 1], got {q}")
+        rank = int(q * (self.count - 1))
+        neg_total = self._neg.total
+        if rank < neg_total:
+            # negatives in ascending value order = descending magnitude
+            i = _rank_in(self._neg.counts[::-1], rank)
+            value = -self._value(self._neg.offset + len(self._neg.counts) - 1 - i)
+        elif rank < neg_total + self.zero_count:
+            value = 0.0
+        else:
+            i = _rank_in(self._pos.counts, rank - neg_total - self.zero_count)
+            value = self._value(self._pos.offset + i)
+        return min(max(value, self.min), self.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._header(), alpha=self.alpha, max_buckets=self.max_buckets,
+                    pos=_encode_counts(self._pos.counts, self._pos.offset),
+                    neg=_encode_counts(self._neg.counts, self._neg.offset))
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'QuantileSketch':
+        s = cls(d['alpha'], d['max_buckets'])
+        s._load_header(d)
+        for store, enc in ((s._pos, d['pos']), (s._neg, d['neg'])):
+            store.counts = np.array(enc['counts'], dtype=np.int64)
+            store.offset = enc['offset']
+        return s
+
+    def __repr__(self) -> str:
+        return f"QuantileSketch(alpha={self.alpha}, count={self.count})"
+
+
+Sketch = Union[LogHistogram, QuantileSketch]
+SKETCH_TYPES = {cls.kind: cls for cls in (LogHistogram, QuantileSketch)}
+
+
+def is_serialized(value: Any) -> bool:
+    return isinstance(value, dict) and value.get('sketch') in SKETCH_TYPES
+
+
+def from_dict(d: Dict[str, Any]) -> Sketch:
+    return SKETCH_TYPES[d['sketch']].from_dict(d)
+
+
+def merge_all(sketches: Dict[str, Sketch], other: Dict[str, Sketch]) -> Dict[str, Sketch]:
+    """Name-wise merge of two sketch maps into a new map; inputs are not modified."""
+    out = {name: s.copy() for name, s in sketches.items()}
+    for name, s in other.items():
+        out[name] = out[name].merge(s) if name in out else s.copy()
+    return out
@@ -0,0 +1,196 @@
+"""
+Sliding-window ⊕ / ⊗ aggregates over U/N streams in amortized O(1) per sample.
+
+Both ops use one bracketing, van Herk/Gil-Werman blocks aligned to multiples
+of `size` in the global stream: per block a left-fold prefix and a right-fold
+suffix, and window [s, s+size-1] = suffix[s] ○ prefix[s+size-1] (or just the
+prefix when s is block-aligned).  ⊗ is not associative in floating point, or
+for the cross-tier terms, so the bracketing is part of the definition; for ⊕
+it also means every window is a sum of its own elements, never a difference
+of running totals that could cancel and under-report u_t/u_m.
+
+Two front ends produce the same aggregates bit-for-bit:
+
+SlidingWindow(size, op) -- push one scalar element at a time: a two-stack
+    queue.  The back stack keeps a left fold of pushed elements; when the
+    front stack runs empty the back stack is flipped into it as right-folded
+    suffixes.  The window is front_top ○ back.
+
+WindowedStream(size, op) -- feed whole chunks, get one aggregate per
+    completed window.  It carries the current block's elements and prefixes
+    and the suffixes of the last completed block across chunks, so each
+    chunk folds only its own samples: prefixes continue the open block,
+    every block completed in the chunk gets its suffixes (vectorized across
+    blocks), and each window is one batched ○.  Work per chunk is O(chunk)
+    plus O(size) per completed block, whatever the ratio of window to chunk;
+    ⊕ folds with np.add.accumulate, ⊗ with one mul_batch per block position.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+from tests.utils.algebra_api import UN, UNBatch, add, add_batch, mul, mul_batch
+
+OPS = ('add', 'mul')
+
+
+def _check_op(op: str) -> None:
+    if op not in OPS:
+        raise ValueError(f"Unknown window op: {op!r}; expected one of {OPS}")
+
+
+class SlidingWindow:
+    def __init__(self, size: int, op: str = 'add', lam: float = 1.0):
+        _check_op(op)
+        self.size = size
+        self.op = op
+        self.lam = lam
+        self.count = 0
+        # front holds suffix aggregates; back holds elements and their left fold
+        self._front: List[UN] = []
+        self._back: List[UN] = []
+        self._back_agg: Optional[UN] = None
+        self._lam = None  # lam in the elements' type, fixed by the first push
+
+    def _apply(self, x: UN, y: UN) -> UN:
+        return add(x, y) if self.op == 'add' else mul(x, y, lam=self._lam)
+
+    def push(self, x: UN) -> UN:
+        """Add x and return the aggregate of the last min(count, size) elements."""
+        if self._lam is None:
+            # numpy 1.x promotes Python float * float32 scalar to float64, which
+            # WindowedStream's arrays never do: hand mul a lam of the same type
+            u_t = x[0][1]
+            self._lam = u_t.dtype.type(self.lam) if isinstance(u_t, np.generic) else self.lam
+        self.count += 1
+        if len(self._front) + len(self._back) == self.size:
+            # evict the oldest element before x arrives
+            if not self._front:
+                # flip: suffix aggregates, last element of the block first
+                agg = None
+                for e in reversed(self._back):
+                    agg = e if agg is None else self._apply(e, agg)
+                    self._front.append(agg)
+                self._back = []
+                self._back_agg = None
+            self._front.pop()
+        self._back.append(x)
+        self._back_agg = x if self._back_agg is None else self._apply(self._back_agg, x)
+        if self._front:
+            return self._apply(self._front[-1], self._back_agg)
+        return self._back_agg
+
+
+class WindowedStream:
+    def __init__(self, size: int, op: str = 'add', lam: float = 1.0):
+        _check_op(op)
+        self.size = size
+        self.op = op
+        self.lam = lam
+        self.count = 0
+        # the open block: its elements so far and their left folds
+        self._block: Optional[np.ndarray] = None
+        self._prefix: Optional[np.ndarray] = None
+        # right folds of the last completed block (None before the first)
+        self._suffix: Optional[np.ndarray] = None
+
+    def feed(self, chunk: UNBatch) -> UNBatch:
+        """Aggregates for every window that ends inside this chunk."""
+        (na, ut), (nm, um) = chunk
+        rows = np.column_stack((na, ut, nm, um))
+        size, start, m = self.size, self.count, len(rows)
+        if self._block is None:
+            self._block = np.empty((size, 4), rows.dtype)
+            self._prefix = np.empty((size, 4), rows.dtype)
+        pos = start % size
+        prefixes, suffixes = [], []
+        i = 0
+        if pos and m:
+            # continue the open block
+            k = min(m, size - pos)
+            p = _scan(self.op, rows[None, :k], self.lam, self._prefix[None, pos - 1])[0]
+            self._block[pos:pos + k] = rows[:k]
+            self._prefix[pos:pos + k] = p
+            prefixes.append(p)
+            if pos + k == size:
+                suffixes.append(_rscan(self.op, self._block[None], self.lam)[0])
+            i = k
+        n_full = (m - i) // size
+        if n_full:
+            full = rows[i:i + n_full * size].reshape(n_full, size, 4)
+            prefixes.append(_scan(self.op, full, self.lam).reshape(-1, 4))
+            suffixes.append(_rscan(self.op, full, self.lam).reshape(-1, 4))
+            i += n_full * size
+        if i < m:
+            # open a new block with the rest
+            r = m - i
+            p = _scan(self.op, rows[None, i:], self.lam)[0]
+            self._block[:r] = rows[i:]
+            self._prefix[:r] = p
+            prefixes.append(p)
+
+        prev = self._suffix if self._suffix is not None else np.zeros((size, 4), rows.dtype)
+        suffix = np.concatenate([prev] + suffixes) if suffixes else prev
+        if suffixes:
+            self._suffix = suffix[-size:]
+        self.count += m
+
+        last = np.arange(max(start, size - 1), start + m)
+        if len(last) == 0:
+            empty = np.empty(0, rows.dtype)
+            return ((empty, empty), (empty, empty))
+        prefix = np.concatenate(prefixes)
+        first = last - size + 1
+        out = prefix[last - start]
+        inner = first % size != 0
+        if inner.any():
+            base = (start // size - 1) * size  # global index of suffix[0]
+            out[inner] = _apply(self.op, suffix[first[inner] - base],
+                                prefix[last[inner] - start], self.lam)
+        return ((out[:, 0], out[:, 1]), (out[:, 2], out[:, 3]))
+
+
+def windowed(x: UNBatch, size: int, op: str = 'add', lam: float = 1.0) -> UNBatch:
+    """Aggregates of every complete window of a single batch (len n - size + 1)."""
+    return WindowedStream(size, op, lam).feed(x)
+
+
+def _as_batch(a: np.ndarray) -> UNBatch:
+    return ((a[..., 0], a[..., 1]), (a[..., 2], a[..., 3]))
+
+
+def _apply(op: str, a: np.ndarray, b: np.ndarray, lam: float) -> np.ndarray:
+    """a ○ b on (..., 4) component arrays."""
+    if op == 'add':
+        (na, ut), (nm, um) = add_batch(_as_batch(a), _as_batch(b))
+    else:
+        (na, ut), (nm, um) = mul_batch(_as_batch(a), _as_batch(b), lam)
+    return np.stack((na, ut, nm, um), axis=-1)
+
+
+def _scan(op: str, rows: np.ndarray, lam: float, init: Optional[np.ndarray] = None) -> np.ndarray:
+    """Left folds along axis 1 of (B, L, 4): out[:, j] = ((init ○ r_0) ○ r_1) ... ○ r_j."""
+    if op == 'add':
+        # accumulate adds strictly left to right, like the scalar fold
+        if init is None:
+            return np.add.accumulate(rows, axis=1)
+        return np.add.accumulate(np.concatenate((init[:, None], rows), axis=1), axis=1)[:, 1:]
+    out = np.empty_like(rows)
+    acc = init
+    for j in range(rows.shape[1]):
+        acc = rows[:, j] if acc is None else _apply(op, acc, rows[:, j], lam)
+        out[:, j] = acc
+    return out
+
+
+def _rscan(op: str, rows: np.ndarray, lam: float) -> np.ndarray:
+    """Right folds along axis 1 of (B, L, 4): out[:, j] = r_j ○ (r_{j+1} ○ (... ○ r_{L-1}))."""
+    if op == 'add':
+        # r_j + acc == acc + r_j bit for bit, so a reversed accumulate is the right fold
+        return np.add.accumulate(rows[:, ::-1], axis=1)[:, ::-1]
+    out = np.empty_like(rows)
+    acc = None
+    for j in range(rows.shape[1] - 1, -1, -1):
+        acc = rows[:, j] if acc is None else _apply(op, rows[:, j], acc, lam)
+        out[:, j] = acc
+    return out
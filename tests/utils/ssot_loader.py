@@ -1,13 +1,29 @@
 """
 SSOT Configuration Loader
-Loads test configuration from tests/SSOT.yaml
+Loads test configuration from tests/SSOT.yaml through the compiled registry
+(see ssot_registry.py), so an unchanged SSOT is read from a cached snapshot
+without running the YAML parser.
+
+The working float type is defaults.float_type (overridden by the
+SSOT_FLOAT_TYPE environment variable): float32, float64 or longdouble.  The
+SSOT atol/rtol are float64 values; every other type gets the same tolerance
+in units of its own machine epsilon, atol_T = atol * eps(T) / eps(float64),
+so float32 checks allow ~5.4e-4 and longdouble ~4.9e-16 at the SSOT 1e-12.
 """
-import yaml
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+
+from tests.utils.ssot_registry import Registry, Threshold, load_registry
+
+FLOAT_TYPES = {'float32': np.float32, 'float64': np.float64, 'longdouble': np.longdouble}
+
+FloatType = Union[str, type, np.dtype]
 
 _SSOT_CACHE: Optional[Dict[str, Any]] = None
+_REGISTRY: Optional[Registry] = None
 
 
 def get_ssot_path() -> Path:
@@ -16,19 +32,25 @@ def get_ssot_path() -> Path:
     return Path(__file__).parent.parent / "SSOT.yaml"
 
 
-def load_ssot() -> Dict[str, Any]:
-    """Load SSOT configuration from YAML file."""
-    global _SSOT_CACHE
-    if _SSOT_CACHE is not None:
-        return _SSOT_CACHE
+def get_registry() -> Registry:
+    """Get the compiled SSOT registry (cached per process)."""
+    global _REGISTRY
+    if _REGISTRY is not None:
+        return _REGISTRY
 
     ssot_path = get_ssot_path()
     if not ssot_path.exists():
         raise FileNotFoundError(f"SSOT file not found: {ssot_path}")
 
-    with open(ssot_path, 'r') as f:
-        _SSOT_CACHE = yaml.safe_load(f)
+    _REGISTRY = load_registry(ssot_path)
+    return _REGISTRY
 
+
+def load_ssot() -> Dict[str, Any]:
+    """Load SSOT configuration (the parsed YAML document)."""
+    global _SSOT_CACHE
+    if _SSOT_CACHE is None:
+        _SSOT_CACHE = get_registry().raw
     return _SSOT_CACHE
 
 
@@ -69,25 +91,51 @@ def get_seed(category: str = 'properties') -> int:
     return seeds.get(category, seeds.get('global', 1337))
 
 
-def get_tolerance(kind: str = 'atol') -> float:
+def get_float_type(override: Optional[FloatType] = None) -> np.dtype:
+    """
+    Get the working float dtype.
+
+    Args:
+        override: Optional name ('float32', 'float64', 'longdouble') or dtype
+
+    Returns:
+        dtype from override, then SSOT_FLOAT_TYPE, then SSOT defaults.float_type
+    """
+    if override is None:
+        override = (os.environ.get('SSOT_FLOAT_TYPE')
+                    or load_ssot().get('defaults', {}).get('float_type', 'float64'))
+    if isinstance(override, str):
+        if override not in FLOAT_TYPES:
+            raise ValueError(f"Unknown float_type {override!r}; expected one of {sorted(FLOAT_TYPES)}")
+        override = FLOAT_TYPES[override]
+    dtype = np.dtype(override)
+    if dtype not in [np.dtype(t) for t in FLOAT_TYPES.values()]:
+        raise ValueError(f"Unsupported float_type {dtype}; expected one of {sorted(FLOAT_TYPES)}")
+    return dtype
+
+
+def get_tolerance(kind: str = 'atol', dtype: Optional[FloatType] = None) -> float:
     """
     Get tolerance value from SSOT.
 
     Args:
         kind: Either 'atol' (absolute) or 'rtol' (relative)
+        dtype: Float type the tolerance is for (default: get_float_type())
 
     Returns:
-        Tolerance value
+        Tolerance value, scaled from float64 by the ratio of machine epsilons
     """
     ssot = load_ssot()
     value = ssot.get('defaults', {}).get(kind, 1e-12)
     # Handle both string and numeric representations
-    if isinstance(value, str):
-        return float(value)
-    return float(value) if value is not None else 1e-12
+    value = float(value) if value is not None else 1e-12
+    dtype = get_float_type(dtype)
+    if dtype == np.float64:
+        return value
+    return value * float(np.finfo(dtype).eps / np.finfo(np.float64).eps)
 
 
-def get_threshold(name: str) -> float:
+def get_threshold(name: str) -> Optional[Threshold]:
     """
     Get threshold value from SSOT.
 
@@ -95,18 +143,10 @@ def get_threshold(name: str) -> float:
         name: Threshold name (e.g., 'tightness_r_p99_9', 'M_ratio_max')
 
     Returns:
-        Threshold value
+        Threshold value; "k/N" thresholds such as
+        'zero_fail_upper_bound_per_test' come back as a callable N -> k/N
     """
-    ssot = load_ssot()
-    thresholds = ssot.get('defaults', {}).get('thresholds', {})
-
-    # Handle special string values like "3/N"
-    value = thresholds.get(name)
-    if isinstance(value, str):
-        # For now, return as string - caller must handle
-        return value
-
-    return float(value) if value is not None else None
+    return get_registry().thresholds.get(name)
 
 
 def get_invariant_spec(inv_id: str) -> Optional[Dict[str, Any]]:
@@ -119,32 +159,26 @@ def get_invariant_spec(inv_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Invariant specification dict or None
     """
-    ssot = load_ssot()
-    invariants = ssot.get('invariants', [])
+    spec = get_registry().invariants.get(inv_id)
+    return spec.raw if spec is not None else None
 
-    for inv in invariants:
-        if inv.get('id') == inv_id:
-            return inv
 
-    return None
+# Lazily loaded tolerances per (kind, dtype)
+_TOLERANCES: Dict[Tuple[str, Any], float] = {}
 
 
-# Convenience constants
-ATOL = None  # Lazy loaded
-RTOL = None  # Lazy loaded
+def _cached_tolerance(kind: str, dtype: Optional[FloatType]) -> float:
+    key: Tuple[str, Any] = (kind, None if dtype is None else np.dtype(dtype))
+    if key not in _TOLERANCES:
+        _TOLERANCES[key] = get_tolerance(kind, dtype)
+    return _TOLERANCES[key]
 
 
-def get_atol() -> float:
-    """Get absolute tolerance (cached)."""
-    global ATOL
-    if ATOL is None:
-        ATOL = get_tolerance('atol')
-    return ATOL
+def get_atol(dtype: Optional[FloatType] = None) -> float:
+    """Get absolute tolerance for dtype (default: the SSOT float_type; cached)."""
+    return _cached_tolerance('atol', dtype)
 
 
-def get_rtol() -> float:
-    """Get relative tolerance (cached)."""
-    global RTOL
-    if RTOL is None:
-        RTOL = get_tolerance('rtol')
-    return RTOL
+def get_rtol(dtype: Optional[FloatType] = None) -> float:
+    """Get relative tolerance for dtype (default: the SSOT float_type; cached)."""
+    return _cached_tolerance('rtol', dtype)
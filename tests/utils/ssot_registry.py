@@ -0,0 +1,200 @@
+"""
+Compiled SSOT registry with an on-disk snapshot.
+
+compile_registry() turns the parsed SSOT.yaml into typed, indexed specs:
+invariants and scenarios by id, invariant ids by op, and entry ids by file.
+Thresholds are resolved once: numbers become floats and "k/N" strings
+become PerN(k), a picklable callable N -> k/N.
+
+load_registry() keys a pickle snapshot by the sha256 of the SSOT.yaml bytes
+(plus FORMAT_VERSION), so a process whose SSOT is unchanged -- including every
+pool worker -- loads the snapshot without importing or running the YAML
+parser.  Snapshots live in .cache/ssot/ at the repo root, or in
+$SSOT_CACHE_DIR when set.
+"""
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+FORMAT_VERSION = 1
+
+_PER_N = re.compile(r'^\s*([0-9.eE+-]+)\s*/\s*N\s*$')
+
+
+class PerN:
+    """Threshold of the form k/N, e.g. the rule-of-three bound "3/N"."""
+    __slots__ = ('k',)
+
+    def __init__(self, k: float):
+        self.k = k
+
+    def __call__(self, n: int) -> float:
+        return self.k / n
+
+    def __repr__(self) -> str:
+        return f"PerN({self.k!r})"
+
+    def __str__(self) -> str:
+        return f"{self.k:g}/N"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PerN) and other.k == self.k
+
+    def __getstate__(self):
+        return (self.k,)
+
+    def __setstate__(self, state):
+        self.k, = state
+
+
+Threshold = Union[float, PerN, str]
+
+
+def resolve_threshold(value: Any) -> Optional[Threshold]:
+    """Numbers -> float, "k/N" -> PerN(k); other strings are kept as-is."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        m = _PER_N.match(value)
+        if m:
+            return PerN(float(m.group(1)))
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return float(value)
+
+
+@dataclass(frozen=True)
+class InvariantSpec:
+    id: str
+    name: str
+    spec: str
+    files: Tuple[str, ...]
+    ops: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    metrics: Tuple[str, ...]
+    thresholds: Dict[str, Threshold]
+    params: Dict[str, Any]
+    raw: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    id: str
+    name: str
+    files: Tuple[str, ...]
+    metrics: Tuple[str, ...]
+    raw: Dict[str, Any]
+
+
+@dataclass
+class Registry:
+    digest: str
+    raw: Dict[str, Any]
+    defaults: Dict[str, Any]
+    thresholds: Dict[str, Threshold]
+    invariants: Dict[str, InvariantSpec] = field(default_factory=dict)
+    scenarios: Dict[str, ScenarioSpec] = field(default_factory=dict)
+    by_op: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    by_file: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # path -> (kind, id)
+
+    def entry_for_file(self, path: str) -> Optional[Tuple[str, str]]:
+        """(kind, id) for a test file path, matched on its repo-relative suffix."""
+        path = path.replace('\\', '/')
+        hit = self.by_file.get(path)
+        if hit is not None:
+            return hit
+        for f, entry in self.by_file.items():
+            if path.endswith('/' + f) or f.endswith('/' + path):
+                return entry
+        return None
+
+
+def _metric_names(metrics) -> Tuple[str, ...]:
+    # metrics are either plain names or single-key maps
+    names = []
+    for m in metrics or []:
+        names.append(next(iter(m)) if isinstance(m, dict) else str(m))
+    return tuple(names)
+
+
+def compile_registry(raw: Dict[str, Any], digest: str = '') -> Registry:
+    defaults = raw.get('defaults', {}) or {}
+    reg = Registry(
+        digest=digest,
+        raw=raw,
+        defaults=defaults,
+        thresholds={k: resolve_threshold(v) for k, v in (defaults.get('thresholds') or {}).items()},
+    )
+    by_op: Dict[str, list] = {}
+    for inv in raw.get('invariants', []) or []:
+        spec = InvariantSpec(
+            id=inv['id'],
+            name=inv.get('name', ''),
+            spec=inv.get('spec', ''),
+            files=tuple(inv.get('files', []) or []),
+            ops=tuple(str(op) for op in inv.get('ops', []) or []),
+            inputs=tuple(inv.get('inputs', []) or []),
+            metrics=_metric_names(inv.get('metrics')),
+            thresholds={k: resolve_threshold(v) for k, v in (inv.get('thresholds') or {}).items()},
+            params=dict(inv.get('params') or {}),
+            raw=inv,
+        )
+        reg.invariants[spec.id] = spec
+        for op in spec.ops:
+            by_op.setdefault(op, []).append(spec.id)
+        for f in spec.files:
+            reg.by_file[f] = ('invariant', spec.id)
+    for scn in raw.get('scenarios', []) or []:
+        spec = ScenarioSpec(
+            id=scn['id'],
+            name=scn.get('name', ''),
+            files=tuple(scn.get('files', []) or []),
+            metrics=_metric_names(scn.get('metrics')),
+            raw=scn,
+        )
+        reg.scenarios[spec.id] = spec
+        for f in spec.files:
+            reg.by_file[f] = ('scenario', spec.id)
+    reg.by_op = {op: tuple(ids) for op, ids in by_op.items()}
+    return reg
+
+
+def get_cache_dir() -> Path:
+    env_dir = os.environ.get('SSOT_CACHE_DIR')
+    if env_dir:
+        return Path(env_dir)
+    return Path(__file__).parent.parent.parent / '.cache' / 'ssot'
+
+
+def load_registry(ssot_path: Path) -> Registry:
+    """Load the registry for ssot_path, from the snapshot when its hash matches."""
+    data = Path(ssot_path).read_bytes()
+    digest = hashlib.sha256(data + b'\0registry-v%d' % FORMAT_VERSION).hexdigest()
+    snapshot = get_cache_dir() / f'{digest}.pickle'
+    try:
+        with open(snapshot, 'rb') as fp:
+            reg = pickle.load(fp)
+        if isinstance(reg, Registry) and reg.digest == digest:
+            return reg
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
+    import yaml  # only needed on a snapshot miss
+    reg = compile_registry(yaml.safe_load(data.decode('utf-8')), digest)
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        # write-then-rename so concurrent workers never read a partial snapshot
+        fd, tmp = tempfile.mkstemp(dir=snapshot.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fp:
+            pickle.dump(reg, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snapshot)
+    except OSError:
+        pass  # read-only checkout: fall back to parsing every time
+    return reg
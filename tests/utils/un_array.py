@@ -0,0 +1,130 @@
+"""
+Compact array-backed U/N elements.
+
+UNArray stores n elements in one float64 block of shape (n, 2, 2):
+axis 1 is the tier (actual, measured), axis 2 is (nominal, uncertainty).
+That is 32 bytes per element, and every accessor is a zero-copy view:
+
+    arr.n_a, arr.u_t, arr.n_m, arr.u_m   -> 1-D strided views
+    arr.as_batch()                       -> ((n_a, u_t), (n_m, u_m)) for the *_batch ops
+    arr.flip()                           -> tier axis reversed, no data moved
+
+UNElem is the scalar counterpart: a __slots__ record that unpacks like the
+nested tuple algebra_api.UN, so it can be passed straight to the scalar ops.
+"""
+from typing import Iterator, List, Sequence, Union
+
+import numpy as np
+
+from tests.utils.algebra_api import UN, UNBatch
+
+
+class UNElem:
+    __slots__ = ('n_a', 'u_t', 'n_m', 'u_m')
+
+    def __init__(self, n_a: float, u_t: float, n_m: float, u_m: float):
+        self.n_a = n_a
+        self.u_t = u_t
+        self.n_m = n_m
+        self.u_m = u_m
+
+    @classmethod
+    def from_tuple(cls, x: UN) -> 'UNElem':
+        (n_a, u_t), (n_m, u_m) = x
+        return cls(n_a, u_t, n_m, u_m)
+
+    def to_tuple(self) -> UN:
+        return ((self.n_a, self.u_t), (self.n_m, self.u_m))
+
+    def __iter__(self):
+        # Unpacks as ((n_a, u_t), (n_m, u_m)), like algebra_api.UN
+        yield (self.n_a, self.u_t)
+        yield (self.n_m, self.u_m)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, UNElem):
+            other = other.to_tuple()
+        return self.to_tuple() == other
+
+    def __repr__(self) -> str:
+        return f"UNElem{self.to_tuple()!r}"
+
+
+class UNArray:
+    __slots__ = ('data',)
+
+    def __init__(self, data: np.ndarray):
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 3 or data.shape[1:] != (2, 2):
+            raise ValueError(f"UNArray block must have shape (n, 2, 2), got {data.shape}")
+        self.data = data
+
+    @classmethod
+    def empty(cls, n: int) -> 'UNArray':
+        return cls(np.empty((n, 2, 2), dtype=np.float64))
+
+    @classmethod
+    def from_batch(cls, xb: UNBatch) -> 'UNArray':
+        (n_a, u_t), (n_m, u_m) = xb
+        out = cls.empty(len(n_a))
+        out.n_a[:] = n_a
+        out.u_t[:] = u_t
+        out.n_m[:] = n_m
+        out.u_m[:] = u_m
+        return out
+
+    @classmethod
+    def from_tuples(cls, xs: Sequence[UN]) -> 'UNArray':
+        return cls(np.array(xs, dtype=np.float64).reshape(-1, 2, 2))
+
+    # -- named zero-copy views -------------------------------------------------
+
+    @property
+    def n_a(self) -> np.ndarray:
+        return self.data[:, 0, 0]
+
+    @property
+    def u_t(self) -> np.ndarray:
+        return self.data[:, 0, 1]
+
+    @property
+    def n_m(self) -> np.ndarray:
+        return self.data[:, 1, 0]
+
+    @property
+    def u_m(self) -> np.ndarray:
+        return self.data[:, 1, 1]
+
+    def as_batch(self) -> UNBatch:
+        return ((self.n_a, self.u_t), (self.n_m, self.u_m))
+
+    def flip(self) -> 'UNArray':
+        """B(x) as a view: the tier axis is reversed, nothing is copied."""
+        return UNArray(self.data[:, ::-1, :])
+
+    # -- conversion ------------------------------------------------------------
+
+    def to_tuples(self) -> List[UN]:
+        return [((a, t), (m, u)) for (a, t), (m, u) in self.data.tolist()]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    # -- sequence protocol -----------------------------------------------------
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __getitem__(self, idx) -> Union[UNElem, 'UNArray']:
+        if isinstance(idx, (int, np.integer)):
+            (n_a, u_t), (n_m, u_m) = self.data[idx].tolist()
+            return UNElem(n_a, u_t, n_m, u_m)
+        return UNArray(self.data[idx])
+
+    def __iter__(self) -> Iterator[UNElem]:
+        for (n_a, u_t), (n_m, u_m) in self.data.tolist():
+            yield UNElem(n_a, u_t, n_m, u_m)
+
+    def __repr__(self) -> str:
+        return f"UNArray(n={len(self)})"